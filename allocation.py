@@ -1,115 +1,190 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-
-def get_allocation(capital, time_horizon, risk_tolerance):
-    # Define specific scenarios
-    if capital < 100000 and risk_tolerance == 'low' and time_horizon > 5:
-        safe = 55
-        hedge = 25
-        volatile = 20
-    elif capital > 1000000 and risk_tolerance == 'low' and time_horizon > 5:
-        safe = 55
-        hedge = 25
-        volatile = 20
-    else:
-        # General scenarios based on weighted score-like logic
-        weighted_score = get_weighted_score(capital, time_horizon, risk_tolerance)
-
-        if weighted_score <= 4:
-            safe = 60 - (weighted_score * 3)
-            hedge = 30 - (weighted_score * 2)
-            volatile = 10 + (weighted_score * 5)
-        elif weighted_score <= 7:
-            safe = 50 - ((weighted_score - 4) * 5)
-            hedge = 30 - ((weighted_score - 4) * 4)
-            volatile = 20 + ((weighted_score - 4) * 9)
-        else:
-            safe = 30 - ((weighted_score - 7) * 6)
-            hedge = 30 - ((weighted_score - 7) * 4)
-            volatile = 40 + ((weighted_score - 7) * 10)
-    
-    return {'safe': safe, 'hedge': hedge, 'volatile': volatile}
-
-def get_weighted_score(capital, time_horizon, risk_tolerance):
-    # Define weights
-    weights = {
-        'capital': 0.30,
-        'time_horizon': 0.30,
-        'risk_tolerance': 0.40,
-    }
-
-    # Define scoring ranges
-    capital_score = get_capital_score(capital)
-    time_horizon_score = get_time_horizon_score(time_horizon)
-    risk_tolerance_score = get_risk_tolerance_score(risk_tolerance)
-
-    # Calculate the weighted score
-    weighted_score = (
-        capital_score * weights['capital'] +
-        time_horizon_score * weights['time_horizon'] +
-        risk_tolerance_score * weights['risk_tolerance']
-    )
-
-    return weighted_score
-
-def get_capital_score(capital):
-    if (capital > 1000000): return 10
-    if (capital >= 400000): return 7
-    return 5
-
-def get_time_horizon_score(time_horizon):
-    if (time_horizon > 5): return 10
-    if (time_horizon >= 3): return 7
-    return 5
-
-def get_risk_tolerance_score(risk_tolerance):
-    if (risk_tolerance == 'high'): return 10
-    if (risk_tolerance == 'medium'): return 7
-    if (risk_tolerance == 'low'): return 5
-    return 0
-
-def calculate_allocation():
-    try:
-        capital = float(capital_entry.get())
-        time_horizon = int(time_horizon_entry.get())
-        risk_tolerance = risk_tolerance_var.get().lower()
-
-        allocation = get_allocation(capital, time_horizon, risk_tolerance)
-        allocation_label.config(text=f"Safe: {allocation['safe']}%\nHedge: {allocation['hedge']}%\nVolatile: {allocation['volatile']}%")
-    except ValueError:
-        messagebox.showerror("Invalid input", "Please enter valid numerical values for capital and time horizon.")
-
-# Create the main application window
-root = tk.Tk()
-root.title("Investment Allocation Tool")
-
-# Create a frame for the form
-frame = ttk.Frame(root, padding="20")
-frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-
-# Add form fields
-ttk.Label(frame, text="Capital (INR)").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-capital_entry = ttk.Entry(frame)
-capital_entry.grid(row=0, column=1, padx=5, pady=5, sticky=tk.E)
-
-ttk.Label(frame, text="Time Horizon (years)").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
-time_horizon_entry = ttk.Entry(frame)
-time_horizon_entry.grid(row=1, column=1, padx=5, pady=5, sticky=tk.E)
-
-ttk.Label(frame, text="Risk Tolerance").grid(row=2, column=0, padx=5, pady=5, sticky=tk.W)
-risk_tolerance_var = tk.StringVar()
-risk_tolerance_combobox = ttk.Combobox(frame, textvariable=risk_tolerance_var, state="readonly")
-risk_tolerance_combobox['values'] = ("Low", "Medium", "High")
-risk_tolerance_combobox.grid(row=2, column=1, padx=5, pady=5, sticky=tk.E)
-risk_tolerance_combobox.current(0)
-
-# Add the calculate button
-calculate_button = ttk.Button(frame, text="Calculate Allocation", command=calculate_allocation)
-calculate_button.grid(row=3, column=0, columnspan=2, padx=5, pady=10)
-
-# Add the results label
-allocation_label = ttk.Label(frame, text="", font=("Arial", 12))
-allocation_label.grid(row=4, column=0, columnspan=2, padx=5, pady=5)
-
-# Run the application
-root.mainloop()
+import numpy as np
+import pandas as pd
+
+def get_allocation(capital, time_horizon, risk_tolerance):
+    # Define specific scenarios
+    if capital < 100000 and risk_tolerance == 'low' and time_horizon > 5:
+        safe = 55
+        hedge = 25
+        volatile = 20
+    elif capital > 1000000 and risk_tolerance == 'low' and time_horizon > 5:
+        safe = 55
+        hedge = 25
+        volatile = 20
+    else:
+        # General scenarios based on weighted score-like logic
+        weighted_score = get_weighted_score(capital, time_horizon, risk_tolerance)
+
+        if weighted_score <= 4:
+            safe = 60 - (weighted_score * 3)
+            hedge = 30 - (weighted_score * 2)
+            volatile = 10 + (weighted_score * 5)
+        elif weighted_score <= 7:
+            safe = 50 - ((weighted_score - 4) * 5)
+            hedge = 30 - ((weighted_score - 4) * 4)
+            volatile = 20 + ((weighted_score - 4) * 9)
+        else:
+            safe = 30 - ((weighted_score - 7) * 6)
+            hedge = 30 - ((weighted_score - 7) * 4)
+            volatile = 40 + ((weighted_score - 7) * 10)
+    
+    return {'safe': safe, 'hedge': hedge, 'volatile': volatile}
+
+def get_weighted_score(capital, time_horizon, risk_tolerance):
+    # Define weights
+    weights = {
+        'capital': 0.30,
+        'time_horizon': 0.30,
+        'risk_tolerance': 0.40,
+    }
+
+    # Define scoring ranges
+    capital_score = get_capital_score(capital)
+    time_horizon_score = get_time_horizon_score(time_horizon)
+    risk_tolerance_score = get_risk_tolerance_score(risk_tolerance)
+
+    # Calculate the weighted score
+    weighted_score = (
+        capital_score * weights['capital'] +
+        time_horizon_score * weights['time_horizon'] +
+        risk_tolerance_score * weights['risk_tolerance']
+    )
+
+    return weighted_score
+
+def get_capital_score(capital):
+    if (capital > 1000000): return 10
+    if (capital >= 400000): return 7
+    return 5
+
+def get_time_horizon_score(time_horizon):
+    if (time_horizon > 5): return 10
+    if (time_horizon >= 3): return 7
+    return 5
+
+def get_risk_tolerance_score(risk_tolerance):
+    if (risk_tolerance == 'high'): return 10
+    if (risk_tolerance == 'medium'): return 7
+    if (risk_tolerance == 'low'): return 5
+    return 0
+
+# Batch versions of the functions above: each takes arrays (or Series) of client
+# profiles and reproduces the scalar result for every element in one pass
+def get_capital_scores(capital):
+    capital = np.asarray(capital, dtype=float)
+    return np.where(capital > 1000000, 10, np.where(capital >= 400000, 7, 5))
+
+def get_time_horizon_scores(time_horizon):
+    time_horizon = np.asarray(time_horizon, dtype=float)
+    return np.where(time_horizon > 5, 10, np.where(time_horizon >= 3, 7, 5))
+
+def _factorize_risk_tolerance(risk_tolerance):
+    # Few distinct labels over many rows: score each label once, then broadcast by code
+    codes, labels = pd.factorize(np.asarray(risk_tolerance, dtype=object), use_na_sentinel=False)
+    return codes, labels
+
+def get_risk_tolerance_scores(risk_tolerance):
+    codes, labels = _factorize_risk_tolerance(risk_tolerance)
+    return np.array([get_risk_tolerance_score(label) for label in labels], dtype=np.int64)[codes]
+
+def _weighted_scores(capital_score, time_horizon_score, risk_tolerance_score):
+    # Same weights and evaluation order as get_weighted_score, so results match bit for bit
+    return (
+        capital_score * 0.30 +
+        time_horizon_score * 0.30 +
+        risk_tolerance_score * 0.40
+    )
+
+def get_weighted_scores(capital, time_horizon, risk_tolerance):
+    return _weighted_scores(get_capital_scores(capital),
+                            get_time_horizon_scores(time_horizon),
+                            get_risk_tolerance_scores(risk_tolerance))
+
+def get_allocation_batch(capital, time_horizon=None, risk_tolerance=None):
+    # Accepts either three arrays or a DataFrame with capital, time_horizon and
+    # risk_tolerance columns; returns {'safe', 'hedge', 'volatile'} float arrays
+    if isinstance(capital, pd.DataFrame):
+        profiles = capital
+        capital = profiles['capital']
+        time_horizon = profiles['time_horizon']
+        risk_tolerance = profiles['risk_tolerance']
+    capital = np.asarray(capital, dtype=float)
+    time_horizon = np.asarray(time_horizon, dtype=float)
+    codes, labels = _factorize_risk_tolerance(risk_tolerance)
+    risk_tolerance_score = np.array([get_risk_tolerance_score(label) for label in labels], dtype=np.int64)[codes]
+    is_low_risk = np.array([label == 'low' for label in labels], dtype=bool)[codes]
+
+    weighted_score = _weighted_scores(get_capital_scores(capital),
+                                      get_time_horizon_scores(time_horizon),
+                                      risk_tolerance_score)
+    low_score = weighted_score <= 4
+    mid_score = ~low_score & (weighted_score <= 7)
+    safe = np.select([low_score, mid_score],
+                     [60 - (weighted_score * 3), 50 - ((weighted_score - 4) * 5)],
+                     30 - ((weighted_score - 7) * 6))
+    hedge = np.select([low_score, mid_score],
+                      [30 - (weighted_score * 2), 30 - ((weighted_score - 4) * 4)],
+                      30 - ((weighted_score - 7) * 4))
+    volatile = np.select([low_score, mid_score],
+                         [10 + (weighted_score * 5), 20 + ((weighted_score - 4) * 9)],
+                         40 + ((weighted_score - 7) * 10))
+
+    # Specific scenarios that get_allocation handles before the weighted score
+    long_low_risk = is_low_risk & (time_horizon > 5)
+    special = long_low_risk & ((capital < 100000) | (capital > 1000000))
+    safe[special] = 55
+    hedge[special] = 25
+    volatile[special] = 20
+
+    return {'safe': safe, 'hedge': hedge, 'volatile': volatile}
+
+# Standalone allocation calculator window
+if __name__ == "__main__":
+    import tkinter as tk
+    from tkinter import ttk, messagebox
+
+    def calculate_allocation():
+        try:
+            capital = float(capital_entry.get())
+            time_horizon = int(time_horizon_entry.get())
+            risk_tolerance = risk_tolerance_var.get().lower()
+
+            allocation = get_allocation(capital, time_horizon, risk_tolerance)
+            allocation_label.config(text=f"Safe: {allocation['safe']}%\nHedge: {allocation['hedge']}%\nVolatile: {allocation['volatile']}%")
+        except ValueError:
+            messagebox.showerror("Invalid input", "Please enter valid numerical values for capital and time horizon.")
+
+    # Create the main application window
+    root = tk.Tk()
+    root.title("Investment Allocation Tool")
+
+    # Create a frame for the form
+    frame = ttk.Frame(root, padding="20")
+    frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+    # Add form fields
+    ttk.Label(frame, text="Capital (INR)").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+    capital_entry = ttk.Entry(frame)
+    capital_entry.grid(row=0, column=1, padx=5, pady=5, sticky=tk.E)
+
+    ttk.Label(frame, text="Time Horizon (years)").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
+    time_horizon_entry = ttk.Entry(frame)
+    time_horizon_entry.grid(row=1, column=1, padx=5, pady=5, sticky=tk.E)
+
+    ttk.Label(frame, text="Risk Tolerance").grid(row=2, column=0, padx=5, pady=5, sticky=tk.W)
+    risk_tolerance_var = tk.StringVar()
+    risk_tolerance_combobox = ttk.Combobox(frame, textvariable=risk_tolerance_var, state="readonly")
+    risk_tolerance_combobox['values'] = ("Low", "Medium", "High")
+    risk_tolerance_combobox.grid(row=2, column=1, padx=5, pady=5, sticky=tk.E)
+    risk_tolerance_combobox.current(0)
+
+    # Add the calculate button
+    calculate_button = ttk.Button(frame, text="Calculate Allocation", command=calculate_allocation)
+    calculate_button.grid(row=3, column=0, columnspan=2, padx=5, pady=10)
+
+    # Add the results label
+    allocation_label = ttk.Label(frame, text="", font=("Arial", 12))
+    allocation_label.grid(row=4, column=0, columnspan=2, padx=5, pady=5)
+
+    # Run the application
+    root.mainloop()
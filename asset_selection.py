@@ -0,0 +1,144 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Investable assets, one row per asset: section, the risk buckets it can fill
+# (';'-separated), asset type and liquidity. Row order is the curated priority.
+default_catalog_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets.csv')
+
+buckets = ('safe', 'hedge', 'volatile')
+liquidity_scores = {'low': 0.0, 'medium': 0.5, 'high': 1.0}
+
+# Section each bucket used to be filled from; its assets keep a head start in the ranking
+home_sections = {'safe': 'A', 'hedge': 'B', 'volatile': 'C'}
+
+# How strongly each outlook favours an asset type (0-1) and liquid assets
+type_preferences = {
+    'Positive': {'Stock': 1.0, 'Crypto': 1.0, 'ETF': 0.7, 'Industrial Metal': 0.7, 'Energy': 0.7, 'Agriculture': 0.5,
+                 'Bond': 0.5, 'Currency': 0.4, 'Precious Metal': 0.3, 'Government Bond': 0.3, 'Stablecoin': 0.1},
+    'Neutral': {'ETF': 1.0, 'Stock': 0.7, 'Government Bond': 0.7, 'Precious Metal': 0.7, 'Bond': 0.5, 'Currency': 0.5,
+                'Industrial Metal': 0.5, 'Energy': 0.5, 'Agriculture': 0.5, 'Stablecoin': 0.5, 'Crypto': 0.4},
+    'Negative': {'Government Bond': 1.0, 'Precious Metal': 1.0, 'Stablecoin': 0.8, 'ETF': 0.6, 'Currency': 0.6,
+                 'Stock': 0.4, 'Bond': 0.3, 'Agriculture': 0.3, 'Industrial Metal': 0.3, 'Energy': 0.3, 'Crypto': 0.1},
+}
+liquidity_weights = {'Positive': 0.25, 'Neutral': 0.5, 'Negative': 1.0}
+
+def _known_outlook(market_outlook):
+    # Outlooks other than the ones above are treated as Negative
+    return market_outlook if isinstance(market_outlook, str) and market_outlook in type_preferences else 'Negative'
+
+class AssetCatalog:
+    # Assets interned once into integer ids with code arrays for section, type
+    # and liquidity, a bucket membership matrix, and id indexes for each label.
+    # Rankings per (outlook, bucket) are computed on first use and reused, so a
+    # selection only walks a few precomputed ids.
+    def __init__(self, frame):
+        # An asset listed more than once keeps its first position and the union of its buckets
+        frame = frame.assign(buckets=frame['buckets'].fillna('').str.split(';'))
+        first = frame.drop_duplicates('name').set_index('name')
+        memberships = frame.explode('buckets').groupby('name', sort=False)['buckets'].agg(set)
+
+        self.names = np.array([sys.intern(str(name)) for name in first.index], dtype=object)
+        self.ids = {name: asset_id for asset_id, name in enumerate(self.names)}
+        self.section_codes, self.sections = pd.factorize(first['section'].astype(str))
+        self.type_codes, self.asset_types = pd.factorize(first['asset_type'].astype(str))
+        self.liquidity_codes, self.liquidity_levels = pd.factorize(first['liquidity'].astype(str))
+        self.in_bucket = np.array([[bucket in memberships[name] for bucket in buckets] for name in first.index],
+                                  dtype=bool).reshape(len(first), len(buckets))
+
+        all_ids = np.arange(len(self.names))
+        self.by_section = {label: all_ids[self.section_codes == code] for code, label in enumerate(self.sections)}
+        self.by_type = {label: all_ids[self.type_codes == code] for code, label in enumerate(self.asset_types)}
+        self.by_liquidity = {label: all_ids[self.liquidity_codes == code]
+                             for code, label in enumerate(self.liquidity_levels)}
+        self.by_bucket = {bucket: all_ids[self.in_bucket[:, i]] for i, bucket in enumerate(buckets)}
+        self._rankings = {}
+        self._selections = {}
+
+    @classmethod
+    def load(cls, path=default_catalog_path):
+        return cls(pd.read_csv(path, dtype=str))
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, section=None, bucket=None, asset_type=None, liquidity=None):
+        # Ids matching every given label, in curated order
+        result = None
+        for index, label in ((self.by_section, section), (self.by_bucket, bucket),
+                             (self.by_type, asset_type), (self.by_liquidity, liquidity)):
+            if label is None:
+                continue
+            ids = index.get(label, np.array([], dtype=np.int64))
+            result = ids if result is None else np.intersect1d(result, ids, assume_unique=True)
+        return np.arange(len(self.names)) if result is None else result
+
+    def rank(self, bucket, market_outlook):
+        # Ids eligible for bucket, best first for market_outlook; unknown outlooks rank as Negative
+        outlook = _known_outlook(market_outlook)
+        key = (outlook, bucket)
+        if key not in self._rankings:
+            ids = self.by_bucket[bucket]
+            preferences = type_preferences[outlook]
+            type_score = np.array([preferences.get(label, 0.5) for label in self.asset_types])[self.type_codes[ids]]
+            liquidity = np.array([liquidity_scores.get(label, 0.5) for label in self.liquidity_levels])
+            liquidity_score = liquidity[self.liquidity_codes[ids]] * liquidity_weights[outlook]
+            home = np.asarray(self.sections == home_sections[bucket])[self.section_codes[ids]] * 0.5
+            curated = 0.5 * (1 - ids / max(len(self.names), 1))
+            score = type_score + liquidity_score + home + curated
+            self._rankings[key] = ids[np.argsort(-score, kind='stable')]
+        return self._rankings[key]
+
+    def select(self, safe_percentage, hedge_percentage, volatile_percentage, market_outlook, picks=9):
+        # Ranked picks per bucket, with the number of picks split by bucket weight;
+        # an asset is picked for at most one bucket
+        counts = _pick_counts(np.array([safe_percentage, hedge_percentage, volatile_percentage], dtype=float), picks)
+        # Only the per-bucket counts and the outlook matter, so there are few distinct
+        # selections; the outlook is normalised first so arbitrary strings add no entries
+        outlook = _known_outlook(market_outlook)
+        key = (tuple(counts.tolist()), outlook)
+        if key not in self._selections:
+            used = set()
+            selected_assets = {}
+            for bucket, count in zip(buckets, counts):
+                chosen = []
+                for asset_id in self.rank(bucket, outlook):
+                    if len(chosen) == count:
+                        break
+                    if asset_id not in used:
+                        used.add(asset_id)
+                        chosen.append(self.names[asset_id])
+                selected_assets[bucket] = tuple(chosen)
+            self._selections[key] = selected_assets
+        return {bucket: list(chosen) for bucket, chosen in self._selections[key].items()}
+
+def _pick_counts(weights, picks):
+    # Largest-remainder split of picks by weight; every bucket with weight gets at least one
+    weights = np.clip(weights, 0, None)
+    if weights.sum() <= 0:
+        return np.zeros(len(weights), dtype=int)
+    shares = picks * weights / weights.sum()
+    counts = np.floor(shares).astype(int)
+    for i in np.argsort(-(shares - counts), kind='stable')[:picks - counts.sum()]:
+        counts[i] += 1
+    for i in np.flatnonzero((weights > 0) & (counts == 0)):
+        counts[np.argmax(counts)] -= 1
+        counts[i] = 1
+    return counts
+
+_catalog = None
+
+def get_catalog():
+    # Loaded once per process
+    global _catalog
+    if _catalog is None:
+        _catalog = AssetCatalog.load()
+    return _catalog
+
+# Asset Selection Functions
+def select_assets(safe_percentage, hedge_percentage, volatile_percentage, market_outlook, catalog=None, picks=9):
+    if catalog is None:
+        catalog = get_catalog()
+    return catalog.select(safe_percentage, hedge_percentage, volatile_percentage, market_outlook, picks)
@@ -0,0 +1,150 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from allocation import get_allocation_batch
+from data_processing import load_monthly_data
+from market_evaluation import default_path, macro_store
+from monte_carlo import default_return_models
+from technical_analysis import add_technical_indicators
+
+# ESG and sentiment have no history to replay, so during a backtest they are
+# held at fixed scores. The macro score is replayed from the macro store month
+# by month; 'macro' here only covers months before its first observation.
+default_stage_scores = {'esg': 0.5, 'macro': 0.5, 'sentiment': 0.5}
+
+def technical_scores(data_with_indicators):
+    # The evaluate_technical rules applied to every row at once. Indicators at a
+    # row only use data up to that row, so row t is the score seen at month t.
+    sma_50_above_sma_200 = data_with_indicators['SMA_50'] > data_with_indicators['SMA_200']
+    rsi_below_70 = data_with_indicators['RSI'] < 70
+    rsi_above_30 = data_with_indicators['RSI'] > 30
+    macd_positive = data_with_indicators['MACD'] > data_with_indicators['MACD_Signal']
+    return (sma_50_above_sma_200.astype(int) + rsi_below_70.astype(int) +
+            rsi_above_30.astype(int) + macd_positive.astype(int)) / 4
+
+def macro_scores(dates, store=None):
+    # The evaluate_macro rule as of every date at once, from the store's running
+    # sums; dates before the first observation get the default macro score
+    store = macro_store if store is None else store
+    means = store.window_series(dates)['mean']
+    known = means[['gdp_growth', 'interest_rate']].notna().all(axis=1).to_numpy()
+    score = ((means['gdp_growth'] > 0) & (means['interest_rate'] < 5)).to_numpy(dtype=float)
+    return np.where(known, score, default_stage_scores['macro'])
+
+def outlook_signals(nifty_data, stage_scores=None):
+    # Monthly technical score, overall score and outlook from a single indicator
+    # pass. Stage scores are constants or arrays with one score per month.
+    stage_scores = {**default_stage_scores, **(stage_scores or {})}
+    data = add_technical_indicators(nifty_data).reset_index(drop=True)
+    technical_score = technical_scores(data)
+    macro_score = np.broadcast_to(np.asarray(stage_scores['macro'], dtype=float), len(data))
+    overall_score = (technical_score + stage_scores['esg'] + macro_score + stage_scores['sentiment']) / 4
+    return pd.DataFrame({
+        'Date': data['Date'],
+        'Value': data['Value'],
+        'technical_score': technical_score,
+        'macro_score': macro_score,
+        'overall_score': overall_score,
+        'outlook': np.where(overall_score > 0.5, "Positive", "Negative"),
+    })
+
+def _monthly_return(model):
+    return (1 + model['annual_return']) ** (1 / 12) - 1
+
+def run_backtest(profiles, nifty_data=None, start_year=2000, end_year=2023, stage_scores=None,
+                 risk_off_exposure=0.5, return_models=None, macro_store=None):
+    # Walk-forward backtest of the outlook + allocation rules for every client
+    # profile at once. The outlook at the end of month t sets the holdings for
+    # month t + 1. The volatile sleeve is invested in Nifty; in Negative months
+    # only risk_off_exposure of it stays invested and the rest moves to safe.
+    # Safe and hedge earn the constant monthly rate of their return model.
+    # Unless stage_scores fixes it, the macro score of each month comes from
+    # macro_store (default: the live evaluation's store) as of that month.
+    if nifty_data is None:
+        nifty_data = load_monthly_data(default_path)
+    nifty_data = nifty_data[nifty_data['Date'].dt.year.between(start_year, end_year)]
+    # Months not yet reported (the partial current year) would turn every compounded figure into NaN
+    nifty_data = nifty_data.dropna(subset=['Value'])
+    if nifty_data.empty:
+        raise ValueError(f"No reported Nifty months between {start_year} and {end_year}")
+    stage_scores = dict(stage_scores or {})
+    if 'macro' not in stage_scores:
+        stage_scores['macro'] = macro_scores(nifty_data['Date'], macro_store)
+    signals = outlook_signals(nifty_data, stage_scores)
+    return_models = {**default_return_models, **(return_models or {})}
+
+    allocations = get_allocation_batch(profiles)
+    total = allocations['safe'] + allocations['hedge'] + allocations['volatile']
+    target = {bucket: allocations[bucket] / total for bucket in ('safe', 'hedge', 'volatile')}
+
+    # Holdings for month t come from the outlook of month t - 1; the first month has no signal
+    positive = signals['outlook'].eq("Positive").shift(1, fill_value=False).to_numpy()
+    exposure = np.where(positive, 1.0, risk_off_exposure)[:, None]
+    weights = {
+        'volatile': target['volatile'] * exposure,
+        'safe': target['safe'] + target['volatile'] * (1 - exposure),
+        'hedge': np.broadcast_to(target['hedge'], (len(signals), len(target['hedge']))),
+    }
+    bucket_returns = {
+        'volatile': (signals['Value'].to_numpy() / 100)[:, None],
+        'safe': np.full((len(signals), 1), _monthly_return(return_models['safe'])),
+        'hedge': np.full((len(signals), 1), _monthly_return(return_models['hedge'])),
+    }
+    portfolio_returns = sum(weights[bucket] * bucket_returns[bucket] for bucket in weights)
+    equity = np.cumprod(1 + portfolio_returns, axis=0)
+
+    # One-way turnover: trades needed to get from last month's drifted weights back to this month's targets
+    turnover = np.zeros_like(portfolio_returns)
+    for bucket in weights:
+        drifted = weights[bucket][:-1] * (1 + bucket_returns[bucket][:-1]) / (1 + portfolio_returns[:-1])
+        turnover[1:] += np.abs(weights[bucket][1:] - drifted)
+    turnover /= 2
+
+    # Outlook hit: a Positive month followed by a Nifty gain, or a Negative one by a loss
+    next_return = signals['Value'].shift(-1)
+    called = next_return.notna().to_numpy()
+    hits = np.where(signals['outlook'] == "Positive", next_return > 0, next_return <= 0)[called]
+
+    years = len(signals) / 12
+    running_peak = np.maximum.accumulate(equity, axis=0)
+    summary = pd.DataFrame({
+        'safe': allocations['safe'],
+        'hedge': allocations['hedge'],
+        'volatile': allocations['volatile'],
+        'total_return': equity[-1] - 1,
+        'cagr': equity[-1] ** (1 / years) - 1,
+        'max_drawdown': (equity / running_peak - 1).min(axis=0),
+        'annual_turnover': turnover.sum(axis=0) / years,
+        'positive_months': (portfolio_returns > 0).mean(axis=0),
+    }, index=profiles.index if isinstance(profiles, pd.DataFrame) else None)
+    return {
+        'signals': signals,
+        'equity': pd.DataFrame(equity, index=signals['Date']),
+        'turnover': pd.DataFrame(turnover, index=signals['Date']),
+        'outlook_hit_rate': float(hits.mean()) if len(hits) else 0.0,
+        'summary': summary,
+    }
+
+def profile_grid(capitals=(50000, 250000, 500000, 2000000), time_horizons=(2, 4, 10),
+                 risk_tolerances=('low', 'medium', 'high')):
+    # Every combination of the given client inputs, as get_allocation_batch expects
+    index = pd.MultiIndex.from_product([capitals, time_horizons, risk_tolerances],
+                                       names=['capital', 'time_horizon', 'risk_tolerance'])
+    return index.to_frame(index=False)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the outlook and allocation rules")
+    parser.add_argument('--start-year', type=int, default=2000)
+    parser.add_argument('--end-year', type=int, default=2023)
+    parser.add_argument('--risk-off-exposure', type=float, default=0.5)
+    args = parser.parse_args()
+
+    profiles = profile_grid()
+    result = run_backtest(profiles, start_year=args.start_year, end_year=args.end_year,
+                          risk_off_exposure=args.risk_off_exposure)
+    print(f"Outlook hit rate: {result['outlook_hit_rate']:.1%}, "
+          f"Positive in {result['signals']['outlook'].eq('Positive').mean():.1%} of months")
+    with pd.option_context('display.width', 160, 'display.float_format', '{:.4f}'.format):
+        print(pd.concat([profiles, result['summary']], axis=1).to_string(index=False))
@@ -0,0 +1,203 @@
+import argparse
+import collections
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from allocation import get_allocation_batch
+from asset_selection import buckets, get_catalog
+from market_evaluation import market_snapshot
+
+logger = logging.getLogger(__name__)
+
+profile_columns = ['capital', 'time_horizon', 'risk_tolerance']
+
+def _is_parquet(path):
+    return path.endswith('.parquet') or os.path.isdir(path)
+
+def read_profile_chunks(path, chunk_size, skip_rows=0):
+    # Client profiles from a CSV or Parquet file, chunk_size rows at a time,
+    # after the first skip_rows rows (which are not converted to frames)
+    if _is_parquet(path):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet needs pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            if skip_rows >= batch.num_rows:
+                skip_rows -= batch.num_rows
+                continue
+            yield batch.slice(skip_rows).to_pandas()
+            skip_rows = 0
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, skiprows=range(1, skip_rows + 1),
+                               dtype={'risk_tolerance': str})
+
+def process_chunk(chunk, market_outlook):
+    # Allocation and selected assets for every profile in chunk; the input
+    # columns are kept and the assets of each bucket are ';'-joined
+    missing = [column for column in profile_columns if column not in chunk.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    result = chunk.copy()
+    if chunk.empty:
+        # A header-only file: same columns, no rows
+        for bucket in buckets:
+            result[bucket] = pd.Series(dtype=float)
+        for bucket in buckets:
+            result[f'{bucket}_assets'] = pd.Series(dtype=object)
+        result['market_outlook'] = pd.Series(dtype=object)
+        return result
+    allocation = get_allocation_batch(chunk)
+    for bucket in buckets:
+        result[bucket] = allocation[bucket]
+    # Few distinct allocations per chunk: select assets once for each
+    group, distinct = pd.factorize(pd.MultiIndex.from_arrays([allocation[bucket] for bucket in buckets]))
+    catalog = get_catalog()
+    selections = [catalog.select(*percentages, market_outlook) for percentages in distinct]
+    for bucket in buckets:
+        joined = np.array([';'.join(selected[bucket]) for selected in selections], dtype=object)
+        result[f'{bucket}_assets'] = joined[group]
+    result['market_outlook'] = market_outlook
+    return result
+
+def _process(arguments):
+    index, chunk, market_outlook = arguments
+    return index, process_chunk(chunk, market_outlook)
+
+def _fingerprint(path):
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+class _Output:
+    # Results appended chunk by chunk: one CSV file, or one Parquet part file
+    # per chunk in a directory. position() is what a manifest records, and
+    # truncate() drops anything written after it (a chunk cut off by a crash).
+    def __init__(self, path):
+        self.path = path
+        self.parquet = _is_parquet(path)
+        if self.parquet:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("Writing Parquet needs pyarrow (pip install pyarrow)")
+            self._pa, self._pq = pa, pq
+            os.makedirs(path, exist_ok=True)
+
+    def position(self, chunks):
+        return chunks if self.parquet else os.path.getsize(self.path)
+
+    def truncate(self, position):
+        if self.parquet:
+            for name in os.listdir(self.path):
+                if name.startswith('part-') and int(name[5:10]) >= position:
+                    os.remove(os.path.join(self.path, name))
+        elif os.path.exists(self.path):
+            os.truncate(self.path, position)
+
+    def write(self, index, frame):
+        if self.parquet:
+            table = self._pa.Table.from_pandas(frame, preserve_index=False)
+            self._pq.write_table(table, os.path.join(self.path, f'part-{index:05d}.parquet'))
+        else:
+            frame.to_csv(self.path, mode='w' if index == 0 else 'a', header=index == 0, index=False)
+
+def _write_manifest(path, manifest):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+def run_batch(input_path, output_path, market_outlook=None, chunk_size=100000, workers=None, resume=False,
+              progress=None):
+    # Allocates every profile in input_path and streams the results to
+    # output_path in input order. Chunks are processed on a process pool with
+    # a bounded number in flight, so memory stays flat for any file size.
+    # After each written chunk a manifest (output_path + '.manifest.json')
+    # records how far the output got; with resume=True a rerun skips those
+    # chunks. progress(chunks, rows, seconds) is called after every chunk.
+    if market_outlook is None:
+        market_evaluation = market_snapshot.get()
+        if market_evaluation is None:
+            raise RuntimeError("Error in evaluating market conditions.")
+        market_outlook = market_evaluation['overall']['outlook']
+
+    manifest_path = f'{output_path}.manifest.json'
+    manifest = {'input': _fingerprint(input_path), 'chunk_size': chunk_size, 'market_outlook': market_outlook,
+                'chunks': 0, 'rows': 0, 'position': 0, 'complete': False}
+    output = _Output(output_path)
+    if resume and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            previous = json.load(f)
+        settings = ('input', 'chunk_size', 'market_outlook')
+        if any(previous.get(key) != manifest[key] for key in settings):
+            raise ValueError(f"{manifest_path} was written for a different input, chunk size or outlook")
+        manifest = previous
+    output.truncate(manifest['position'])
+    skipped = manifest['chunks']
+    if skipped:
+        logger.info(f"Resuming after {skipped} chunks ({manifest['rows']:,} rows)")
+
+    workers = workers or os.cpu_count() or 1
+    stats = {'rows': 0, 'chunks': 0, 'skipped_chunks': skipped}
+    start = time.perf_counter()
+
+    def write(index, frame):
+        output.write(index, frame)
+        manifest['chunks'] = index + 1
+        manifest['rows'] += len(frame)
+        manifest['position'] = output.position(index + 1)
+        _write_manifest(manifest_path, manifest)
+        stats['rows'] += len(frame)
+        stats['chunks'] += 1
+        seconds = time.perf_counter() - start
+        logger.info(f"chunk {index + 1}: {manifest['rows']:,} rows done ({stats['rows'] / seconds:,.0f} rows/s)")
+        if progress is not None:
+            progress(index + 1, manifest['rows'], seconds)
+
+    if not manifest['complete']:
+        # Every written chunk holds one result row per input row
+        chunks = ((index, chunk, market_outlook)
+                  for index, chunk in enumerate(read_profile_chunks(input_path, chunk_size, manifest['rows']), skipped))
+        if workers == 1:
+            for task in chunks:
+                write(*_process(task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=get_catalog) as executor:
+                pending = collections.deque()
+                for task in chunks:
+                    pending.append(executor.submit(_process, task))
+                    if len(pending) >= 2 * workers:
+                        write(*pending.popleft().result())
+                while pending:
+                    write(*pending.popleft().result())
+        manifest['complete'] = True
+        _write_manifest(manifest_path, manifest)
+
+    stats['seconds'] = time.perf_counter() - start
+    stats['rows_per_second'] = stats['rows'] / stats['seconds'] if stats['seconds'] else 0.0
+    stats['total_rows'] = manifest['rows']
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Allocate a file of client profiles in bulk")
+    parser.add_argument('input_path', help="CSV or Parquet with capital, time_horizon and risk_tolerance columns")
+    parser.add_argument('output_path', help="results CSV, or a .parquet directory of part files")
+    parser.add_argument('--outlook', choices=['Positive', 'Neutral', 'Negative'],
+                        help="market outlook to use (default: evaluate it once)")
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--resume', action='store_true', help="continue after the last chunk a previous run finished")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    stats = run_batch(args.input_path, args.output_path, args.outlook, args.chunk_size, args.workers, args.resume)
+    print(f"{stats['rows']:,} profiles in {stats['chunks']} chunks, {stats['seconds']:.2f}s "
+          f"({stats['rows_per_second']:,.0f} profiles/s); {stats['skipped_chunks']} chunks skipped on resume, "
+          f"{stats['total_rows']:,} rows in {os.path.abspath(args.output_path)}")
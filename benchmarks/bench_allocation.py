@@ -0,0 +1,50 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from allocation import get_allocation, get_allocation_batch
+
+def generate_profiles(n_profiles, seed=0):
+    rng = np.random.default_rng(seed)
+    # Include the exact thresholds so the boundary branches are exercised
+    capital_choices = np.array([50000, 99999, 100000, 399999, 400000, 1000000, 1000001, 5000000], dtype=float)
+    capital = np.where(rng.random(n_profiles) < 0.2,
+                       rng.choice(capital_choices, n_profiles),
+                       rng.uniform(10000, 5000000, n_profiles).round(2))
+    return pd.DataFrame({
+        'capital': capital,
+        'time_horizon': rng.integers(1, 15, n_profiles),
+        'risk_tolerance': rng.choice(np.array(['low', 'medium', 'high', ''], dtype=object), n_profiles, p=[0.4, 0.3, 0.25, 0.05]),
+    })
+
+def run(n_profiles, n_scalar):
+    profiles = generate_profiles(n_profiles)
+
+    start = time.perf_counter()
+    batch = get_allocation_batch(profiles)
+    batch_seconds = time.perf_counter() - start
+
+    sample = profiles.iloc[:n_scalar]
+    start = time.perf_counter()
+    scalar = [get_allocation(c, t, r) for c, t, r in zip(sample['capital'], sample['time_horizon'], sample['risk_tolerance'])]
+    scalar_seconds = time.perf_counter() - start
+
+    for bucket in ('safe', 'hedge', 'volatile'):
+        expected = np.array([result[bucket] for result in scalar], dtype=float)
+        if not np.array_equal(batch[bucket][:n_scalar], expected):
+            raise AssertionError(f"Batch {bucket} allocation differs from get_allocation")
+
+    scalar_rate = n_scalar / scalar_seconds
+    batch_rate = n_profiles / batch_seconds
+    print(f"scalar loop: {n_scalar:>10,} profiles in {scalar_seconds:8.3f}s  ({scalar_rate:,.0f} profiles/s)")
+    print(f"batch:       {n_profiles:>10,} profiles in {batch_seconds:8.3f}s  ({batch_rate:,.0f} profiles/s)")
+    print(f"speedup: {batch_rate / scalar_rate:.1f}x (results identical on {n_scalar:,} profiles)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput of get_allocation_batch against the scalar get_allocation loop")
+    parser.add_argument('--profiles', type=int, default=1000000)
+    parser.add_argument('--scalar', type=int, default=100000, help="profiles scored with the scalar loop")
+    args = parser.parse_args()
+    run(args.profiles, min(args.scalar, args.profiles))
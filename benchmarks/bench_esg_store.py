@@ -0,0 +1,54 @@
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from esg_store import ESGStore, generate_mock_esg_universe
+
+def _time(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+def run(n_issuers, repeat):
+    universe = generate_mock_esg_universe(n_issuers)
+    build_seconds, store = _time(lambda: ESGStore.from_frame(universe), 1)
+    print(f"build: {n_issuers:,} issuers in {build_seconds:.2f}s")
+
+    queries = {
+        'above 70': (lambda: store.count_above(70),
+                     lambda: int((universe['ESG_Score'] > 70).sum())),
+        'above 90, IT bonds': (lambda: store.count_above(90, sector='IT', asset_class='Bond'),
+                               lambda: int(((universe['ESG_Score'] > 90) & (universe['Sector'] == 'IT') &
+                                            (universe['Asset_Class'] == 'Bond')).sum())),
+        'top 10 in Energy': (lambda: len(store.top_k(10, sector='Energy')),
+                             lambda: len(universe[universe['Sector'] == 'Energy'].nlargest(10, 'ESG_Score'))),
+    }
+    for name, (indexed, scan) in queries.items():
+        indexed_seconds, indexed_result = _time(indexed, repeat)
+        scan_seconds, scan_result = _time(scan, repeat)
+        if indexed_result != scan_result:
+            raise AssertionError(f"{name}: store returned {indexed_result}, scan {scan_result}")
+        print(f"{name:<20} store {indexed_seconds * 1e6:10.1f}us  scan {scan_seconds * 1e6:10.1f}us  "
+              f"({scan_seconds / indexed_seconds:,.0f}x)")
+
+    rng = np.random.default_rng(1)
+    assets = universe['Asset'].to_numpy()[rng.choice(n_issuers, 1000, replace=False)]
+    update_seconds, _ = _time(lambda: store.update(assets, rng.uniform(0, 100, len(assets))), 1)
+    query_seconds, _ = _time(lambda: store.count_above(90, sector='IT'), repeat)
+    print(f"update 1,000 scores: {update_seconds * 1e3:.2f}ms, then query with pending updates {query_seconds * 1e6:.1f}us")
+
+    with tempfile.TemporaryDirectory() as directory:
+        store.save(directory)
+        load_seconds, mapped = _time(lambda: ESGStore.load(directory, mmap=True), 1)
+        query_seconds, _ = _time(lambda: mapped.count_above(90, sector='IT'), repeat)
+        print(f"memory-mapped load: {load_seconds * 1e3:.2f}ms, first queries {query_seconds * 1e6:.1f}us")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Indexed ESG store queries against DataFrame scans")
+    parser.add_argument('--issuers', type=int, default=500000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    run(args.issuers, args.repeat)
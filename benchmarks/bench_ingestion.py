@@ -0,0 +1,49 @@
+import argparse
+import time
+
+import requests
+
+from fake_market_server import FakeMarketServer
+from ingestion import Fetcher, parse_headlines, parse_price_history, run_ingestion
+
+def _sequential(price_urls, news_urls):
+    # The naive baseline: one request at a time, a new connection for each
+    prices = {name: parse_price_history(requests.get(url, timeout=10).text) for name, url in price_urls.items()}
+    headlines = [text for url in news_urls for text in parse_headlines(requests.get(url, timeout=10).text)]
+    return prices, headlines
+
+def run(n_symbols, n_pages, latency, rate, pool_size):
+    with FakeMarketServer(latency=latency) as server:
+        price_urls = {f'SYM{i}': f'{server.url}/prices/SYM{i}.csv' for i in range(n_symbols)}
+        news_urls = [f'{server.url}/news/{page}.html' for page in range(n_pages)]
+        n_requests = n_symbols + n_pages
+        # Let the server build its pages before anything is timed
+        _sequential(price_urls, news_urls)
+
+        start = time.perf_counter()
+        prices, headlines = _sequential(price_urls, news_urls)
+        sequential_seconds = time.perf_counter() - start
+        print(f"sequential     {n_requests} requests in {sequential_seconds:.2f}s "
+              f"({n_requests / sequential_seconds:,.1f} req/s)")
+
+        fetcher = Fetcher(default_rate=rate, pool_size=pool_size)
+        for label in ('async cold', 'async 304'):
+            start = time.perf_counter()
+            result = run_ingestion(price_urls, news_urls, fetcher=fetcher)
+            seconds = time.perf_counter() - start
+            print(f"{label:<14} {n_requests} requests in {seconds:.2f}s ({n_requests / seconds:,.1f} req/s, "
+                  f"{sequential_seconds / seconds:.1f}x)")
+            if len(result['news']) != len(headlines) or not result['prices']['SYM0'].equals(prices['SYM0']):
+                raise AssertionError("Async ingestion returned different data from the sequential fetch")
+        fetcher.close()
+        print(f"server answered {server.not_modified} conditional GETs with 304 Not Modified")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent ingestion against sequential fetching, offline")
+    parser.add_argument('--symbols', type=int, default=50)
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds the fake server waits per response")
+    parser.add_argument('--rate', type=float, default=500.0, help="requests per second allowed per host")
+    parser.add_argument('--pool-size', type=int, default=16)
+    args = parser.parse_args()
+    run(args.symbols, args.pages, args.latency, args.rate, args.pool_size)
@@ -0,0 +1,40 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from allocation import get_allocation
+from monte_carlo import load_market_returns, simulate_allocation
+
+def run(n_paths, time_horizon, workers, chunk_size):
+    allocation = get_allocation(500000, time_horizon, 'medium')
+    market_returns = load_market_returns()
+    # Keep data loading and first-call overhead out of the timing
+    simulate_allocation(allocation, 500000, time_horizon, n_paths=1000, workers=1, market_returns=market_returns)
+
+    results = {}
+    for n_workers in sorted({1, workers}):
+        start = time.perf_counter()
+        results[n_workers] = simulate_allocation(allocation, 500000, time_horizon, n_paths=n_paths, workers=n_workers,
+                                                 chunk_size=chunk_size, market_returns=market_returns)
+        seconds = time.perf_counter() - start
+        print(f"workers={n_workers:<3} {n_paths:,} paths x {time_horizon * 12} months in {seconds:.2f}s "
+              f"({n_paths / seconds:,.0f} paths/s)")
+
+    single, parallel = results[1], results[workers]
+    for p in single['percentiles']:
+        if not np.array_equal(single['percentiles'][p], parallel['percentiles'][p]):
+            raise AssertionError("Results depend on the number of workers")
+    median = single['percentiles'][50][-1]
+    print(f"final median {median:,.0f}, P(loss) {single['shortfall_probability'][500000]:.2%} "
+          f"(identical for 1 and {workers} workers)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Paths per second of the Monte Carlo outcome simulator")
+    parser.add_argument('--paths', type=int, default=1000000)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=20000)
+    args = parser.parse_args()
+    run(args.paths, args.years, args.workers, args.chunk_size)
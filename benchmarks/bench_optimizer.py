@@ -0,0 +1,42 @@
+import argparse
+import time
+
+import numpy as np
+
+from optimizer import ShrinkageCovariance, generate_mock_asset_returns, risk_contributions
+
+def _time(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def run(sizes, n_periods, new_periods):
+    print(f"{'assets':>7} {'build':>8} {'update':>8} {'rebuild':>8} {'mean-var':>9} {'risk par':>9} {'held':>5}  "
+          f"{'max RC err':>10}")
+    for n_assets in sizes:
+        assets = [f'ASSET{i}' for i in range(n_assets)]
+        returns = generate_mock_asset_returns(assets, n_periods + new_periods)
+        history, latest = returns.iloc[:n_periods], returns.iloc[n_periods:]
+
+        build_seconds, model = _time(lambda: ShrinkageCovariance.from_frame(history))
+        model.covariance()
+        # New months folded into the running moments versus re-estimating from all history
+        update_seconds, _ = _time(lambda: (model.update(latest.to_numpy()), model.covariance()))
+        rebuild_seconds, rebuilt = _time(lambda: ShrinkageCovariance.from_frame(returns).covariance())
+        if not np.allclose(model.covariance(), rebuilt, rtol=1e-10, atol=1e-14):
+            raise AssertionError("Incremental covariance differs from a full rebuild")
+
+        mean_variance_seconds, weights = _time(lambda: model.solve(assets, 'mean_variance'))
+        risk_parity_seconds, parity = _time(lambda: model.solve(assets, 'risk_parity'))
+        contributions = risk_contributions(parity.to_numpy(), model.covariance())
+        error = np.abs(contributions * n_assets - 1).max()
+        print(f"{n_assets:>7,} {build_seconds:>7.3f}s {update_seconds:>7.3f}s {rebuild_seconds:>7.3f}s "
+              f"{mean_variance_seconds:>8.3f}s {risk_parity_seconds:>8.3f}s {int((weights > 0).sum()):>5}  {error:>10.1e}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Covariance estimation and weight solve times against universe size")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 500, 1000, 2000, 3000])
+    parser.add_argument('--periods', type=int, default=240, help="months of history")
+    parser.add_argument('--new-periods', type=int, default=1, help="months added incrementally")
+    args = parser.parse_args()
+    run(args.sizes, args.periods, args.new_periods)
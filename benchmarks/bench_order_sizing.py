@@ -0,0 +1,44 @@
+import argparse
+import os
+import tempfile
+import time
+
+from asset_selection import get_catalog
+from benchmarks.bench_allocation import generate_profiles
+from order_sizing import generate_mock_price_table, generate_orders, write_orders
+
+def run(n_profiles, n_written, chunk_size):
+    profiles = generate_profiles(n_profiles)
+    price_table = generate_mock_price_table(get_catalog().names)
+
+    start = time.perf_counter()
+    orders = 0
+    for chunk, _ in generate_orders(profiles, 'Neutral', price_table, chunk_size):
+        orders += len(chunk)
+    seconds = time.perf_counter() - start
+    print(f"sizing: {n_profiles:,} portfolios, {orders:,} orders in {seconds:.2f}s "
+          f"({n_profiles / seconds:,.0f} portfolios/s)")
+
+    formats = ['csv']
+    try:
+        import pyarrow  # noqa: F401
+        formats.append('parquet')
+    except ImportError:
+        print("parquet: skipped (pyarrow not installed)")
+    sample = profiles.iloc[:n_written]
+    with tempfile.TemporaryDirectory() as directory:
+        for format in formats:
+            path = os.path.join(directory, f'orders.{format}')
+            start = time.perf_counter()
+            stats = write_orders(path, generate_orders(sample, 'Neutral', price_table, chunk_size))
+            seconds = time.perf_counter() - start
+            print(f"{format}: {stats['portfolios']:,} portfolios, {stats['orders']:,} orders in {seconds:.2f}s "
+                  f"({stats['orders'] / seconds:,.0f} orders/s, {os.path.getsize(path) / 1e6:,.1f} MB)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vectorized order sizing and streamed order output")
+    parser.add_argument('--profiles', type=int, default=1000000)
+    parser.add_argument('--written', type=int, default=200000, help="portfolios written to each output format")
+    parser.add_argument('--chunk-size', type=int, default=200000)
+    args = parser.parse_args()
+    run(args.profiles, args.written, args.chunk_size)
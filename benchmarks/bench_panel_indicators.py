@@ -0,0 +1,51 @@
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from technical_analysis import add_technical_indicators, indicator_columns, panel_indicators
+
+def generate_prices(n_bars, n_assets, seed=0):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0003, 0.015, size=(n_bars, n_assets))
+    return 100 * np.exp(np.cumsum(returns, axis=0))
+
+def run(n_assets, years, block_size, dtype, n_checked):
+    n_bars = years * 252
+    prices = generate_prices(n_bars, n_assets)
+    input_mb = prices.nbytes / 1e6
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    outputs = panel_indicators(prices, block_size=block_size, dtype=dtype)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    output_mb = sum(array.nbytes for array in outputs.values()) / 1e6
+
+    print(f"panel: {n_assets:,} assets x {n_bars:,} bars in {seconds:.2f}s "
+          f"({n_assets * n_bars / seconds / 1e6:.1f}M asset-bars/s)")
+    print(f"memory: input {input_mb:,.0f} MB, outputs {output_mb:,.0f} MB, peak traced during computation {peak / 1e6:,.0f} MB")
+
+    # Per-ticker loop over a few assets, as add_technical_indicators would be used today
+    start = time.perf_counter()
+    for asset in range(n_checked):
+        expected = add_technical_indicators(pd.DataFrame({'Value': prices[:, asset]}))
+        for name in indicator_columns:
+            if not np.allclose(outputs[name][:, asset], expected[name].to_numpy(), equal_nan=True, rtol=1e-6 if dtype == np.float32 else 0, atol=0):
+                raise AssertionError(f"{name} differs from add_technical_indicators for asset {asset}")
+    loop_seconds = (time.perf_counter() - start) / n_checked
+    print(f"per-ticker loop estimate: {loop_seconds * n_assets:.2f}s for {n_assets:,} assets "
+          f"(results match on {n_checked} assets)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Panel indicator computation over a time x asset array")
+    parser.add_argument('--assets', type=int, default=5000)
+    parser.add_argument('--years', type=int, default=20)
+    parser.add_argument('--block-size', type=int, default=500)
+    parser.add_argument('--float32', action='store_true', help="store outputs as float32")
+    parser.add_argument('--check', type=int, default=20, help="assets compared against add_technical_indicators")
+    args = parser.parse_args()
+    run(args.assets, args.years, args.block_size, np.float32 if args.float32 else np.float64, min(args.check, args.assets))
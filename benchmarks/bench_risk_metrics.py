@@ -0,0 +1,51 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from allocation import get_allocation_batch
+from benchmarks.bench_allocation import generate_profiles
+from risk_metrics import PortfolioRisk, RiskEngine, bucket_returns
+
+def _time(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def run(n_series, n_periods, window, n_profiles):
+    rng = np.random.default_rng(0)
+    returns = pd.DataFrame(rng.normal(0.008, 0.05, (n_periods + 1, n_series)))
+    history, new_month = returns.iloc[:n_periods], returns.iloc[n_periods:]
+
+    engine_seconds, rolling = _time(lambda: RiskEngine.from_frame(history, window=window).rolling())
+    # pandas baseline for two of the metrics: rolling volatility and historical 5% quantile
+    pandas_seconds, volatility = _time(lambda: (history.rolling(window).std() * np.sqrt(12),
+                                                history.rolling(window).quantile(0.05, interpolation='lower'))[0])
+    if not np.allclose(rolling['volatility'].to_numpy(), volatility.dropna().to_numpy()):
+        raise AssertionError("Rolling volatility differs from pandas")
+    print(f"{n_series:,} series x {n_periods} months, {window}-month windows")
+    print(f"all 8 metrics, every window   {engine_seconds:8.3f}s")
+    print(f"pandas volatility + quantile  {pandas_seconds:8.3f}s")
+
+    # Room for the new month up front, so the timing leaves out the amortised array growth
+    engine = RiskEngine.from_frame(history, window=window, capacity=n_periods + 12)
+    engine.rolling()
+    update_seconds, _ = _time(lambda: (engine.append(new_month.to_numpy(), index=new_month.index), engine.rolling(),
+                                       engine.latest()))
+    rebuild_seconds, _ = _time(lambda: RiskEngine.from_frame(returns, window=window).rolling())
+    print(f"one new month, incremental    {update_seconds * 1e3:8.2f}ms  (full rebuild {rebuild_seconds:.3f}s)")
+
+    allocation = get_allocation_batch(generate_profiles(n_profiles))
+    portfolio_seconds, risk = _time(lambda: PortfolioRisk(bucket_returns(), allocation, window=window).latest())
+    print(f"{n_profiles:,} client portfolios ({len(np.unique(risk['volatility']))} distinct mixes) "
+          f"in {portfolio_seconds:.3f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vectorized risk metrics over many series and windows")
+    parser.add_argument('--series', type=int, default=2000)
+    parser.add_argument('--periods', type=int, default=600, help="months of history")
+    parser.add_argument('--window', type=int, default=36)
+    parser.add_argument('--profiles', type=int, default=1000000)
+    args = parser.parse_args()
+    run(args.series, args.periods, args.window, args.profiles)
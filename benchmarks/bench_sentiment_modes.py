@@ -0,0 +1,62 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from sentiment_analysis import get_analyzer
+from sentiment_vectorized import accuracy_report, get_vectorized_scorer
+
+# Headline vocabulary: market nouns plus sentiment words, modifiers and punctuation
+_subjects = ['Nifty', 'Sensex', 'Markets', 'Stocks', 'Banks', 'IT shares', 'Rupee', 'Gold', 'Crude', 'RBI', 'FII flows', 'Earnings']
+_verbs = ['rise', 'fall', 'rally', 'slump', 'surge', 'crash', 'gain', 'drop', 'recover', 'stall', 'soar', 'plunge']
+_modifiers = ['very', 'extremely', 'slightly', 'not', "don't", 'never', 'no', 'hardly', 'barely', 'so', 'this', 'kind of', 'without doubt']
+_opinions = ['good', 'bad', 'great', 'terrible', 'strong', 'weak', 'positive', 'negative', 'optimistic', 'worried', 'fear', 'hope', 'problems', 'win', 'loss', 'risk']
+_tails = ['', '', '', '!', '!!', '?', '??', ' :)', ' :(', ' 📉', ' 🚀']
+
+def generate_corpus(n_headlines, seed=0):
+    rng = np.random.default_rng(seed)
+    headlines = []
+    for _ in range(n_headlines):
+        words = [rng.choice(_subjects), rng.choice(_verbs)]
+        for _ in range(rng.integers(1, 4)):
+            if rng.random() < 0.5:
+                words.append(rng.choice(_modifiers))
+            words.append(rng.choice(_opinions))
+        if rng.random() < 0.15:
+            words.insert(rng.integers(1, len(words)), 'but')
+        if rng.random() < 0.1:
+            words = [word.upper() if rng.random() < 0.5 else word for word in words]
+        headlines.append(' '.join(words) + rng.choice(_tails))
+    return headlines
+
+def run(n_headlines, n_exact):
+    corpus = generate_corpus(n_headlines)
+    scorer = get_vectorized_scorer()
+
+    start = time.perf_counter()
+    scorer.score(corpus)
+    vectorized_seconds = time.perf_counter() - start
+
+    analyzer = get_analyzer()
+    sample = corpus[:n_exact]
+    start = time.perf_counter()
+    exact_scores = [analyzer.polarity_scores(text)['compound'] for text in sample]
+    exact_seconds = time.perf_counter() - start
+
+    exact_rate = n_exact / exact_seconds
+    vectorized_rate = n_headlines / vectorized_seconds
+    print(f"exact:      {n_exact:>10,} headlines in {exact_seconds:8.2f}s  ({exact_rate:,.0f} headlines/s)")
+    print(f"vectorized: {n_headlines:>10,} headlines in {vectorized_seconds:8.2f}s  ({vectorized_rate:,.0f} headlines/s)")
+    print(f"speedup: {vectorized_rate / exact_rate:.1f}x")
+
+    report = accuracy_report(sample, exact_scores)
+    print("accuracy on the exact sample:")
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exact VADER against the vectorized lexicon scorer: speed and accuracy")
+    parser.add_argument('--headlines', type=int, default=1000000)
+    parser.add_argument('--exact', type=int, default=50000, help="headlines also scored with polarity_scores")
+    args = parser.parse_args()
+    run(args.headlines, min(args.exact, args.headlines))
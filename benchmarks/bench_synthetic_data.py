@@ -0,0 +1,28 @@
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from synthetic_data import generate_chunks
+
+def run(rows, workers, chunk_size):
+    for kind, n_rows in rows.items():
+        results = {}
+        for n_workers in sorted({1, workers}):
+            start = time.perf_counter()
+            results[n_workers] = pd.concat(generate_chunks(kind, n_rows, seed=0, chunk_size=chunk_size, workers=n_workers))
+            seconds = time.perf_counter() - start
+            print(f"{kind:<8} workers={n_workers:<3} {n_rows:,} rows in {seconds:.2f}s ({n_rows / seconds:,.0f} rows/s)")
+        if not results[1].equals(results[workers]):
+            raise AssertionError(f"{kind} output depends on the number of workers")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput of the chunked synthetic data generators")
+    parser.add_argument('--news', type=int, default=2000000)
+    parser.add_argument('--macro', type=int, default=2000000)
+    parser.add_argument('--returns', type=int, default=50000, help="series of 120 periods each")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    args = parser.parse_args()
+    run({'news': args.news, 'macro': args.macro, 'returns': args.returns}, args.workers, args.chunk_size)
@@ -0,0 +1,99 @@
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+def _request(url, method, payload):
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    request = urllib.request.Request(url, data=data, method=method, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        response.read()
+        return response.status
+
+def _random_profile(rng):
+    return {
+        'capital': rng.choice([50000, 250000, 500000, 2000000]),
+        'time_horizon': rng.randint(1, 10),
+        'risk_tolerance': rng.choice(['low', 'medium', 'high']),
+    }
+
+def _client(base_url, endpoint, n_requests, seed, latencies, errors):
+    rng = random.Random(seed)
+    for _ in range(n_requests):
+        if endpoint == 'outlook':
+            method, payload = 'GET', None
+        else:
+            method, payload = 'POST', _random_profile(rng)
+        start = time.perf_counter()
+        try:
+            _request(f"{base_url}/{endpoint}", method, payload)
+            latencies.append(time.perf_counter() - start)
+        except (urllib.error.URLError, OSError) as e:
+            errors.append(e)
+
+def run_load_test(base_url, endpoint='assets', concurrency=16, requests_per_client=200):
+    latencies = []
+    errors = []
+    threads = [threading.Thread(target=_client, args=(base_url, endpoint, requests_per_client, seed, latencies, errors))
+               for seed in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'endpoint': endpoint,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed,
+        'p50_ms': float(np.percentile(latencies_ms, 50)) if len(latencies_ms) else None,
+        'p99_ms': float(np.percentile(latencies_ms, 99)) if len(latencies_ms) else None,
+        'first_error': str(errors[0]) if errors else None,
+    }
+
+def _ms(value):
+    return 'n/a' if value is None else f"{value:.2f} ms"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for the allocation service")
+    parser.add_argument('--url', help="base URL of a running service; omitted starts one in-process")
+    parser.add_argument('--endpoint', choices=['allocation', 'outlook', 'assets'], default='assets')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=200, help="requests per client")
+    parser.add_argument('--workers', type=int, default=8, help="worker pool size of the in-process service")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        from service import create_server
+        from market_evaluation import market_snapshot
+        server = create_server(port=0, workers=args.workers, warm=False)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        # Measure steady state, not the first market evaluation
+        market_snapshot.get()
+
+    try:
+        result = run_load_test(base_url.rstrip('/'), args.endpoint, args.concurrency, args.requests)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    print(f"{result['endpoint']}: {result['requests']} requests, {result['errors']} errors in {result['seconds']:.2f}s")
+    if result['first_error'] is not None:
+        print(f"first error: {result['first_error']}")
+    print(f"throughput: {result['requests_per_second']:.0f} req/s  p50: {_ms(result['p50_ms'])}  p99: {_ms(result['p99_ms'])}")
+    if not result['requests']:
+        sys.exit(1)
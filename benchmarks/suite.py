@@ -0,0 +1,227 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from allocation import get_allocation
+from asset_selection import select_assets
+from backtest import run_backtest
+from data_processing import preprocess_data
+from market_evaluation import evaluate_stock_market, stage_graph
+from sentiment_analysis import bulk_sentiment_analysis, generate_random_news
+from technical_analysis import add_technical_indicators
+
+results_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+default_history = os.path.join(results_dir, 'history.jsonl')
+default_baseline = os.path.join(results_dir, 'baseline.json')
+
+# Input size of every benchmark at each scale; rows for the data functions,
+# headlines for sentiment, calls for the per-client functions and client
+# profiles for the backtest
+scales = {
+    'small': {'preprocess_data': 25, 'add_technical_indicators': 300, 'bulk_sentiment_analysis': 1000,
+              'generate_random_news': 100, 'get_allocation': 10000, 'select_assets': 10000, 'evaluate_stock_market': 1,
+              'run_backtest': 1000},
+    'medium': {'preprocess_data': 250, 'add_technical_indicators': 10000, 'bulk_sentiment_analysis': 10000,
+               'generate_random_news': 1000, 'get_allocation': 100000, 'select_assets': 100000, 'evaluate_stock_market': 1,
+               'run_backtest': 10000},
+    'large': {'preprocess_data': 2500, 'add_technical_indicators': 100000, 'bulk_sentiment_analysis': 50000,
+              'generate_random_news': 5000, 'get_allocation': 1000000, 'select_assets': 1000000, 'evaluate_stock_market': 1,
+              'run_backtest': 100000},
+}
+
+# Each setup(size) builds synthetic inputs outside the timing and returns the callable to time
+def _setup_preprocess_data(size):
+    rng = np.random.default_rng(0)
+    months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+    wide = pd.DataFrame(rng.normal(1, 5, size=(size, 12)).round(2), columns=months)
+    # Years are parsed into pandas timestamps (1677-2262), so past 300 rows the
+    # block of years up to 2023 repeats instead of running into negative years
+    wide.insert(0, 'Year', 2023 - np.arange(size)[::-1] % 300)
+    wide['Annual'] = wide[months].sum(axis=1).round(2)
+    handle, path = tempfile.mkstemp(suffix='.csv')
+    os.close(handle)
+    wide.to_csv(path, index=False)
+
+    def run():
+        # preprocess_data prints the columns it found
+        with contextlib.redirect_stdout(io.StringIO()):
+            preprocess_data(path)
+    return run, lambda: os.remove(path)
+
+def _setup_add_technical_indicators(size):
+    rng = np.random.default_rng(0)
+    # Daily dates from 1700 stay inside the pandas timestamp range for the large scale too
+    data = pd.DataFrame({'Date': pd.date_range('1700-01-01', periods=size, freq='D'),
+                         'Value': rng.normal(1, 5, size)})
+    return lambda: add_technical_indicators(data), None
+
+def _setup_bulk_sentiment_analysis(size):
+    rng = np.random.default_rng(0)
+    words = np.array(['Good', 'Bad', 'Neutral', 'strong', 'weak', 'rally', 'crash', 'markets', 'not', 'very'])
+    texts = [' '.join(row) for row in rng.choice(words, size=(size, 6))]
+    return lambda: bulk_sentiment_analysis(pd.DataFrame({'text': texts}), workers=1), None
+
+def _setup_generate_random_news(size):
+    return lambda: generate_random_news(size), None
+
+def _setup_get_allocation(size):
+    rng = np.random.default_rng(0)
+    profiles = list(zip(rng.uniform(10000, 5000000, size), rng.integers(1, 15, size),
+                        rng.choice(['low', 'medium', 'high'], size)))
+
+    def run():
+        for capital, time_horizon, risk_tolerance in profiles:
+            get_allocation(capital, time_horizon, risk_tolerance)
+    return run, None
+
+def _setup_select_assets(size):
+    rng = np.random.default_rng(0)
+    outlooks = rng.choice(['Positive', 'Neutral', 'Negative'], size)
+
+    def run():
+        for market_outlook in outlooks:
+            select_assets(40, 30, 30, market_outlook)
+    return run, None
+
+def _setup_evaluate_stock_market(size):
+    def run():
+        # The stage graph reuses results whose inputs have not changed, which
+        # would leave only cache hits to time after the warm-up call
+        stage_graph.invalidate()
+        evaluate_stock_market()
+    return run, None
+
+def _setup_run_backtest(size):
+    rng = np.random.default_rng(0)
+    profiles = pd.DataFrame({'capital': rng.uniform(10000, 5000000, size), 'time_horizon': rng.integers(1, 15, size),
+                             'risk_tolerance': rng.choice(['low', 'medium', 'high'], size)})
+    # The range runs into the partly reported current year, whose missing months must not reach the summary
+    summary = run_backtest(profiles, end_year=2024)['summary']
+    if not np.isfinite(summary.to_numpy(dtype=float)).all():
+        raise AssertionError("run_backtest produced non-finite summaries for 2000-2024")
+    return lambda: run_backtest(profiles, end_year=2024), None
+
+benchmarks = {
+    'preprocess_data': _setup_preprocess_data,
+    'add_technical_indicators': _setup_add_technical_indicators,
+    'bulk_sentiment_analysis': _setup_bulk_sentiment_analysis,
+    'generate_random_news': _setup_generate_random_news,
+    'get_allocation': _setup_get_allocation,
+    'select_assets': _setup_select_assets,
+    'evaluate_stock_market': _setup_evaluate_stock_market,
+    'run_backtest': _setup_run_backtest,
+}
+
+def _environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(results_dir), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+def time_benchmark(name, size, repeat):
+    run, cleanup = benchmarks[name](size)
+    try:
+        run()  # warm-up: imports, caches and lazily built analyzers
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    finally:
+        if cleanup is not None:
+            cleanup()
+    return {'name': name, 'size': size, 'repeat': repeat, 'min': min(timings),
+            'median': statistics.median(timings), 'per_item': min(timings) / size}
+
+def run_suite(scale_names, names=None, repeat=3, history=default_history):
+    results = []
+    for scale in scale_names:
+        for name in names or benchmarks:
+            result = time_benchmark(name, scales[scale][name], repeat)
+            result['scale'] = scale
+            results.append(result)
+            print(f"{scale:<7} {name:<26} size={result['size']:>9,} min={result['min']:9.4f}s "
+                  f"median={result['median']:9.4f}s")
+    record = {'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+              'environment': _environment(), 'results': results}
+    if history:
+        os.makedirs(os.path.dirname(os.path.abspath(history)), exist_ok=True)
+        with open(history, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+    return record
+
+def load_history(history=default_history):
+    with open(history) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def compare_runs(baseline, current, threshold=0.10):
+    # Benchmarks whose best time grew by more than threshold (0.10 = 10%) over the baseline
+    baseline_times = {(r['scale'], r['name']): r for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        reference = baseline_times.get((result['scale'], result['name']))
+        if reference is None or reference['size'] != result['size']:
+            continue
+        change = result['min'] / reference['min'] - 1
+        rows.append({'scale': result['scale'], 'name': result['name'], 'baseline': reference['min'],
+                     'current': result['min'], 'change': change, 'regression': change > threshold})
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark suite for every pipeline stage")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="time the benchmarks and append the results to the history")
+    run_parser.add_argument('--scale', choices=list(scales), action='append',
+                            help="may be repeated; defaults to small and medium")
+    run_parser.add_argument('--only', choices=list(benchmarks), action='append', help="may be repeated")
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--history', default=default_history)
+    run_parser.add_argument('--save-baseline', action='store_true', help="also store this run as the baseline")
+    run_parser.add_argument('--baseline', default=default_baseline)
+
+    compare_parser = subparsers.add_parser('compare', help="compare the latest run in the history with the baseline")
+    compare_parser.add_argument('--history', default=default_history)
+    compare_parser.add_argument('--baseline', default=default_baseline)
+    compare_parser.add_argument('--threshold', type=float, default=0.10, help="allowed slowdown, 0.10 = 10%%")
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        record = run_suite(args.scale or ['small', 'medium'], args.only, args.repeat, args.history)
+        if args.save_baseline:
+            os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+            with open(args.baseline, 'w') as f:
+                json.dump(record, f, indent=2)
+            print(f"Baseline saved to {args.baseline}")
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare_runs(baseline, load_history(args.history)[-1], args.threshold)
+        for row in rows:
+            flag = 'REGRESSION' if row['regression'] else ''
+            print(f"{row['scale']:<7} {row['name']:<26} {row['baseline']:9.4f}s -> {row['current']:9.4f}s "
+                  f"({row['change']:+7.1%}) {flag}")
+        regressions = [row for row in rows if row['regression']]
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%} out of {len(rows)} benchmarks")
+        sys.exit(1 if regressions else 0)
@@ -1,64 +1,128 @@
-import pandas as pd
-import os
-
-def preprocess_data(filepath):
-    data = pd.read_csv(filepath)
-    
-    # Print the columns to inspect the CSV structure
-    print("Data columns after stripping whitespace:")
-    data.columns = data.columns.str.strip()
-    print(data.columns)
-    
-    # Rename 'Year' to 'Date'
-    if 'Year' in data.columns:
-        data.rename(columns={'Year': 'Date'}, inplace=True)
-    else:
-        raise KeyError("The 'Year' column is not found in the data")
-    
-    # Convert 'Date' column to datetime
-    data['Date'] = pd.to_datetime(data['Date'], format='%Y')
-    
-    # Drop the 'Annual' column if it exists
-    if 'Annual' in data.columns:
-        data.drop(columns=['Annual'], inplace=True)
-    
-    # Melt the dataframe to long format
-    data = data.melt(id_vars='Date', var_name='Month', value_name='Value')
-    
-    # Combine 'Date' and 'Month' into a single datetime column
-    month_str_to_num = {
-        'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04', 'May': '05', 'Jun': '06',
-        'Jul': '07', 'Aug': '08', 'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
-    }
-    data['Month'] = data['Month'].map(month_str_to_num)
-    data['Date'] = data.apply(lambda row: pd.to_datetime(f"{row['Date'].year}-{row['Month']}-01"), axis=1)
-    
-    # Drop the 'Month' column
-    data.drop(columns=['Month'], inplace=True)
-    
-    # Sort the data by date
-    data.sort_values(by='Date', inplace=True)
-    
-    return data
-
-# Example usage
-if __name__ == "__main__":
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    data_dir = os.path.join(base_dir, 'data')
-    
-    default_path = r'C:\Users\91808\OneDrive\Desktop\hack\investment-allocation-tool\portfolio_analysis\src\data\nifty.csv'
-    
-    try:
-        nifty_data = preprocess_data(default_path)
-        print("Preprocessed Nifty Data:")
-        print(nifty_data.head())
-        
-        # Filter data between 2000 and 2023
-        nifty_data = nifty_data[nifty_data['Date'].dt.year.between(2000, 2023)]
-        print("Filtered Nifty Data:")
-        print(nifty_data.head())
-        
-    except FileNotFoundError as e:
-        print(e)
-    except KeyError as e:
-        print(e)
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+# Columnar cache for parsed year x month files, keyed by file path, mtime and size
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+month_str_to_num = {
+    'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04', 'May': '05', 'Jun': '06',
+    'Jul': '07', 'Aug': '08', 'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
+}
+
+def _melt_monthly(data):
+    # Rename 'Year' to 'Date'
+    if 'Year' in data.columns:
+        data.rename(columns={'Year': 'Date'}, inplace=True)
+    else:
+        raise KeyError("The 'Year' column is not found in the data")
+    
+    # Convert 'Date' column to datetime
+    data['Date'] = pd.to_datetime(data['Date'], format='%Y')
+    
+    # Drop the 'Annual' column if it exists
+    if 'Annual' in data.columns:
+        data.drop(columns=['Annual'], inplace=True)
+    
+    # Melt the dataframe to long format
+    data = data.melt(id_vars='Date', var_name='Month', value_name='Value')
+    
+    # Combine 'Date' and 'Month' into a single datetime column, parsing all rows in one call
+    data['Month'] = data['Month'].map(month_str_to_num)
+    data['Date'] = pd.to_datetime(data['Date'].dt.year.astype(str) + '-' + data['Month'] + '-01', format='%Y-%m-%d')
+    
+    # Drop the 'Month' column
+    data.drop(columns=['Month'], inplace=True)
+    
+    # Sort the data by date
+    data.sort_values(by='Date', inplace=True)
+    
+    return data
+
+def preprocess_data(filepath):
+    data = pd.read_csv(filepath)
+    
+    # Print the columns to inspect the CSV structure
+    print("Data columns after stripping whitespace:")
+    data.columns = data.columns.str.strip()
+    print(data.columns)
+    
+    return _melt_monthly(data)
+
+def _cache_file(filepath, cache_dir):
+    digest = hashlib.sha1(os.path.abspath(filepath).encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.npz")
+
+def _read_cache(filepath, cache_dir):
+    stat = os.stat(filepath)
+    cache_file = _cache_file(filepath, cache_dir)
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        with np.load(cache_file, allow_pickle=False) as cached:
+            if int(cached['mtime_ns']) != stat.st_mtime_ns or int(cached['size']) != stat.st_size:
+                return None
+            dates = cached['date'].astype(str(cached['date_dtype']))
+            data = pd.DataFrame({'Date': dates, 'Value': cached['value']}, index=pd.Index(cached['index']))
+    except (OSError, ValueError, KeyError):
+        # Corrupt or outdated cache entries are simply rebuilt
+        return None
+    return data
+
+def _write_cache(filepath, cache_dir, data):
+    stat = os.stat(filepath)
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_file = _cache_file(filepath, cache_dir)
+    dates = data['Date'].to_numpy()
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp_file, 'wb') as f:
+        np.savez(f,
+                 mtime_ns=np.int64(stat.st_mtime_ns),
+                 size=np.int64(stat.st_size),
+                 index=data.index.to_numpy(),
+                 date=dates.view('int64'),
+                 date_dtype=np.array(str(dates.dtype)),
+                 value=data['Value'].to_numpy())
+    os.replace(tmp_file, cache_file)
+
+def load_monthly_data_many(filepaths, cache_dir=CACHE_DIR):
+    # Load several wide year x month files in one call; returns {filepath: frame}
+    results = {}
+    for filepath in filepaths:
+        data = _read_cache(filepath, cache_dir) if cache_dir else None
+        if data is None:
+            data = pd.read_csv(filepath)
+            data.columns = data.columns.str.strip()
+            data = _melt_monthly(data)
+            if cache_dir:
+                _write_cache(filepath, cache_dir, data)
+        results[filepath] = data
+    return results
+
+def load_monthly_data(filepath, cache_dir=CACHE_DIR):
+    # Cached, quiet equivalent of preprocess_data
+    return load_monthly_data_many([filepath], cache_dir=cache_dir)[filepath]
+
+# Example usage
+if __name__ == "__main__":
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    data_dir = os.path.join(base_dir, 'data')
+    
+    default_path = r'C:\Users\91808\OneDrive\Desktop\hack\investment-allocation-tool\portfolio_analysis\src\data\nifty.csv'
+    
+    try:
+        nifty_data = preprocess_data(default_path)
+        print("Preprocessed Nifty Data:")
+        print(nifty_data.head())
+        
+        # Filter data between 2000 and 2023
+        nifty_data = nifty_data[nifty_data['Date'].dt.year.between(2000, 2023)]
+        print("Filtered Nifty Data:")
+        print(nifty_data.head())
+        
+    except FileNotFoundError as e:
+        print(e)
+    except KeyError as e:
+        print(e)
@@ -1,14 +1,19 @@
-import pandas as pd
-
-def generate_mock_esg_scores(assets):
-    # Generate mock ESG scores for the given assets
-    esg_scores = pd.DataFrame({
-        'Asset': assets,
-        'ESG_Score': [72]  # Only one score for Nifty
-    })
-    return esg_scores
-
-def esg_analysis(esg_scores):
-    # Filter assets with high ESG scores
-    high_esg_assets = esg_scores[esg_scores['ESG_Score'] > 70]
-    return high_esg_assets
+import numpy as np
+import pandas as pd
+
+def generate_mock_esg_scores(assets, seed=0):
+    # Generate mock ESG scores for the given assets; Nifty keeps its fixed score
+    rng = np.random.default_rng(seed)
+    scores = rng.uniform(20, 95, len(assets)).round(2)
+    esg_scores = pd.DataFrame({
+        'Asset': assets,
+        'ESG_Score': np.where(np.asarray(assets, dtype=object) == 'Nifty', 72, scores)
+    })
+    return esg_scores
+
+def esg_analysis(esg_scores, threshold=70):
+    # Filter assets with high ESG scores; an ESGStore answers from its sorted index
+    if hasattr(esg_scores, 'above'):
+        return esg_scores.above(threshold)
+    high_esg_assets = esg_scores[esg_scores['ESG_Score'] > threshold]
+    return high_esg_assets
@@ -0,0 +1,256 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Query dimensions; every query can be restricted to a sector, an asset class or both
+group_columns = ('Sector', 'Asset_Class')
+
+def _sorted_index(scores, codes=None, n_groups=1):
+    # Positions sorted by (group, score) with the score array in that order and
+    # group boundaries, so a group's scores are one contiguous sorted slice
+    if codes is None:
+        order = np.argsort(scores, kind='stable')
+        bounds = np.array([0, len(scores)])
+    else:
+        order = np.lexsort((scores, codes))
+        bounds = np.searchsorted(codes[order], np.arange(n_groups + 1))
+    return {'order': order.astype(np.int64), 'scores': scores[order], 'bounds': bounds.astype(np.int64)}
+
+class ESGStore:
+    # ESG scores for a large issuer universe held as flat arrays with sorted
+    # indexes over all issuers, each sector, each asset class and each
+    # (sector, asset class) pair. Threshold, range and top-k queries binary
+    # search one contiguous slice instead of scanning every issuer.
+    #
+    # Updates are written to the score arrays straight away and the changed
+    # positions are kept in a small pending set that queries check alongside the
+    # (now partly stale) indexes; the indexes are rebuilt once the pending set
+    # grows past compact_fraction of the store.
+    def __init__(self, assets, scores, sectors=None, asset_classes=None, compact_fraction=0.01):
+        self.compact_fraction = compact_fraction
+        assets = np.asarray(assets, dtype=str)
+        n = len(assets)
+        self._assets = assets
+        self._scores = np.array(scores, dtype=np.float64)
+        self._labels = {}
+        self._codes = {}
+        for column, values in zip(group_columns, (sectors, asset_classes)):
+            values = np.full(n, '', dtype=str) if values is None else np.asarray(values, dtype=str)
+            codes, labels = pd.factorize(values, sort=True)
+            self._codes[column] = codes.astype(np.int32)
+            self._labels[column] = list(labels)
+        self._rebuild()
+
+    @classmethod
+    def from_frame(cls, frame, **kwargs):
+        # Columns as produced by generate_mock_esg_scores, plus optional Sector and Asset_Class
+        return cls(frame['Asset'].to_numpy(), frame['ESG_Score'].to_numpy(),
+                   frame['Sector'].to_numpy() if 'Sector' in frame else None,
+                   frame['Asset_Class'].to_numpy() if 'Asset_Class' in frame else None, **kwargs)
+
+    def __len__(self):
+        return len(self._assets)
+
+    def _combined_codes(self):
+        return (self._codes['Sector'].astype(np.int64) * max(len(self._labels['Asset_Class']), 1) +
+                self._codes['Asset_Class'])
+
+    def _rebuild(self):
+        scores = self._scores
+        n_sectors = len(self._labels['Sector'])
+        n_classes = len(self._labels['Asset_Class'])
+        self._indexes = {
+            (): _sorted_index(scores),
+            ('Sector',): _sorted_index(scores, self._codes['Sector'], n_sectors),
+            ('Asset_Class',): _sorted_index(scores, self._codes['Asset_Class'], n_classes),
+            ('Sector', 'Asset_Class'): _sorted_index(scores, self._combined_codes(), n_sectors * n_classes),
+        }
+        self._asset_index = None
+        self._pending = np.array([], dtype=np.int64)
+        self._stale = np.zeros(len(self._assets), dtype=bool)
+
+    def _positions_of(self, assets):
+        # The asset id hash index is only built once an id lookup needs it
+        if self._asset_index is None:
+            self._asset_index = pd.Index(self._assets)
+        return self._asset_index.get_indexer(np.asarray(assets, dtype=str))
+
+    def _slice(self, sector, asset_class):
+        # Index and [start, end) bounds for the requested group, or None when a label is unknown
+        key, group = (), 0
+        try:
+            if sector is not None and asset_class is not None:
+                key = ('Sector', 'Asset_Class')
+                group = self._labels['Sector'].index(sector) * len(self._labels['Asset_Class']) + \
+                    self._labels['Asset_Class'].index(asset_class)
+            elif sector is not None:
+                key, group = ('Sector',), self._labels['Sector'].index(sector)
+            elif asset_class is not None:
+                key, group = ('Asset_Class',), self._labels['Asset_Class'].index(asset_class)
+        except ValueError:
+            return None
+        index = self._indexes[key]
+        start, end = index['bounds'][group], index['bounds'][group + 1]
+        # Issuers without a score sort to the end of their group and never match a query
+        end = start + np.searchsorted(index['scores'][start:end], np.nan, side='left')
+        return index, start, end
+
+    def _pending_in_group(self, sector, asset_class):
+        positions = self._pending
+        if sector is not None:
+            positions = positions[self._codes['Sector'][positions] == self._labels['Sector'].index(sector)]
+        if asset_class is not None:
+            positions = positions[self._codes['Asset_Class'][positions] == self._labels['Asset_Class'].index(asset_class)]
+        return positions
+
+    def _positions_between(self, low, high, sector, asset_class, low_inclusive, high_inclusive):
+        located = self._slice(sector, asset_class)
+        if located is None:
+            return np.array([], dtype=np.int64)
+        index, start, end = located
+        group_scores = index['scores'][start:end]
+        first = start + (np.searchsorted(group_scores, low, side='left' if low_inclusive else 'right')
+                         if low is not None else 0)
+        last = start + (np.searchsorted(group_scores, high, side='right' if high_inclusive else 'left')
+                        if high is not None else len(group_scores))
+        positions = index['order'][first:last]
+        if len(self._pending):
+            # Entries updated since the last rebuild are answered from the live score array
+            positions = positions[~self._stale[positions]]
+            pending = self._pending_in_group(sector, asset_class)
+            scores = self._scores[pending]
+            keep = ~np.isnan(scores)
+            if low is not None:
+                keep &= scores >= low if low_inclusive else scores > low
+            if high is not None:
+                keep &= scores <= high if high_inclusive else scores < high
+            positions = np.concatenate([positions, pending[keep]])
+            positions = positions[np.argsort(self._scores[positions], kind='stable')]
+        return positions
+
+    def _frame(self, positions):
+        return pd.DataFrame({
+            'Asset': self._assets[positions],
+            'ESG_Score': self._scores[positions],
+            'Sector': np.array(self._labels['Sector'], dtype=object)[self._codes['Sector'][positions]],
+            'Asset_Class': np.array(self._labels['Asset_Class'], dtype=object)[self._codes['Asset_Class'][positions]],
+        })
+
+    def above(self, threshold, sector=None, asset_class=None, inclusive=False):
+        # Issuers scoring above threshold (the esg_analysis rule), lowest score first
+        return self._frame(self._positions_between(threshold, None, sector, asset_class, inclusive, True))
+
+    def between(self, low, high, sector=None, asset_class=None):
+        # Issuers with low <= score <= high, lowest score first
+        return self._frame(self._positions_between(low, high, sector, asset_class, True, True))
+
+    def count_above(self, threshold, sector=None, asset_class=None, inclusive=False):
+        return len(self._positions_between(threshold, None, sector, asset_class, inclusive, True))
+
+    def top_k(self, k, sector=None, asset_class=None):
+        # The k best-scoring issuers, best first
+        located = self._slice(sector, asset_class)
+        if located is None or k <= 0:
+            return self._frame(np.array([], dtype=np.int64))
+        index, start, end = located
+        if not len(self._pending):
+            positions = index['order'][max(end - k, start):end][::-1]
+            return self._frame(positions)
+        # Stale index entries are skipped, so read enough extra candidates to cover them
+        candidates = index['order'][max(end - k - len(self._pending), start):end]
+        candidates = np.concatenate([candidates[~self._stale[candidates]], self._pending_in_group(sector, asset_class)])
+        candidates = candidates[~np.isnan(self._scores[candidates])]
+        order = np.argsort(-self._scores[candidates], kind='stable')[:k]
+        return self._frame(candidates[order])
+
+    def scores(self, assets):
+        # Current score of each asset, NaN for unknown assets
+        positions = self._positions_of(assets)
+        result = np.full(len(positions), np.nan)
+        found = positions >= 0
+        result[found] = self._scores[positions[found]]
+        return result
+
+    def update(self, assets, scores):
+        # Sets new scores for existing issuers; see add() for new ones
+        positions = self._positions_of(assets)
+        if (positions < 0).any():
+            missing = np.asarray(assets, dtype=str)[positions < 0]
+            raise KeyError(f"Unknown assets: {', '.join(missing[:5])}")
+        if not self._scores.flags.writeable:
+            self._scores = self._scores.copy()
+        self._scores[positions] = np.asarray(scores, dtype=np.float64)
+        new = positions[~self._stale[positions]]
+        self._stale[new] = True
+        self._pending = np.concatenate([self._pending, np.unique(new)])
+        if len(self._pending) > self.compact_fraction * len(self._assets):
+            self._rebuild()
+
+    def add(self, assets, scores, sectors=None, asset_classes=None):
+        # Appends new issuers; the indexes are rebuilt
+        n = len(assets)
+        self._assets = np.concatenate([self._assets, np.asarray(assets, dtype=str)])
+        self._scores = np.concatenate([self._scores, np.asarray(scores, dtype=np.float64)])
+        for column, values in zip(group_columns, (sectors, asset_classes)):
+            values = np.full(n, '', dtype=str) if values is None else np.asarray(values, dtype=str)
+            labels = np.array(self._labels[column], dtype=str)
+            combined = np.concatenate([labels[self._codes[column]] if len(labels) else
+                                       np.full(len(self._codes[column]), '', dtype=str), values])
+            codes, labels = pd.factorize(combined, sort=True)
+            self._codes[column] = codes.astype(np.int32)
+            self._labels[column] = list(labels)
+        self._rebuild()
+
+    def save(self, directory):
+        # One .npy file per array so load() can memory-map them
+        if len(self._pending):
+            self._rebuild()
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'assets.npy'), self._assets)
+        np.save(os.path.join(directory, 'scores.npy'), self._scores)
+        for column in group_columns:
+            np.save(os.path.join(directory, f'{column.lower()}_codes.npy'), self._codes[column])
+        for key, index in self._indexes.items():
+            name = '_'.join(column.lower() for column in key) or 'all'
+            for part, array in index.items():
+                np.save(os.path.join(directory, f'index_{name}_{part}.npy'), array)
+        with open(os.path.join(directory, 'labels.json'), 'w') as f:
+            json.dump(self._labels, f)
+
+    @classmethod
+    def load(cls, directory, mmap=True, compact_fraction=0.01):
+        # With mmap the arrays stay on disk and are paged in as queries touch them;
+        # updates are copy-on-write and reach disk only through save()
+        mode = 'c' if mmap else None
+        store = cls.__new__(cls)
+        store.compact_fraction = compact_fraction
+        store._assets = np.load(os.path.join(directory, 'assets.npy'), mmap_mode=mode)
+        store._scores = np.load(os.path.join(directory, 'scores.npy'), mmap_mode=mode)
+        store._codes = {column: np.load(os.path.join(directory, f'{column.lower()}_codes.npy'), mmap_mode=mode)
+                        for column in group_columns}
+        with open(os.path.join(directory, 'labels.json')) as f:
+            store._labels = json.load(f)
+        store._indexes = {}
+        for key in [(), ('Sector',), ('Asset_Class',), ('Sector', 'Asset_Class')]:
+            name = '_'.join(column.lower() for column in key) or 'all'
+            store._indexes[key] = {part: np.load(os.path.join(directory, f'index_{name}_{part}.npy'), mmap_mode=mode)
+                                   for part in ('order', 'scores', 'bounds')}
+        store._asset_index = None
+        store._pending = np.array([], dtype=np.int64)
+        store._stale = np.zeros(len(store._assets), dtype=bool)
+        return store
+
+def generate_mock_esg_universe(n_issuers, seed=0):
+    # Synthetic vendor universe: issuer ids, scores on 0-100 and sector / asset class labels
+    rng = np.random.default_rng(seed)
+    sectors = np.array(['Energy', 'Materials', 'Industrials', 'Consumer', 'Health Care', 'Financials',
+                        'IT', 'Telecom', 'Utilities', 'Real Estate'])
+    asset_classes = np.array(['Equity', 'Bond', 'Fund'])
+    return pd.DataFrame({
+        'Asset': np.char.add('ISSUER', np.arange(n_issuers).astype(str)),
+        'ESG_Score': rng.normal(60, 15, n_issuers).clip(0, 100).round(2),
+        'Sector': rng.choice(sectors, n_issuers),
+        'Asset_Class': rng.choice(asset_classes, n_issuers, p=[0.6, 0.3, 0.1]),
+    })
@@ -0,0 +1,136 @@
+import argparse
+import email.utils
+import hashlib
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from synthetic_data import news_chunk
+
+# Offline stand-in for the price and news sites ingestion talks to:
+#   /prices/<symbol>.csv  daily closes (Date, Close) for the last n_years
+#   /news/<page>.html     a page of headlines in <h2 class="headline"> tags
+# Responses carry ETag and Last-Modified and answer conditional GETs with 304.
+# latency delays every response and fail_every makes every n-th request a 503,
+# so pooling, rate limits and retries can be exercised without a network.
+
+last_modified = email.utils.formatdate(time.mktime((2024, 7, 1, 0, 0, 0, 0, 0, 0)), usegmt=True)
+
+def price_csv(symbol, n_years=10):
+    rng = np.random.default_rng(zlib.crc32(symbol.encode('utf-8')))
+    dates = pd.bdate_range(end='2024-06-28', periods=n_years * 260)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0.0004, 0.012, len(dates))))
+    rows = map(','.join, zip(np.datetime_as_string(dates.to_numpy(), unit='D'), np.char.mod('%.2f', closes)))
+    return 'Date,Close\n' + '\n'.join(rows) + '\n'
+
+def news_html(page, headlines_per_page=50):
+    texts = news_chunk(seed=page, chunk=0, start=0, size=headlines_per_page)['text']
+    articles = ''.join(f'<article><h2 class="headline">{text}</h2><p>Story {i}</p></article>'
+                       for i, text in enumerate(texts))
+    return f'<html><head><title>Markets page {page}</title></head><body>{articles}</body></html>'
+
+class FakeMarketHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            number = server.requests
+        if server.latency:
+            time.sleep(server.latency)
+        if server.fail_every and number % server.fail_every == 0:
+            self._respond(503, b'unavailable', 'text/plain')
+            return
+
+        body = server.body(self.path)
+        if body is None:
+            self._respond(404, b'not found', 'text/plain')
+            return
+        content, content_type = body
+        etag = '"' + hashlib.blake2b(content, digest_size=8).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag or self.headers.get('If-Modified-Since') == last_modified:
+            with server.lock:
+                server.not_modified += 1
+            self._respond(304, b'', content_type, etag)
+            return
+        self._respond(200, content, content_type, etag)
+
+    def _respond(self, status, content, content_type, etag=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        if etag is not None:
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeMarketServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, fail_every=0):
+        super().__init__((host, port), FakeMarketHandler)
+        self.latency = latency
+        self.fail_every = fail_every
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.not_modified = 0
+        self._bodies = {}
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def body(self, path):
+        # Generated once per path and reused, like a static site
+        if path not in self._bodies:
+            if path.startswith('/prices/') and path.endswith('.csv'):
+                self._bodies[path] = (price_csv(path[len('/prices/'):-len('.csv')]).encode('utf-8'), 'text/csv')
+            elif path.startswith('/news/') and path.endswith('.html') and path[6:-5].isdigit():
+                self._bodies[path] = (news_html(int(path[6:-5])).encode('utf-8'), 'text/html; charset=utf-8')
+            else:
+                return None
+        return self._bodies[path]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name='fake-market-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the market data and news sites")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--fail-every', type=int, default=0, help="answer every n-th request with a 503")
+    args = parser.parse_args()
+
+    server = FakeMarketServer(args.host, args.port, args.latency, args.fail_every)
+    print(f"Serving {server.url}/prices/<symbol>.csv and {server.url}/news/<page>.html")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,203 @@
+import argparse
+import asyncio
+import io
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from data_processing import _melt_monthly
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying; anything else is returned to the caller as is
+retry_statuses = {429, 500, 502, 503, 504}
+
+class HostLimiter:
+    # Spaces requests to one host at least 1 / rate seconds apart. Each caller
+    # reserves the next free slot before sleeping; there is no await in
+    # between, so no lock is needed on the event loop.
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0.0
+        self._next = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        delay = self._next - now
+        self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class Fetcher:
+    # HTTP GETs for asyncio code. The blocking requests calls run on a thread
+    # pool and share one Session, so connections to each host are pooled and
+    # reused. Requests are rate limited per host (rate_limits maps a host,
+    # as in 'example.com' or '127.0.0.1:8001', to requests per second) and
+    # retried with exponential backoff on connection errors and retry_statuses.
+    # ETag / Last-Modified validators of earlier 200 responses are sent back,
+    # and a 304 returns the body seen before.
+    def __init__(self, rate_limits=None, default_rate=10.0, max_retries=3, backoff=0.5, timeout=10.0, pool_size=16,
+                 session=None):
+        self.rate_limits = dict(rate_limits or {})
+        self.default_rate = default_rate
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='fetch')
+        self._limiters = {}
+        self._cache = {}
+        self.stats = {'requests': 0, 'not_modified': 0, 'retries': 0}
+
+    def _limiter(self, host):
+        if host not in self._limiters:
+            self._limiters[host] = HostLimiter(self.rate_limits.get(host, self.default_rate))
+        return self._limiters[host]
+
+    def _get(self, url, headers):
+        return self.session.get(url, headers=headers, timeout=self.timeout)
+
+    async def fetch(self, url):
+        # Response text, from the validator cache when the server answers 304
+        loop = asyncio.get_running_loop()
+        limiter = self._limiter(urlsplit(url).netloc)
+        for attempt in range(self.max_retries + 1):
+            headers = {}
+            cached = self._cache.get(url)
+            if cached is not None:
+                if cached['etag']:
+                    headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    headers['If-Modified-Since'] = cached['last_modified']
+            await limiter.wait()
+            self.stats['requests'] += 1
+            try:
+                response = await loop.run_in_executor(self._executor, self._get, url, headers)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+                logger.warning(f"{url}: {e}; retrying in {delay:.2f}s")
+            else:
+                if response.status_code == 304 and cached is not None:
+                    self.stats['not_modified'] += 1
+                    return cached['text']
+                if response.status_code not in retry_statuses or attempt == self.max_retries:
+                    response.raise_for_status()
+                    etag, modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+                    if etag or modified:
+                        self._cache[url] = {'etag': etag, 'last_modified': modified, 'text': response.text, 'parsed': {}}
+                    return response.text
+                retry_after = response.headers.get('Retry-After', '')
+                delay = float(retry_after) if retry_after.isdigit() else self.backoff * 2 ** attempt
+                logger.warning(f"{url}: HTTP {response.status_code}; retrying in {delay:.2f}s")
+            self.stats['retries'] += 1
+            await asyncio.sleep(delay)
+
+    async def fetch_parsed(self, url, parse, *args, executor=None):
+        # parse(text, *args) run on executor, off the event loop. The result is
+        # kept with the response's validators, so a 304 skips parsing as well.
+        text = await self.fetch(url)
+        entry = self._cache.get(url)
+        key = (parse, args)
+        if entry is not None and entry['text'] is text and key in entry['parsed']:
+            return entry['parsed'][key]
+        result = await asyncio.get_running_loop().run_in_executor(executor, parse, text, *args)
+        if entry is not None and entry['text'] is text:
+            entry['parsed'][key] = result
+        return result
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+def parse_price_history(text):
+    # Monthly percentage returns in the preprocess_data layout (Date, Value)
+    # from either a wide year x month CSV like nifty.csv or daily bars with
+    # Date and Close columns (the month's return is from last close to last close)
+    data = pd.read_csv(io.StringIO(text))
+    data.columns = data.columns.str.strip()
+    if 'Year' in data.columns:
+        return _melt_monthly(data)
+    closes = pd.Series(data['Close'].to_numpy(dtype=float), index=pd.to_datetime(data['Date'])).sort_index()
+    monthly = closes.resample('MS').last()
+    returns = (monthly.pct_change() * 100).round(2).iloc[1:]
+    return pd.DataFrame({'Date': returns.index, 'Value': returns.to_numpy()})
+
+def parse_headlines(html, selector='h1, h2, h3, .headline'):
+    # Headline texts of a news page, in page order
+    soup = BeautifulSoup(html, 'html.parser')
+    texts = (element.get_text(' ', strip=True) for element in soup.select(selector))
+    return [text for text in texts if text]
+
+async def ingest(price_urls=None, news_urls=(), fetcher=None, parse_executor=None, selector='h1, h2, h3, .headline'):
+    # Fetches every price history ({name: url}) and news page concurrently.
+    # Parsing runs on parse_executor (a thread pool by default; pass a process
+    # pool for heavy pages) so the event loop keeps issuing requests. Returns
+    # {'prices': {name: preprocess_data-style frame}, 'news': frame with the
+    # 'text' column bulk_sentiment_analysis scores, plus the source url}.
+    price_urls = dict(price_urls or {})
+    own_fetcher = fetcher is None
+    fetcher = fetcher or Fetcher()
+
+    async def price(name, url):
+        # Parsed frames may be reused on a 304, so callers get their own copy
+        frame = await fetcher.fetch_parsed(url, parse_price_history, executor=parse_executor)
+        return name, frame.copy()
+
+    async def news(url):
+        headlines = await fetcher.fetch_parsed(url, parse_headlines, selector, executor=parse_executor)
+        return pd.DataFrame({'text': headlines, 'source': url})
+
+    try:
+        prices, pages = await asyncio.gather(
+            asyncio.gather(*(price(name, url) for name, url in price_urls.items())),
+            asyncio.gather(*(news(url) for url in news_urls)),
+        )
+    finally:
+        if own_fetcher:
+            fetcher.close()
+    news_data = (pd.concat(pages, ignore_index=True) if pages
+                 else pd.DataFrame({'text': pd.Series(dtype=object), 'source': pd.Series(dtype=object)}))
+    return {'prices': dict(prices), 'news': news_data}
+
+def run_ingestion(price_urls=None, news_urls=(), **kwargs):
+    # Blocking wrapper for callers outside asyncio
+    return asyncio.run(ingest(price_urls, news_urls, **kwargs))
+
+if __name__ == "__main__":
+    from fake_market_server import FakeMarketServer
+    from sentiment_analysis import bulk_sentiment_analysis
+
+    parser = argparse.ArgumentParser(description="Fetch price histories and news headlines concurrently")
+    parser.add_argument('--symbols', nargs='*', default=['NIFTY'], help="symbols fetched from --base-url/prices/")
+    parser.add_argument('--pages', type=int, default=5, help="news pages fetched from --base-url/news/")
+    parser.add_argument('--base-url', help="data site to use (default: a local fake server)")
+    parser.add_argument('--rate', type=float, default=20.0, help="requests per second per host")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    server = None if args.base_url else FakeMarketServer().start()
+    base_url = args.base_url or server.url
+    try:
+        start = time.perf_counter()
+        fetcher = Fetcher(default_rate=args.rate)
+        result = run_ingestion({symbol: f'{base_url}/prices/{symbol}.csv' for symbol in args.symbols},
+                               [f'{base_url}/news/{page}.html' for page in range(args.pages)], fetcher=fetcher)
+        fetcher.close()
+        news_data = bulk_sentiment_analysis(result['news'])
+        print(f"{len(result['prices'])} price histories, {len(news_data)} headlines "
+              f"(mean sentiment {news_data['sentiment'].mean():.3f}) in {time.perf_counter() - start:.2f}s")
+    finally:
+        if server is not None:
+            server.stop()
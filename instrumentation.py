@@ -0,0 +1,193 @@
+import collections
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+class _StageRecord:
+    # Measurements for one run of a stage; rows can be set inside the with block
+    def __init__(self, stage):
+        self.stage = stage
+        self.rows = None
+
+class _NullStage:
+    # Shared context used while instrumentation is disabled: no clocks, no allocation
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_null_stage = _NullStage()
+
+class _Stage:
+    def __init__(self, owner, name, rows):
+        self._owner = owner
+        self.record = _StageRecord(name)
+        self.record.rows = rows
+
+    def __enter__(self):
+        owner = self._owner
+        local = owner._local
+        depth = getattr(local, 'depth', 0)
+        local.depth = depth + 1
+        self._outermost = depth == 0
+        # Nested stages would reset the enclosing stage's peak, so only the outermost one is measured
+        self._trace_memory = owner.track_memory and self._outermost
+        if self._trace_memory:
+            self._memory_before = owner._start_tracing()
+        # Only one profiler can be active per thread, so nested stages are not profiled separately
+        self._profiler = cProfile.Profile() if owner.profile and self._outermost else None
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+        if self._profiler is not None:
+            try:
+                self._profiler.enable()
+            except ValueError:
+                # Python 3.12+ allows a single active profiler per process; a stage
+                # running concurrently with a profiled one is timed but not profiled
+                self._profiler = None
+        return self.record
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._profiler is not None:
+            self._profiler.disable()
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.process_time() - self._cpu_start
+        peak = None
+        if self._trace_memory:
+            peak = max(tracemalloc.get_traced_memory()[1] - self._memory_before, 0)
+            self._owner._stop_tracing()
+        self._owner._local.depth -= 1
+        self._owner._add(self.record, wall, cpu, peak, exc_type is None, self._profiler)
+        return False
+
+class Instrumentation:
+    # Per-stage wall time, CPU time, row counts and (with track_memory) peak
+    # traced allocation. Records are kept in a bounded buffer and summed per
+    # stage for the Prometheus text exposition. CPU time and memory peaks are
+    # process-wide, so they include other threads working at the same time.
+    # The tracemalloc peak can only be reset process-wide, so it is reset only
+    # when a stage starts with no other stage measuring memory: a stage that
+    # ran on its own gets its exact peak, while stages that overlap (as in a
+    # concurrent StageGraph run) report an upper bound that may include
+    # allocations of the other stages, never less than their own peak.
+    # While disabled, stage() returns a shared no-op context.
+    def __init__(self, enabled=False, track_memory=True, profile=False, max_records=1000, prefix='fundsplit'):
+        self.enabled = enabled
+        self.track_memory = track_memory
+        self.profile = profile
+        self.prefix = prefix
+        self.records = collections.deque(maxlen=max_records)
+        self.profiles = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._tracing = 0
+        self._started_tracing = False
+
+    def enable(self, track_memory=True, profile=False):
+        self.track_memory = track_memory
+        self.profile = profile
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def _start_tracing(self):
+        # tracemalloc is process-wide: it runs while any stage in any thread is
+        # measuring memory. Returns the traced size at the start of the stage.
+        with self._lock:
+            self._tracing += 1
+            if self._tracing == 1:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._started_tracing = True
+                # No other stage is measuring, so nobody's peak is lost
+                tracemalloc.reset_peak()
+            return tracemalloc.get_traced_memory()[0]
+
+    def _stop_tracing(self):
+        with self._lock:
+            self._tracing -= 1
+            if self._tracing == 0 and self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def stage(self, name, rows=None):
+        if not self.enabled:
+            return _null_stage
+        return _Stage(self, name, rows)
+
+    def _add(self, record, wall, cpu, peak, ok, profiler):
+        entry = {
+            'stage': record.stage,
+            'timestamp': time.time(),
+            'wall_seconds': wall,
+            'cpu_seconds': cpu,
+            'rows': record.rows,
+            'peak_bytes': peak,
+            'ok': ok,
+        }
+        with self._lock:
+            self.records.append(entry)
+            totals = self._totals.setdefault(record.stage, {
+                'runs': 0, 'errors': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'rows': 0, 'peak_bytes': None})
+            totals['runs'] += 1
+            totals['errors'] += not ok
+            totals['wall_seconds'] += wall
+            totals['cpu_seconds'] += cpu
+            totals['rows'] += record.rows or 0
+            if peak is not None:
+                totals['peak_bytes'] = max(totals['peak_bytes'] or 0, peak)
+            if profiler is not None:
+                if record.stage in self.profiles:
+                    self.profiles[record.stage].add(profiler)
+                else:
+                    self.profiles[record.stage] = pstats.Stats(profiler)
+
+    def summary(self):
+        with self._lock:
+            return {stage: dict(totals) for stage, totals in self._totals.items()}
+
+    def prometheus_text(self):
+        # Text exposition format, one metric family per measurement, labelled by stage
+        metrics = [
+            ('stage_runs_total', 'counter', 'Completed runs of the stage', 'runs'),
+            ('stage_errors_total', 'counter', 'Runs of the stage that raised', 'errors'),
+            ('stage_wall_seconds_total', 'counter', 'Wall-clock time spent in the stage', 'wall_seconds'),
+            ('stage_cpu_seconds_total', 'counter', 'Process CPU time spent in the stage', 'cpu_seconds'),
+            ('stage_rows_total', 'counter', 'Rows processed by the stage', 'rows'),
+            ('stage_peak_bytes', 'gauge', 'Largest traced allocation peak seen in the stage', 'peak_bytes'),
+        ]
+        summary = self.summary()
+        lines = []
+        for name, kind, help_text, key in metrics:
+            lines.append(f"# HELP {self.prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {self.prefix}_{name} {kind}")
+            for stage, totals in summary.items():
+                if totals[key] is not None:
+                    lines.append(f'{self.prefix}_{name}{{stage="{stage}"}} {totals[key]}')
+        return '\n'.join(lines) + '\n'
+
+    def profile_report(self, stage, sort='cumulative', limit=20):
+        stats = self.profiles.get(stage)
+        if stats is None:
+            return ''
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def reset(self):
+        with self._lock:
+            self.records.clear()
+            self.profiles.clear()
+            self._totals.clear()
+
+# Process-wide instance; FUNDSPLIT_INSTRUMENTATION=1 enables it, =profile also captures cProfile stats
+_mode = os.environ.get('FUNDSPLIT_INSTRUMENTATION', '').lower()
+instrumentation = Instrumentation(enabled=_mode in ('1', 'true', 'profile'), profile=_mode == 'profile')
@@ -1,17 +1,22 @@
-import pandas as pd
-import numpy as np
-
-def generate_random_macro_data(num_entries=24):
-    np.random.seed(0)
-    data = {
-        'date': pd.date_range(start='2000-01-01', periods=num_entries, freq='Y'),
-        'gdp_growth': np.random.uniform(1, 10, num_entries),
-        'interest_rate': np.random.uniform(1, 10, num_entries)
-    }
-    macro_data = pd.DataFrame(data)
-    return macro_data
-
-def macro_analysis(macro_data):
-    gdp_growth = macro_data['gdp_growth'].mean()
-    interest_rate = macro_data['interest_rate'].mean()
-    return gdp_growth, interest_rate
+import pandas as pd
+import numpy as np
+
+def generate_random_macro_data(num_entries=24, seed=0):
+    # Local RandomState: same values as seeding the global state, which is left alone
+    rng = np.random.RandomState(seed)
+    data = {
+        'date': pd.date_range(start='2000-01-01', periods=num_entries, freq='Y'),
+        'gdp_growth': rng.uniform(1, 10, num_entries),
+        'interest_rate': rng.uniform(1, 10, num_entries)
+    }
+    macro_data = pd.DataFrame(data)
+    return macro_data
+
+def macro_analysis(macro_data, as_of=None):
+    # A MacroStore answers from its running sums instead of rescanning the rows,
+    # using the observations dated up to as_of (default: all of them)
+    if hasattr(macro_data, 'window_stats'):
+        return macro_data.mean('gdp_growth', as_of=as_of), macro_data.mean('interest_rate', as_of=as_of)
+    gdp_growth = macro_data['gdp_growth'].mean()
+    interest_rate = macro_data['interest_rate'].mean()
+    return gdp_growth, interest_rate
@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+class MacroStore:
+    # Append-only columnar store of macro indicator observations. Dates live in
+    # one int64 array and each indicator in a column of a growable 2-D array.
+    # Prefix sums of values, squared values and observation counts are kept as
+    # rows are appended, so the mean and variance over any window are O(1)
+    # once the window bounds are found by binary search (O(log n)). EWMAs for
+    # the configured spans are advanced on append and stored per row, so an
+    # as-of EWMA is a lookup as well. Missing values (NaN) are skipped.
+    def __init__(self, indicators, ewma_spans=(12,), capacity=1024):
+        self.indicators = list(indicators)
+        self.ewma_spans = tuple(ewma_spans)
+        self._n = 0
+        self._shift = np.zeros(len(self.indicators))
+        k = len(self.indicators)
+        self._dates = np.zeros(capacity, dtype=np.int64)
+        self._values = np.zeros((capacity, k))
+        # Prefix arrays have one extra leading row of zeros
+        self._sum = np.zeros((capacity + 1, k))
+        self._sumsq = np.zeros((capacity + 1, k))
+        self._count = np.zeros((capacity + 1, k), dtype=np.int64)
+        self._ewma = {span: np.zeros((capacity, k)) for span in self.ewma_spans}
+
+    def _grow(self, capacity):
+        def grow(array, rows):
+            new = np.zeros((rows,) + array.shape[1:], dtype=array.dtype)
+            new[:len(array)] = array
+            return new
+
+        self._dates = grow(self._dates, capacity)
+        self._values = grow(self._values, capacity)
+        self._sum = grow(self._sum, capacity + 1)
+        self._sumsq = grow(self._sumsq, capacity + 1)
+        self._count = grow(self._count, capacity + 1)
+        self._ewma = {span: grow(ewma, capacity) for span, ewma in self._ewma.items()}
+
+    def __len__(self):
+        return self._n
+
+    @classmethod
+    def from_frame(cls, frame, date_column='date', **kwargs):
+        # Every column other than date_column becomes an indicator (e.g. generate_random_macro_data output)
+        indicators = [column for column in frame.columns if column != date_column]
+        store = cls(indicators, **kwargs)
+        store.extend(frame[date_column], frame[indicators].to_numpy(dtype=float))
+        return store
+
+    def append(self, date, values):
+        # values: {indicator: value} (missing indicators are NaN) or a sequence in indicator order
+        if isinstance(values, dict):
+            values = [values.get(name, np.nan) for name in self.indicators]
+        self.extend([date], np.asarray(values, dtype=float).reshape(1, -1))
+
+    def extend(self, dates, values):
+        dates = pd.to_datetime(pd.Index(dates)).asi8
+        values = np.asarray(values, dtype=float).reshape(len(dates), len(self.indicators))
+        if len(dates) == 0:
+            return
+        if np.any(np.diff(dates) < 0) or (self._n and dates[0] < self._dates[self._n - 1]):
+            raise ValueError("MacroStore is append-only: dates must not go backwards")
+        start, end = self._n, self._n + len(dates)
+        if end > len(self._dates):
+            self._grow(max(end, 2 * len(self._dates)))
+
+        # Sums are taken around the first observation of each indicator so the
+        # variance does not lose precision to large squared totals
+        first_seen = (self._count[start] == 0) & ~np.isnan(values).all(axis=0)
+        if first_seen.any():
+            first_valid = np.argmax(~np.isnan(values), axis=0)
+            self._shift[first_seen] = values[first_valid[first_seen], np.flatnonzero(first_seen)]
+
+        observed = ~np.isnan(values)
+        centred = np.where(observed, values - self._shift, 0.0)
+        self._dates[start:end] = dates
+        self._values[start:end] = values
+        self._sum[start + 1:end + 1] = self._sum[start] + np.cumsum(centred, axis=0)
+        self._sumsq[start + 1:end + 1] = self._sumsq[start] + np.cumsum(centred * centred, axis=0)
+        self._count[start + 1:end + 1] = self._count[start] + np.cumsum(observed, axis=0)
+
+        for span, ewma in self._ewma.items():
+            # Continue each EWMA from its value at the last stored row
+            previous = ewma[start - 1:start] if start else np.full((1, len(self.indicators)), np.nan)
+            batch = pd.DataFrame(np.vstack([previous, values]))
+            ewma[start:end] = batch.ewm(span=span, adjust=False, ignore_na=True).mean().to_numpy()[1:]
+        self._n = end
+
+    def _position(self, as_of):
+        # Number of rows dated on or before as_of
+        if as_of is None:
+            return self._n
+        return int(np.searchsorted(self._dates[:self._n], pd.Timestamp(as_of).value, side='right'))
+
+    def _window_start(self, end, as_of, window, periods):
+        if periods is not None:
+            return max(end - periods, 0)
+        if window is None:
+            return 0
+        if as_of is not None:
+            reference = pd.Timestamp(as_of).value
+        else:
+            reference = self._dates[end - 1] if end else 0
+        return int(np.searchsorted(self._dates[:end], reference - pd.Timedelta(window).value, side='right'))
+
+    def as_of(self, as_of):
+        # Latest observation dated on or before as_of, or None
+        end = self._position(as_of)
+        if end == 0:
+            return None
+        row = end - 1
+        return pd.Series(self._values[row], index=self.indicators, name=pd.Timestamp(self._dates[row]))
+
+    def _stats(self, start, end, ddof):
+        # Count, mean and variance between prefix rows start and end (scalars or arrays of rows)
+        count = self._count[end] - self._count[start]
+        total = self._sum[end] - self._sum[start]
+        total_sq = self._sumsq[end] - self._sumsq[start]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            centred_mean = total / count
+            variance = np.maximum(total_sq - count * centred_mean * centred_mean, 0) / (count - ddof)
+        return (count, np.where(count > 0, centred_mean + self._shift, np.nan),
+                np.where(count > ddof, variance, np.nan))
+
+    def window_stats(self, as_of=None, window=None, periods=None, ddof=1):
+        # Count, mean, variance and standard deviation per indicator over the
+        # window ending at as_of (default: latest row). window is a time span
+        # such as '730D' (rows after as_of - window); periods counts rows
+        # instead; with neither the whole history up to as_of is used.
+        end = self._position(as_of)
+        start = self._window_start(end, as_of, window, periods)
+        count, mean, variance = self._stats(start, end, ddof)
+        return pd.DataFrame({'count': count, 'mean': mean, 'var': variance, 'std': np.sqrt(variance)},
+                            index=self.indicators)
+
+    def mean(self, indicator, as_of=None, window=None, periods=None):
+        return float(self.window_stats(as_of, window, periods).loc[indicator, 'mean'])
+
+    def ewma(self, span=None, as_of=None):
+        span = span if span is not None else self.ewma_spans[0]
+        if span not in self._ewma:
+            raise KeyError(f"EWMA span {span} is not tracked; configure it in ewma_spans")
+        end = self._position(as_of)
+        values = self._ewma[span][end - 1] if end else np.full(len(self.indicators), np.nan)
+        return pd.Series(values, index=self.indicators)
+
+    def window_series(self, dates, window=None, periods=None, ddof=1):
+        # window_stats evaluated at many as-of dates at once (e.g. every month of
+        # a backtest); returns {'count', 'mean', 'var'} frames indexed by date
+        targets = pd.to_datetime(pd.Index(dates)).asi8
+        stored = self._dates[:self._n]
+        ends = np.searchsorted(stored, targets, side='right')
+        if periods is not None:
+            starts = np.maximum(ends - periods, 0)
+        elif window is not None:
+            starts = np.searchsorted(stored, targets - pd.Timedelta(window).value, side='right')
+        else:
+            starts = np.zeros_like(ends)
+        count, mean, variance = self._stats(starts, ends, ddof)
+        index = pd.DatetimeIndex(targets)
+        return {
+            'count': pd.DataFrame(count, index=index, columns=self.indicators),
+            'mean': pd.DataFrame(mean, index=index, columns=self.indicators),
+            'var': pd.DataFrame(variance, index=index, columns=self.indicators),
+        }
+
+    def to_frame(self):
+        frame = pd.DataFrame(self._values[:self._n], columns=self.indicators)
+        frame.insert(0, 'date', pd.to_datetime(self._dates[:self._n]))
+        return frame
@@ -0,0 +1,169 @@
+import logging
+import os
+
+from esg_analysis import generate_mock_esg_scores, esg_analysis
+from instrumentation import instrumentation
+from sentiment_analysis import simulate_sentiment_analysis_impact
+from macro_analysis import generate_random_macro_data, macro_analysis
+from macro_store import MacroStore
+from price_store import open_monthly_csv
+from technical_analysis import add_technical_indicators
+from snapshot_cache import SnapshotCache
+from stage_graph import Node, StageGraph
+
+logger = logging.getLogger(__name__)
+
+# Define global variables
+default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nifty.csv')
+
+# Seconds a market evaluation snapshot is reused before it is recomputed
+market_snapshot_ttl = float(os.environ.get('FUNDSPLIT_SNAPSHOT_TTL', 900))
+
+# Macro indicator history, loaded once; new observations are appended to it
+# and evaluations query it as of a date instead of rescanning the rows
+macro_store = MacroStore.from_frame(generate_random_macro_data(24))
+
+# Stock Market Evaluation Functions
+def evaluate_score(score):
+    if score >= 0.7:
+        return "Positive"
+    elif score >= 0.3:
+        return "Neutral"
+    else:
+        return "Negative"
+
+class EvaluationCancelled(Exception):
+    pass
+
+# Independent market signal stages, in the order they are evaluated
+evaluation_stages = ('technical', 'esg', 'macro', 'sentiment')
+
+def evaluate_technical(nifty_data):
+    if nifty_data is None or nifty_data.empty:
+        logger.error("No Nifty data to evaluate.")
+        return None
+
+    # Add technical indicators to Nifty data
+    with instrumentation.stage('technical', rows=len(nifty_data)):
+        nifty_data_with_indicators = add_technical_indicators(nifty_data)
+    logger.debug("Nifty Data with Technical Indicators:\n%s", nifty_data_with_indicators.head())
+
+    # Ensure 'MACD' and 'MACD_Signal' columns exist
+    if 'MACD' not in nifty_data_with_indicators.columns or 'MACD_Signal' not in nifty_data_with_indicators.columns:
+        logger.error("MACD columns are missing in the data.")
+        return None
+
+    # Evaluate Technical Indicators
+    sma_50_above_sma_200 = (nifty_data_with_indicators['SMA_50'].iloc[-1] > nifty_data_with_indicators['SMA_200'].iloc[-1])
+    rsi_below_70 = (nifty_data_with_indicators['RSI'].iloc[-1] < 70)
+    rsi_above_30 = (nifty_data_with_indicators['RSI'].iloc[-1] > 30)
+    macd_positive = (nifty_data_with_indicators['MACD'].iloc[-1] > nifty_data_with_indicators['MACD_Signal'].iloc[-1])
+
+    technical_score = sum([sma_50_above_sma_200, rsi_below_70, rsi_above_30, macd_positive]) / 4
+    return technical_score, evaluate_score(technical_score)
+
+def evaluate_esg():
+    # Evaluate ESG Scores
+    assets = ['Nifty']
+    with instrumentation.stage('esg', rows=len(assets)):
+        esg_scores = generate_mock_esg_scores(assets)
+        high_esg_assets = esg_analysis(esg_scores)
+    esg_score = len(high_esg_assets) / len(assets)
+    return esg_score, evaluate_score(esg_score)
+
+def evaluate_macro(as_of=None):
+    # Evaluate Macroeconomic Indicators as of a date (default: the latest observation)
+    with instrumentation.stage('macro') as record:
+        gdp_growth, interest_rate = macro_analysis(macro_store, as_of)
+        record.rows = len(macro_store)
+    macro_score = (gdp_growth > 0) and (interest_rate < 5)  # Simplified evaluation criteria
+    return macro_score, "Positive" if macro_score else "Negative"
+
+def evaluate_sentiment():
+    # Evaluate Sentiment Analysis
+    with instrumentation.stage('sentiment') as record:
+        news_data_with_sentiment = simulate_sentiment_analysis_impact()
+        record.rows = len(news_data_with_sentiment)
+    average_sentiment = news_data_with_sentiment['Sentiment'].mean()
+    sentiment_score = average_sentiment > 0
+    return sentiment_score, "Positive" if sentiment_score else "Negative"
+
+def load_nifty_data():
+    try:
+        with instrumentation.stage('load') as record:
+            # Memory-mapped binary history; the CSV is only parsed again when it changes
+            nifty_data = open_monthly_csv(default_path).monthly_frame('Value', start='2000-01-01', end='2023-12-31')
+            record.rows = len(nifty_data)
+    except FileNotFoundError as e:
+        logger.error(f"FileNotFoundError: {e}")
+        return None
+    except KeyError as e:
+        logger.error(f"KeyError: {e}")
+        return None
+    if nifty_data.empty:
+        logger.error(f"No Nifty data between 2000 and 2023 in {default_path}")
+        return None
+    return nifty_data
+
+def _file_fingerprint(path):
+    try:
+        stat = os.stat(path)
+        return path, stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return path, None, None
+
+# The evaluation stages only depend on the loaded data, so they run concurrently;
+# the mock generators use their own random state, so none of them need to be
+# serialised. Fingerprints cover the inputs that can change between runs: the
+# Nifty file and the rows in the macro store; the other stages use fixed inputs
+# and are reused once computed.
+stage_graph = StageGraph([
+    Node('load', load_nifty_data, fingerprint=lambda: _file_fingerprint(default_path)),
+    Node('technical', evaluate_technical, deps=['load']),
+    Node('esg', evaluate_esg),
+    Node('macro', evaluate_macro, fingerprint=lambda: len(macro_store)),
+    Node('sentiment', evaluate_sentiment),
+])
+
+def evaluate_stock_market(progress=None, cancel_event=None, executor=None):
+    # progress(stage, completed, total) is called as each stage finishes; setting
+    # cancel_event stops the evaluation before further stages start with
+    # EvaluationCancelled. Stages run on executor (a thread pool by default).
+    def check_cancelled():
+        if cancel_event is not None and cancel_event.is_set():
+            raise EvaluationCancelled()
+
+    completed = []
+
+    def on_result(stage, result):
+        if stage in evaluation_stages and result is not None:
+            completed.append(stage)
+            if progress is not None:
+                progress(stage, len(completed), len(evaluation_stages))
+
+    results = stage_graph.run(executor=executor, on_result=on_result, check_cancelled=check_cancelled)
+    if any(results[stage] is None for stage in ('load',) + evaluation_stages):
+        return None
+    check_cancelled()
+
+    technical_score, technical_outlook = results['technical']
+    esg_score, esg_outlook = results['esg']
+    macro_score, macro_outlook = results['macro']
+    sentiment_score, sentiment_outlook = results['sentiment']
+
+    # Combine Scores
+    overall_score = (technical_score + esg_score + macro_score + sentiment_score) / 4
+    overall_outlook = "Positive" if overall_score > 0.5 else "Negative"
+
+    logger.info(f"Technical Score: {technical_outlook} ({technical_score})")
+    logger.info(f"ESG Score: {esg_outlook} ({esg_score})")
+    logger.info(f"Macro Score: {macro_outlook} ({macro_score})")
+    logger.info(f"Sentiment Score: {sentiment_outlook} ({sentiment_score})")
+    logger.info(f"Overall Score: {overall_outlook} ({overall_score})")
+
+    return {"overall": {"outlook": overall_outlook, "score": overall_score}}
+
+# The outlook is the same for every client, so it is computed once and shared
+# until the TTL expires or the input data file changes
+market_snapshot = SnapshotCache(evaluate_stock_market, ttl=market_snapshot_ttl, watch_paths=[default_path],
+                                retry_on=(EvaluationCancelled,))
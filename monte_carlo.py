@@ -0,0 +1,112 @@
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from data_processing import load_monthly_data
+
+default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nifty.csv')
+
+# Lognormal annual return models for the buckets that are not bootstrapped from
+# Nifty history; override per call with the return_models argument
+default_return_models = {
+    'safe': {'annual_return': 0.065, 'annual_volatility': 0.01},
+    'hedge': {'annual_return': 0.08, 'annual_volatility': 0.12},
+}
+
+default_percentiles = (5, 25, 50, 75, 95)
+
+def load_market_returns(filepath=default_path):
+    # Monthly Nifty returns as fractions, oldest first; months not yet reported are dropped
+    data = load_monthly_data(filepath)
+    values = data['Value'].to_numpy(dtype=float) / 100
+    return values[~np.isnan(values)]
+
+def _monthly_parameters(model):
+    # Log-space monthly drift and volatility matching the annual mean and volatility
+    mean = 1 + model['annual_return']
+    variance = math.log(1 + (model['annual_volatility'] / mean) ** 2)
+    return (math.log(mean) - variance / 2) / 12, math.sqrt(variance / 12)
+
+def _block_bootstrap(rng, returns, n_paths, months, block_size):
+    # Circular block bootstrap: paths are stitched from runs of consecutive months
+    n_blocks = -(-months // block_size)
+    starts = rng.integers(0, len(returns), size=(n_paths, n_blocks))
+    index = (starts[:, :, None] + np.arange(block_size)) % len(returns)
+    return returns[index.reshape(n_paths, -1)[:, :months]]
+
+def _simulate_chunk(seed, n_paths, months, weights, market_returns, block_size, return_models):
+    # Wealth multiples at each year end for one chunk of paths, rebalanced monthly
+    rng = np.random.default_rng(seed)
+    portfolio = weights['volatile'] * _block_bootstrap(rng, market_returns, n_paths, months, block_size)
+    for bucket in ('safe', 'hedge'):
+        drift, volatility = _monthly_parameters(return_models[bucket])
+        portfolio += weights[bucket] * np.expm1(rng.normal(drift, volatility, size=(n_paths, months)))
+    growth = np.cumprod(1 + portfolio, axis=1)
+    return growth[:, 11::12]
+
+def _chunk_sizes(n_paths, chunk_size):
+    return [min(chunk_size, n_paths - start) for start in range(0, n_paths, chunk_size)]
+
+def simulate_allocation(allocation, capital, time_horizon, n_paths=100000, seed=0, workers=None, chunk_size=20000,
+                        block_size=12, return_models=None, market_returns=None, percentiles=default_percentiles,
+                        targets=None):
+    # Distribution of outcomes for a get_allocation result held for time_horizon
+    # years. Paths are generated in chunks of chunk_size; every chunk has its own
+    # RNG stream spawned from seed, so results do not depend on the worker count.
+    # targets are final wealth levels whose shortfall probability is reported
+    # (default: the starting capital).
+    if time_horizon < 1:
+        raise ValueError("time_horizon must be at least one year")
+    total = sum(allocation[bucket] for bucket in ('safe', 'hedge', 'volatile'))
+    weights = {bucket: allocation[bucket] / total for bucket in ('safe', 'hedge', 'volatile')}
+    return_models = {**default_return_models, **(return_models or {})}
+    if market_returns is None:
+        market_returns = load_market_returns()
+    market_returns = np.asarray(market_returns, dtype=float)
+    months = int(time_horizon) * 12
+
+    sizes = _chunk_sizes(n_paths, chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(chunk_seed, size, months, weights, market_returns, block_size, return_models)
+            for chunk_seed, size in zip(seeds, sizes)]
+    if workers == 1 or len(args) == 1:
+        chunks = [_simulate_chunk(*arg) for arg in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(_simulate_chunk, *zip(*args)))
+    wealth = capital * np.concatenate(chunks)
+
+    targets = [capital] if targets is None else list(targets)
+    final = wealth[:, -1]
+    return {
+        'paths': n_paths,
+        'years': list(range(1, int(time_horizon) + 1)),
+        'percentiles': {p: np.percentile(wealth, p, axis=0) for p in percentiles},
+        'mean': wealth.mean(axis=0),
+        'shortfall_probability': {target: float(np.mean(final < target)) for target in targets},
+    }
+
+if __name__ == "__main__":
+    from allocation import get_allocation
+
+    parser = argparse.ArgumentParser(description="Monte Carlo outcomes for a client allocation")
+    parser.add_argument('capital', type=float)
+    parser.add_argument('time_horizon', type=int)
+    parser.add_argument('risk_tolerance', choices=['low', 'medium', 'high'])
+    parser.add_argument('--paths', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+
+    allocation = get_allocation(args.capital, args.time_horizon, args.risk_tolerance)
+    result = simulate_allocation(allocation, args.capital, args.time_horizon, n_paths=args.paths, seed=args.seed,
+                                 workers=args.workers)
+    print(f"Allocation: {allocation}")
+    print("Year " + ''.join(f"{f'p{p}':>14}" for p in result['percentiles']))
+    for i, year in enumerate(result['years']):
+        print(f"{year:>4} " + ''.join(f"{band[i]:>14,.0f}" for band in result['percentiles'].values()))
+    for target, probability in result['shortfall_probability'].items():
+        print(f"P(final wealth < {target:,.0f}) = {probability:.2%}")
@@ -0,0 +1,236 @@
+import numpy as np
+import pandas as pd
+
+from asset_selection import buckets
+
+class ShrinkageCovariance:
+    # Covariance of asset returns kept as running moments (count, mean and the
+    # centred cross-product matrix), merged batch by batch so new returns
+    # update the estimate without revisiting history. The estimate is shrunk
+    # towards a scaled identity with the Oracle Approximating Shrinkage (OAS)
+    # intensity, which keeps it well conditioned when there are nearly as many
+    # assets as observations. The shrunk matrix and any solved weights are
+    # cached until the next update.
+    def __init__(self, assets):
+        self.assets = pd.Index(assets)
+        k = len(self.assets)
+        self.count = 0
+        self._mean = np.zeros(k)
+        self._cross = np.zeros((k, k))
+        self._covariance = None
+        self._shrinkage = None
+        self._solutions = {}
+
+    @classmethod
+    def from_frame(cls, returns):
+        # returns: periods x assets frame (e.g. monthly returns as fractions)
+        model = cls(returns.columns)
+        model.update(returns.to_numpy(dtype=float))
+        return model
+
+    def __len__(self):
+        return len(self.assets)
+
+    def update(self, returns):
+        # Adds a (periods x assets) batch; rows with any missing value are skipped
+        returns = np.asarray(returns, dtype=float).reshape(-1, len(self.assets))
+        returns = returns[~np.isnan(returns).any(axis=1)]
+        n = len(returns)
+        if n == 0:
+            return
+        batch_mean = returns.mean(axis=0)
+        centred = returns - batch_mean
+        # Chan et al. pairwise merge of two sets of moments
+        delta = batch_mean - self._mean
+        total = self.count + n
+        self._cross += centred.T @ centred + np.outer(delta, delta) * (self.count * n / total)
+        self._mean += delta * (n / total)
+        self.count = total
+        self._covariance = None
+        self._shrinkage = None
+        self._solutions.clear()
+
+    @property
+    def mean(self):
+        return pd.Series(self._mean, index=self.assets)
+
+    @property
+    def shrinkage(self):
+        self.covariance()
+        return self._shrinkage
+
+    def sample_covariance(self):
+        # Maximum-likelihood (divide by n) estimate, as OAS is defined on it
+        return self._cross / max(self.count, 1)
+
+    def covariance(self):
+        if self._covariance is None:
+            sample = self.sample_covariance()
+            k = len(self.assets)
+            mu = np.trace(sample) / k if k else 0.0
+            alpha = np.mean(sample ** 2) if k else 0.0
+            denominator = (self.count + 1) * (alpha - mu ** 2 / k) if k else 0.0
+            shrinkage = 1.0 if denominator == 0 else min((alpha + mu ** 2) / denominator, 1.0)
+            covariance = (1 - shrinkage) * sample
+            covariance.flat[::k + 1] += shrinkage * mu
+            self._covariance = covariance
+            self._shrinkage = shrinkage
+        return self._covariance
+
+    def submatrix(self, assets):
+        positions = self.assets.get_indexer(assets)
+        if (positions < 0).any():
+            missing = [asset for asset, position in zip(assets, positions) if position < 0]
+            raise KeyError(f"No return history for: {', '.join(map(str, missing))}")
+        covariance = self.covariance()
+        return covariance[np.ix_(positions, positions)], self._mean[positions]
+
+    def solve(self, assets, method='mean_variance', **kwargs):
+        # Long-only weights for assets (summing to 1), cached per asset list and settings
+        assets = tuple(assets)
+        key = (assets, method, tuple(sorted(kwargs.items())))
+        if key not in self._solutions:
+            covariance, mean = self.submatrix(list(assets))
+            if method == 'mean_variance':
+                weights = mean_variance_weights(covariance, mean, **kwargs)
+            elif method == 'risk_parity':
+                weights = risk_parity_weights(covariance, **kwargs)
+            else:
+                raise ValueError(f"Unknown method: {method}")
+            self._solutions[key] = weights
+        return pd.Series(self._solutions[key], index=list(assets))
+
+def project_to_simplex(v):
+    # Euclidean projection onto {w >= 0, sum(w) = 1} (sort-based, O(n log n))
+    u = np.sort(v)[::-1]
+    cumulative = np.cumsum(u) - 1
+    index = np.arange(1, len(v) + 1)
+    rho = np.flatnonzero(u - cumulative / index > 0)[-1]
+    return np.maximum(v - cumulative[rho] / (rho + 1), 0)
+
+def _largest_eigenvalue(matrix, iterations=50, seed=0):
+    # Power iteration; a few dozen matrix-vector products instead of a full eigendecomposition
+    vector = np.random.default_rng(seed).random(len(matrix)) + 0.5
+    value = 0.0
+    for _ in range(iterations):
+        product = matrix @ vector
+        value = np.linalg.norm(product)
+        if value == 0:
+            return 0.0
+        vector = product / value
+    return float(vector @ matrix @ vector)
+
+def _polish_support(covariance, expected_returns, risk_aversion, support):
+    # Exact optimum when the assets in support are the only ones held: solves
+    # the KKT system on the support and checks the conditions for the rest.
+    # Returns None when support is not the optimal one.
+    k = len(support)
+    system = np.zeros((k + 1, k + 1))
+    system[:k, :k] = risk_aversion * covariance[np.ix_(support, support)]
+    system[:k, k] = system[k, :k] = 1
+    try:
+        solution = np.linalg.solve(system, np.append(expected_returns[support], 1))
+    except np.linalg.LinAlgError:
+        return None
+    held, multiplier = solution[:k], solution[k]
+    if (held < 0).any():
+        return None
+    weights = np.zeros(len(expected_returns))
+    weights[support] = held
+    slack = risk_aversion * (covariance[:, support] @ held) - expected_returns + multiplier
+    slack[support] = 0
+    return weights if slack.min() >= -1e-12 else None
+
+def mean_variance_weights(covariance, expected_returns, risk_aversion=3.0, max_iter=5000, tol=1e-9, polish_every=25):
+    # Maximises w'mu - risk_aversion / 2 * w'Cw over long-only, fully invested
+    # weights with accelerated projected gradient (FISTA) steps of size 1/L.
+    # Optimal portfolios hold few assets, so every polish_every iterations the
+    # current holdings are tried as the exact support (_polish_support), which
+    # usually ends the iteration long before the gradient steps converge.
+    covariance = np.asarray(covariance, dtype=float)
+    expected_returns = np.asarray(expected_returns, dtype=float)
+    n = len(expected_returns)
+    if n == 0:
+        return np.zeros(0)
+    # Small safety margin over the power-iteration estimate of the Lipschitz constant
+    lipschitz = risk_aversion * _largest_eigenvalue(covariance) * 1.05
+    if lipschitz <= 0:
+        weights = np.zeros(n)
+        weights[np.argmax(expected_returns)] = 1.0
+        return weights
+    step = 1 / lipschitz
+    weights = np.full(n, 1 / n)
+    momentum_point = weights
+    t = 1.0
+    for iteration in range(1, max_iter + 1):
+        gradient = risk_aversion * (covariance @ momentum_point) - expected_returns
+        new_weights = project_to_simplex(momentum_point - step * gradient)
+        change = new_weights - weights
+        if np.abs(change).max() < tol:
+            return new_weights
+        if polish_every and iteration % polish_every == 0:
+            polished = _polish_support(covariance, expected_returns, risk_aversion, np.flatnonzero(new_weights))
+            if polished is not None:
+                return polished
+        # Restart the momentum when it points uphill (O'Donoghue and Candes), which
+        # stops the oscillation plain FISTA shows on badly conditioned covariances
+        if (momentum_point - new_weights) @ change > 0:
+            t = 1.0
+        new_t = (1 + np.sqrt(1 + 4 * t * t)) / 2
+        momentum_point = new_weights + ((t - 1) / new_t) * change
+        weights, t = new_weights, new_t
+    return weights
+
+def risk_parity_weights(covariance, budgets=None, max_iter=100, tol=1e-10):
+    # Long-only weights whose risk contributions w_i (Cw)_i match budgets
+    # (equal by default), from Newton steps on the convex problem
+    # min y'Cy / 2 - sum(b_i log y_i) (Spinu), whose minimiser rescaled to sum
+    # to 1 is the risk parity portfolio. Each step is one dense linear solve and the
+    # step is shortened when it would leave y > 0.
+    covariance = np.asarray(covariance, dtype=float)
+    n = len(covariance)
+    if n == 0:
+        return np.zeros(0)
+    budgets = np.full(n, 1 / n) if budgets is None else np.asarray(budgets, dtype=float) / np.sum(budgets)
+    diagonal = np.diag(covariance)
+    if (diagonal <= 0).any():
+        raise ValueError("Risk parity needs a positive variance for every asset")
+    y = 1 / np.sqrt(diagonal)
+    y /= np.sqrt(y @ covariance @ y)
+    for _ in range(max_iter):
+        gradient = covariance @ y - budgets / y
+        hessian = covariance + np.diag(budgets / (y * y))
+        direction = -np.linalg.solve(hessian, gradient)
+        # Newton decrement; the problem is self-concordant, so damped steps converge
+        decrement = np.sqrt(max(-gradient @ direction, 0.0))
+        if decrement < tol:
+            break
+        step = 1.0 if decrement < 0.25 else 1 / (1 + decrement)
+        shrinking = direction < 0
+        if shrinking.any():
+            step = min(step, 0.99 * np.min(-y[shrinking] / direction[shrinking]))
+        y = y + step * direction
+    return y / y.sum()
+
+def risk_contributions(weights, covariance):
+    # Share of portfolio variance from each asset
+    weights = np.asarray(weights, dtype=float)
+    contributions = weights * (np.asarray(covariance) @ weights)
+    total = contributions.sum()
+    return contributions / total if total > 0 else contributions
+
+def bucket_weights(selected_assets, model, method='mean_variance', **kwargs):
+    # Weights within each safe/hedge/volatile bucket of a select_assets result
+    # in place of an equal split; each bucket's weights sum to 1
+    return {bucket: model.solve(selected_assets[bucket], method, **kwargs)
+            for bucket in buckets if selected_assets.get(bucket)}
+
+def generate_mock_asset_returns(assets, n_periods=240, n_factors=5, seed=0):
+    # Synthetic monthly returns from a factor model, so assets are correlated
+    rng = np.random.default_rng(seed)
+    k = len(assets)
+    loadings = rng.normal(0, 0.03, (k, n_factors))
+    factors = rng.normal(0, 1, (n_periods, n_factors))
+    idiosyncratic = rng.normal(0, 1, (n_periods, k)) * rng.uniform(0.01, 0.08, k)
+    drift = rng.uniform(0.002, 0.012, k)
+    return pd.DataFrame(drift + factors @ loadings.T + idiosyncratic, columns=list(assets))
@@ -0,0 +1,167 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from allocation import get_allocation_batch
+from asset_selection import buckets, get_catalog
+
+order_columns = ['portfolio', 'bucket', 'asset', 'price', 'lot_size', 'quantity', 'amount']
+
+def generate_mock_price_table(names, seed=0):
+    # Synthetic prices and lot sizes for the given assets
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'price': np.round(np.exp(rng.uniform(np.log(5), np.log(50000), len(names))), 2),
+        'lot_size': rng.choice([1, 1, 1, 5, 10, 25], len(names)),
+    }, index=pd.Index(names, name='asset'))
+
+def size_orders(capital, allocation, selected_assets, price_table):
+    # Rupee amounts and lot-rounded quantities for many portfolios that share one
+    # asset selection. allocation holds per-portfolio bucket percentages (as from
+    # get_allocation_batch); each bucket's money is split equally between its
+    # selected assets. Returns the asset and bucket of every column and
+    # (portfolios x assets) quantity and amount arrays, plus leftover cash.
+    capital = np.asarray(capital, dtype=float)
+    assets = [asset for bucket in buckets for asset in selected_assets.get(bucket, [])]
+    asset_buckets = [bucket for bucket in buckets for _ in selected_assets.get(bucket, [])]
+    missing = [asset for asset in assets if asset not in price_table.index]
+    if missing:
+        raise KeyError(f"No price for: {', '.join(missing)}")
+    prices = price_table.loc[assets, 'price'].to_numpy(dtype=float)
+    lot_sizes = price_table.loc[assets, 'lot_size'].to_numpy(dtype=float) if 'lot_size' in price_table else np.ones(len(assets))
+
+    # Budget per asset: capital x bucket share / number of assets picked for that bucket
+    share = np.zeros((len(capital), len(assets)))
+    for bucket in buckets:
+        columns = [i for i, asset_bucket in enumerate(asset_buckets) if asset_bucket == bucket]
+        if columns:
+            share[:, columns] = (np.asarray(allocation[bucket], dtype=float) / 100 / len(columns))[:, None]
+    budget = capital[:, None] * share
+
+    lot_price = prices * lot_sizes
+    # The small tolerance keeps budgets that are an exact number of lots from rounding down a lot
+    lots = np.floor(budget / lot_price + 1e-9)
+    quantity = lots * lot_sizes
+    amount = lots * lot_price
+    return {
+        'assets': assets,
+        'buckets': asset_buckets,
+        'prices': prices,
+        'lot_sizes': lot_sizes,
+        'quantity': quantity,
+        'amount': amount,
+        'leftover': capital - amount.sum(axis=1),
+    }
+
+def generate_orders(profiles, market_outlook, price_table, chunk_size=200000, drop_zero=True, catalog=None):
+    # Yields (orders, leftover) frames chunk by chunk for a profiles frame with
+    # capital, time_horizon and risk_tolerance columns. Allocations take only a
+    # few distinct values, so portfolios are grouped by allocation and each
+    # group is sized with one asset selection; the results are laid out in a
+    # (portfolio x slot) grid so orders come out in portfolio order without a sort.
+    catalog = catalog if catalog is not None else get_catalog()
+    asset_names = pd.Index(catalog.names)
+    for start in range(0, len(profiles), chunk_size):
+        chunk = profiles.iloc[start:start + chunk_size]
+        n = len(chunk)
+        allocation = get_allocation_batch(chunk)
+        # Hash-based grouping on the (safe, hedge, volatile) triple; sorting rows is far slower
+        key = np.zeros(n, dtype=np.int64)
+        for bucket in buckets:
+            codes, uniques = pd.factorize(allocation[bucket])
+            key = key * len(uniques) + codes
+        group, _ = pd.factorize(key)
+        order = np.argsort(group, kind='stable')
+        boundaries = np.flatnonzero(np.diff(group[order])) + 1
+
+        sized_groups = []
+        for members in np.split(order, boundaries) if n else []:
+            percentages = [allocation[bucket][members[0]] for bucket in buckets]
+            selected_assets = catalog.select(*percentages, market_outlook)
+            sized = size_orders(chunk['capital'].to_numpy()[members],
+                                {bucket: allocation[bucket][members] for bucket in buckets},
+                                selected_assets, price_table)
+            sized_groups.append((members, sized))
+
+        width = max([len(sized['assets']) for _, sized in sized_groups] + [0])
+        asset_code = np.full((n, width), -1)
+        bucket_code = np.zeros((n, width), dtype=np.int8)
+        price = np.zeros((n, width))
+        lot_size = np.zeros((n, width))
+        quantity = np.zeros((n, width))
+        amount = np.zeros((n, width))
+        leftover = np.empty(n)
+        for members, sized in sized_groups:
+            columns = len(sized['assets'])
+            asset_code[members, :columns] = asset_names.get_indexer(sized['assets'])
+            bucket_code[members, :columns] = [buckets.index(bucket) for bucket in sized['buckets']]
+            price[members, :columns] = sized['prices']
+            lot_size[members, :columns] = sized['lot_sizes']
+            quantity[members, :columns] = sized['quantity']
+            amount[members, :columns] = sized['amount']
+            leftover[members] = sized['leftover']
+
+        keep = (asset_code >= 0) & (quantity > 0 if drop_zero else True)
+        portfolio_ids = chunk.index.to_numpy()
+        orders = pd.DataFrame({
+            'portfolio': np.repeat(portfolio_ids, width)[keep.ravel()],
+            'bucket': pd.Categorical.from_codes(bucket_code[keep], categories=list(buckets)),
+            'asset': pd.Categorical.from_codes(asset_code[keep], categories=asset_names),
+            'price': price[keep],
+            'lot_size': lot_size[keep],
+            'quantity': quantity[keep],
+            'amount': amount[keep],
+        }, columns=order_columns)
+        yield orders, pd.DataFrame({'portfolio': portfolio_ids, 'leftover': leftover})
+
+def write_orders(path, chunks, format=None):
+    # Streams order chunks to CSV or Parquet (chosen by extension unless given);
+    # Parquet needs pyarrow. Returns row and portfolio counts.
+    format = format or ('parquet' if path.endswith('.parquet') else 'csv')
+    stats = {'orders': 0, 'portfolios': 0, 'leftover': 0.0}
+    writer = None
+    if format == 'parquet':
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Writing Parquet needs pyarrow (pip install pyarrow)")
+    try:
+        for first, (orders, leftover) in enumerate(chunks, start=1):
+            if format == 'parquet':
+                table = pa.Table.from_pandas(orders, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+            else:
+                orders.to_csv(path, mode='w' if first == 1 else 'a', header=first == 1, index=False)
+            stats['orders'] += len(orders)
+            stats['portfolios'] += len(leftover)
+            stats['leftover'] += float(leftover['leftover'].sum())
+    finally:
+        if writer is not None:
+            writer.close()
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lot-rounded orders for a CSV of client profiles")
+    parser.add_argument('profiles_path', help="CSV with capital, time_horizon and risk_tolerance columns")
+    parser.add_argument('output_path', help="orders file, .csv or .parquet")
+    parser.add_argument('--prices', help="CSV with asset, price and lot_size columns (default: mock prices)")
+    parser.add_argument('--outlook', default='Neutral', choices=['Positive', 'Neutral', 'Negative'])
+    parser.add_argument('--chunk-size', type=int, default=200000)
+    args = parser.parse_args()
+
+    if args.prices:
+        price_table = pd.read_csv(args.prices).set_index('asset')
+    else:
+        price_table = generate_mock_price_table(get_catalog().names)
+    profiles = pd.read_csv(args.profiles_path)
+    start = time.perf_counter()
+    stats = write_orders(args.output_path, generate_orders(profiles, args.outlook, price_table, args.chunk_size))
+    seconds = time.perf_counter() - start
+    print(f"{stats['portfolios']:,} portfolios, {stats['orders']:,} orders in {seconds:.2f}s "
+          f"-> {os.path.abspath(args.output_path)} (leftover cash {stats['leftover']:,.2f})")
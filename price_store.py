@@ -0,0 +1,219 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_processing import CACHE_DIR, _melt_monthly
+
+# On-disk layout of a store directory: raw little-endian arrays that np.memmap
+# opens without parsing, plus a small JSON header
+dates_file = 'dates.i8'
+values_file = 'values.f8'
+header_file = 'header.json'
+
+def _bars(dates, values, columns):
+    # (int64 dates, contiguous bars x columns float64 values) ready to write;
+    # values may also be {column: values} with missing columns stored as NaN
+    dates = pd.to_datetime(pd.Index(dates)).asi8.astype('<i8')
+    if values is None:
+        values = np.zeros((len(dates), len(columns)))
+    elif isinstance(values, dict):
+        values = np.column_stack([np.asarray(values.get(column, np.full(len(dates), np.nan)), dtype=float)
+                                  for column in columns])
+    values = np.ascontiguousarray(values, dtype='<f8').reshape(len(dates), len(columns))
+    if np.any(np.diff(dates) <= 0):
+        raise ValueError("PriceStore bars must be appended in strictly increasing date order")
+    return dates, values
+
+def _write_header(directory, header):
+    # Replaced in one rename, so readers see the old header or the new one
+    tmp_path = os.path.join(directory, f'{header_file}.{os.getpid()}.{threading.get_ident()}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(header, f)
+    os.replace(tmp_path, os.path.join(directory, header_file))
+
+class PriceStore:
+    # Price history as a date index (int64 nanoseconds, ascending) and a
+    # row-major float64 matrix with one column per asset, both memory-mapped
+    # read-only. Rows are bars, so appending bars only appends bytes to the
+    # two files; adding assets needs a new store. The row count is taken from
+    # the file sizes, and a partly written bar (values without a date) is
+    # ignored, so readers never see half an append.
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, header_file)) as f:
+            self.header = json.load(f)
+        self.columns = pd.Index(self.header['columns'])
+        self._map()
+
+    def _map(self):
+        k = len(self.columns)
+        dates_path = os.path.join(self.directory, dates_file)
+        values_path = os.path.join(self.directory, values_file)
+        n = min(os.path.getsize(dates_path) // 8, os.path.getsize(values_path) // (8 * k) if k else 0)
+        # np.memmap cannot map an empty file
+        self._dates = np.memmap(dates_path, dtype='<i8', mode='r', shape=(n,)) if n else np.zeros(0, dtype='<i8')
+        self._values = (np.memmap(values_path, dtype='<f8', mode='r', shape=(n, k)) if n
+                        else np.zeros((0, k), dtype='<f8'))
+
+    @classmethod
+    def create(cls, directory, columns, dates=(), values=None, source=None):
+        # Writes a store holding the given bars (possibly none) and opens it.
+        # The header goes last and records how many bars were written (append
+        # keeps the count up to date), so a store with a header was written in full.
+        columns = pd.Index([str(column) for column in columns])
+        dates, values = _bars(dates, values, columns)
+        os.makedirs(directory, exist_ok=True)
+        header_path = os.path.join(directory, header_file)
+        if os.path.exists(header_path):
+            os.remove(header_path)
+        with open(os.path.join(directory, values_file), 'wb') as f:
+            f.write(values.tobytes())
+        with open(os.path.join(directory, dates_file), 'wb') as f:
+            f.write(dates.tobytes())
+        _write_header(directory, {'columns': list(columns), 'rows': len(dates), 'source': source})
+        return cls(directory)
+
+    def __len__(self):
+        return len(self._dates)
+
+    @property
+    def dates(self):
+        return self._dates.view('datetime64[ns]')
+
+    def append(self, dates, values):
+        # New bars, dated after the last stored one; values is (bars x columns)
+        # or {column: values} with missing columns stored as NaN
+        dates, values = _bars(dates, values, self.columns)
+        if len(self) and len(dates) and dates[0] <= self._dates[-1]:
+            raise ValueError("PriceStore bars must be appended in strictly increasing date order")
+        # Drop any partly written bar left by an interrupted append, then write
+        # values first: a bar only becomes visible once its date is written
+        os.truncate(os.path.join(self.directory, values_file), len(self) * len(self.columns) * 8)
+        os.truncate(os.path.join(self.directory, dates_file), len(self) * 8)
+        with open(os.path.join(self.directory, values_file), 'ab') as f:
+            f.write(values.tobytes())
+        with open(os.path.join(self.directory, dates_file), 'ab') as f:
+            f.write(dates.tobytes())
+        self._map()
+        # The header's bar count follows the appended bars, so the store still reads as complete
+        self.header = {**self.header, 'rows': len(self)}
+        _write_header(self.directory, self.header)
+
+    def refresh(self):
+        # Picks up bars appended by another process
+        self._map()
+
+    def _rows(self, start, end):
+        first = 0 if start is None else int(np.searchsorted(self._dates, pd.Timestamp(start).value, side='left'))
+        last = len(self) if end is None else int(np.searchsorted(self._dates, pd.Timestamp(end).value, side='right'))
+        return first, last
+
+    def slice(self, start=None, end=None, column=None):
+        # (dates, values) between start and end inclusive. Both are views into
+        # the mapped files, not copies: values is (bars x columns), or one
+        # asset's (strided) column when column is given.
+        first, last = self._rows(start, end)
+        values = self._values[first:last]
+        if column is not None:
+            position = self.columns.get_loc(column)
+            values = values[:, position]
+        return self.dates[first:last], values
+
+    def to_frame(self, start=None, end=None, columns=None):
+        # DataFrame copy of a date range, indexed by date
+        first, last = self._rows(start, end)
+        positions = slice(None) if columns is None else self.columns.get_indexer(columns)
+        return pd.DataFrame(self._values[first:last][:, positions],
+                            index=pd.DatetimeIndex(self.dates[first:last], name='Date'),
+                            columns=self.columns if columns is None else list(columns))
+
+    def monthly_frame(self, column, start=None, end=None):
+        # One asset in the Date / Value layout that preprocess_data produces
+        dates, values = self.slice(start, end, column)
+        return pd.DataFrame({'Date': np.array(dates), 'Value': np.array(values)})
+
+def _fingerprint(path):
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+def _install(built, directory):
+    # Moves a finished store directory into place. A rename cannot replace a
+    # non-empty directory, so the old store is moved aside first and removed
+    # after; readers that still map its files keep them until they close.
+    old = f'{directory}.{os.getpid()}.{os.urandom(4).hex()}.old'
+    try:
+        os.rename(directory, old)
+    except FileNotFoundError:
+        old = None
+    try:
+        os.replace(built, directory)
+    except OSError:
+        # A concurrent conversion installed its store first; it is built from
+        # the same sources, so that one is kept
+        if not os.path.exists(os.path.join(directory, header_file)):
+            raise
+    if old is not None:
+        shutil.rmtree(old, ignore_errors=True)
+
+def convert_monthly_csvs(sources, directory):
+    # Builds a store from wide year x month CSVs (the nifty.csv layout),
+    # {column: path}; the series are aligned on the union of their months.
+    # The store is written to a temporary directory next to the target and
+    # moved into place once complete, so an interrupted or concurrent
+    # conversion never leaves a partial store behind.
+    series = {}
+    for column, path in sources.items():
+        data = pd.read_csv(path)
+        data.columns = data.columns.str.strip()
+        data = _melt_monthly(data)
+        series[column] = pd.Series(data['Value'].to_numpy(dtype=float), index=pd.DatetimeIndex(data['Date']))
+    frame = pd.DataFrame(series).sort_index()
+    directory = os.path.abspath(directory)
+    os.makedirs(os.path.dirname(directory), exist_ok=True)
+    built = tempfile.mkdtemp(prefix=os.path.basename(directory) + '.', suffix='.tmp', dir=os.path.dirname(directory))
+    try:
+        PriceStore.create(built, frame.columns, frame.index, frame.to_numpy(),
+                          source={column: _fingerprint(path) for column, path in sources.items()})
+        _install(built, directory)
+    finally:
+        shutil.rmtree(built, ignore_errors=True)
+    return PriceStore(directory)
+
+def _is_current(store, source):
+    # A store is only reused when it was built from this exact source and
+    # still holds every bar its header says was written
+    return store.header.get('source') == source and len(store) and len(store) == store.header.get('rows')
+
+def open_monthly_csv(filepath, column='Value', cache_dir=CACHE_DIR):
+    # Store converted from a wide year x month CSV, kept under cache_dir and
+    # rebuilt only when the CSV changes; later opens just map the arrays
+    digest = hashlib.sha1(os.path.abspath(filepath).encode('utf-8')).hexdigest()
+    directory = os.path.join(cache_dir, 'prices', digest)
+    source = {column: _fingerprint(filepath)}
+    try:
+        store = PriceStore(directory)
+        if _is_current(store, source):
+            return store
+    except (OSError, ValueError, KeyError):
+        pass
+    return convert_monthly_csvs({column: filepath}, directory)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert wide year x month CSVs into a memory-mapped price store")
+    parser.add_argument('directory', help="store directory to create")
+    parser.add_argument('sources', nargs='+', help="NAME=path.csv (or path.csv, named after the file)")
+    args = parser.parse_args()
+
+    sources = {}
+    for source in args.sources:
+        name, _, path = source.rpartition('=')
+        sources[name or os.path.splitext(os.path.basename(path))[0]] = path
+    store = convert_monthly_csvs(sources, args.directory)
+    print(f"{len(store):,} bars x {len(store.columns)} columns -> {os.path.abspath(args.directory)}")
@@ -0,0 +1,226 @@
+import argparse
+import math
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from allocation import get_allocation_batch
+from asset_selection import buckets
+from market_evaluation import default_path
+from monte_carlo import default_return_models
+from price_store import open_monthly_csv
+
+metric_names = ('volatility', 'var_historical', 'cvar_historical', 'var_parametric', 'cvar_parametric',
+                'max_drawdown', 'sharpe', 'sortino')
+
+# Rolling windows are evaluated in chunks of about this many values, so the
+# historical VaR and drawdown of thousands of series stay in bounded memory
+chunk_values = 4000000
+
+# A window's volatility at or below this fraction of its mean return is
+# rounding noise, and the window is treated as having none
+relative_epsilon = 1e-10
+
+class RiskEngine:
+    # Risk metrics for many return series (assets or portfolios) over a
+    # trailing window of periods. Returns are fractions, one row per period.
+    # Prefix sums of returns, squared returns and squared shortfalls below the
+    # risk-free rate give the mean, volatility, Sharpe, Sortino and normal
+    # (parametric) VaR/CVaR of any window in O(1). Returns are summed as
+    # deviations from each series' first return, so the variance does not
+    # come from the difference of two large, nearly equal sums. Historical VaR/CVaR and the
+    # window's drawdown come from the raw window values. Cumulative log wealth
+    # and its running peak track the drawdown since the first period. All of
+    # these are advanced on append, so a new month only adds work for the
+    # windows that end in it, and rolling() reuses every row it computed before.
+    def __init__(self, columns, window=36, alpha=0.05, risk_free=0.0, periods_per_year=12, capacity=256):
+        self.columns = pd.Index(columns)
+        self.window = window
+        self.alpha = alpha
+        self.periods_per_year = periods_per_year
+        self.period_risk_free = (1 + risk_free) ** (1 / periods_per_year) - 1
+        self.index = []
+        self._n = 0
+        k = len(self.columns)
+        self._values = np.zeros((capacity, k))
+        # Per-series reference return subtracted before summing (see append)
+        self._shift = np.zeros(k)
+        # Prefix arrays have one extra leading row of zeros
+        self._sum = np.zeros((capacity + 1, k))
+        self._sumsq = np.zeros((capacity + 1, k))
+        self._downsq = np.zeros((capacity + 1, k))
+        self._log_wealth = np.zeros((capacity + 1, k))
+        self._peak = np.zeros((capacity + 1, k))
+        self._drawdown = np.zeros((capacity + 1, k))
+        # Rolling metrics already computed, one row per period (see rolling())
+        self._rolling = {name: np.full((capacity, k), np.nan) for name in metric_names}
+        self._rolled = 0
+
+    def _grow(self, capacity):
+        def grow(array, rows):
+            new = np.zeros((rows,) + array.shape[1:], dtype=array.dtype)
+            new[:len(array)] = array
+            return new
+
+        self._values = grow(self._values, capacity)
+        self._rolling = {name: grow(array, capacity) for name, array in self._rolling.items()}
+        for name in ('_sum', '_sumsq', '_downsq', '_log_wealth', '_peak', '_drawdown'):
+            setattr(self, name, grow(getattr(self, name), capacity + 1))
+
+    def __len__(self):
+        return self._n
+
+    @classmethod
+    def from_frame(cls, returns, **kwargs):
+        # returns: periods x series frame of fractional returns
+        engine = cls(returns.columns, **kwargs)
+        engine.append(returns.to_numpy(dtype=float), index=returns.index)
+        return engine
+
+    def append(self, returns, index=None):
+        # One period (a row per series) or a (periods x series) block
+        returns = np.asarray(returns, dtype=float).reshape(-1, len(self.columns))
+        if np.isnan(returns).any():
+            raise ValueError("RiskEngine needs complete return rows; fill or drop missing periods first")
+        if (returns <= -1).any():
+            raise ValueError("Returns must be above -100%")
+        start, end = self._n, self._n + len(returns)
+        if end > len(self._values):
+            self._grow(max(end, 2 * len(self._values)))
+
+        if start == 0 and len(returns):
+            self._shift = returns[0].copy()
+        shortfall = np.minimum(returns - self.period_risk_free, 0)
+        deviation = returns - self._shift
+        self._values[start:end] = returns
+        self._sum[start + 1:end + 1] = self._sum[start] + np.cumsum(deviation, axis=0)
+        self._sumsq[start + 1:end + 1] = self._sumsq[start] + np.cumsum(deviation * deviation, axis=0)
+        self._downsq[start + 1:end + 1] = self._downsq[start] + np.cumsum(shortfall * shortfall, axis=0)
+        log_wealth = self._log_wealth[start] + np.cumsum(np.log1p(returns), axis=0)
+        peak = np.maximum(self._peak[start], np.maximum.accumulate(log_wealth, axis=0))
+        self._log_wealth[start + 1:end + 1] = log_wealth
+        self._peak[start + 1:end + 1] = peak
+        self._drawdown[start + 1:end + 1] = np.minimum(self._drawdown[start],
+                                                       np.minimum.accumulate(log_wealth - peak, axis=0))
+        self.index.extend(range(start, end) if index is None else list(index))
+        self._n = end
+
+    def _windows(self, first_end, last_end):
+        # Metrics of every window ending at prefix rows first_end .. last_end - 1
+        # (each covering the window rows before its end), as (windows x series) arrays
+        w = self.window
+        ends = np.arange(first_end, last_end)
+        starts = ends - w
+        deviation = (self._sum[ends] - self._sum[starts]) / w
+        mean = self._shift + deviation
+        variance = (np.maximum((self._sumsq[ends] - self._sumsq[starts]) / w - deviation * deviation, 0)
+                    * w / max(w - 1, 1))
+        std = np.sqrt(variance)
+        std[std <= relative_epsilon * np.abs(mean)] = 0
+        downside = np.sqrt((self._downsq[ends] - self._downsq[starts]) / w)
+        excess = mean - self.period_risk_free
+        annualise = math.sqrt(self.periods_per_year)
+        z = NormalDist().inv_cdf(self.alpha)
+        density = math.exp(-z * z / 2) / math.sqrt(2 * math.pi)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = {
+                'volatility': std * annualise,
+                'var_parametric': -(mean + z * std),
+                'cvar_parametric': -(mean - std * density / self.alpha),
+                'sharpe': np.where(std > 0, excess / std * annualise, np.nan),
+                'sortino': np.where(downside > 0, excess / downside * annualise, np.nan),
+            }
+
+        # Historical tail and in-window drawdown over sliding views of the raw values, chunk by chunk
+        tail = max(int(math.floor(self.alpha * w)), 1)
+        var_historical, cvar_historical, drawdown = [], [], []
+        step = max(chunk_values // max(w * len(self.columns), 1), 1)
+        for chunk_start in range(first_end, last_end, step):
+            chunk_end = min(chunk_start + step, last_end)
+            values = sliding_window_view(self._values[chunk_start - w:chunk_end - 1], w, axis=0)
+            worst = np.partition(values, tail - 1, axis=-1)[..., :tail]
+            var_historical.append(-worst.max(axis=-1))
+            cvar_historical.append(-worst.mean(axis=-1))
+            # Drawdown inside the window, measured from the wealth level at its start
+            log_wealth = sliding_window_view(self._log_wealth[chunk_start - w:chunk_end], w + 1, axis=0)
+            peak = np.maximum.accumulate(log_wealth, axis=-1)
+            drawdown.append((log_wealth - peak).min(axis=-1))
+        result['var_historical'] = np.concatenate(var_historical)
+        result['cvar_historical'] = np.concatenate(cvar_historical)
+        result['max_drawdown'] = np.expm1(np.concatenate(drawdown))
+        return result
+
+    def latest(self):
+        # Metrics of the most recent window per series, plus the drawdown since the first period
+        if self._n < self.window:
+            raise ValueError(f"Need {self.window} periods, have {self._n}")
+        metrics = self._windows(self._n, self._n + 1)
+        frame = pd.DataFrame({name: metrics[name][0] for name in metric_names}, index=self.columns)
+        frame['max_drawdown_all'] = np.expm1(self._drawdown[self._n])
+        return frame
+
+    def rolling(self):
+        # {metric: periods x series frame} for every full window so far, row t
+        # being the window that ends at period t. Only windows ending after the
+        # previous call are computed; the frames are views of the stored rows.
+        first_end = max(self._rolled, self.window)
+        if self._n + 1 > first_end:
+            metrics = self._windows(first_end, self._n + 1)
+            for name in metric_names:
+                self._rolling[name][first_end - 1:self._n] = metrics[name]
+            self._rolled = self._n + 1
+        first = min(self.window - 1, self._n)
+        index = pd.Index(self.index[first:self._n])
+        return {name: pd.DataFrame(self._rolling[name][first:self._n], index=index, columns=self.columns, copy=False)
+                for name in metric_names}
+
+def bucket_returns(nifty_data=None, return_models=None):
+    # Monthly returns per bucket as in run_backtest: volatile follows Nifty,
+    # safe and hedge earn the constant monthly rate of their return model
+    if nifty_data is None:
+        nifty_data = open_monthly_csv(default_path).monthly_frame('Value')
+    nifty_data = nifty_data.dropna(subset=['Value'])
+    return_models = {**default_return_models, **(return_models or {})}
+    return pd.DataFrame({
+        'safe': (1 + return_models['safe']['annual_return']) ** (1 / 12) - 1,
+        'hedge': (1 + return_models['hedge']['annual_return']) ** (1 / 12) - 1,
+        'volatile': nifty_data['Value'].to_numpy() / 100,
+    }, index=pd.Index(nifty_data['Date'].to_numpy(), name='Date'))
+
+class PortfolioRisk:
+    # RiskEngine over allocation mixes: allocation holds per-portfolio bucket
+    # percentages (as from get_allocation_batch) and returns one column per
+    # bucket. Portfolios sharing a mix share one engine column, so millions of
+    # clients cost as much as their few distinct allocations.
+    def __init__(self, returns, allocation, **kwargs):
+        weights = np.column_stack([np.asarray(allocation[bucket], dtype=float) for bucket in buckets])
+        weights = weights / weights.sum(axis=1, keepdims=True)
+        self.group, mixes = pd.factorize(pd.MultiIndex.from_arrays(weights.T))
+        self.weights = np.array(list(mixes), dtype=float).reshape(-1, len(buckets))
+        self.engine = RiskEngine(range(len(self.weights)), **kwargs)
+        self.append(returns)
+
+    def append(self, returns):
+        # New periods of bucket returns (a frame with safe / hedge / volatile columns)
+        self.engine.append(returns[list(buckets)].to_numpy(dtype=float) @ self.weights.T, index=returns.index)
+
+    def latest(self):
+        # One row of metrics per portfolio, in input order
+        return self.engine.latest().iloc[self.group].reset_index(drop=True)
+
+if __name__ == "__main__":
+    from backtest import profile_grid
+
+    parser = argparse.ArgumentParser(description="Risk metrics of the allocation mixes over Nifty history")
+    parser.add_argument('--window', type=int, default=36, help="months per window")
+    parser.add_argument('--alpha', type=float, default=0.05, help="VaR / CVaR tail probability")
+    parser.add_argument('--risk-free', type=float, default=0.065, help="annual risk-free rate")
+    args = parser.parse_args()
+
+    profiles = profile_grid()
+    risk = PortfolioRisk(bucket_returns(), get_allocation_batch(profiles), window=args.window, alpha=args.alpha,
+                         risk_free=args.risk_free)
+    with pd.option_context('display.width', 200, 'display.float_format', '{:.4f}'.format):
+        print(pd.concat([profiles, risk.latest()], axis=1).to_string(index=False))
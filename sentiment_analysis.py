@@ -1,45 +1,144 @@
-import pandas as pd
-import numpy as np
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-
-def analyze_sentiment(text):
-    analyzer = SentimentIntensityAnalyzer()
-    sentiment = analyzer.polarity_scores(text)
-    return sentiment
-
-def bulk_sentiment_analysis(news_data):
-    analyzer = SentimentIntensityAnalyzer()
-    
-    # Assuming news_data has a 'text' column containing the news text
-    news_data['sentiment'] = news_data['text'].apply(lambda x: analyzer.polarity_scores(x)['compound'])
-    
-    return news_data
-
-def generate_random_news(n_samples):
-    # Simulate generating random news headlines
-    news_data = pd.DataFrame(columns=['text'])
-    np.random.seed(42)
-    for i in range(n_samples):
-        news_data.loc[i] = [' '.join(np.random.choice(['Good', 'Bad', 'Neutral']) for _ in range(5))]
-    return news_data
-
-def simulate_asset_returns(n_samples, sentiment_scores):
-    np.random.seed(123)
-    base_returns = np.random.normal(loc=0.5, scale=2.0, size=n_samples)
-    impact_factor = 0.3  # Adjust this factor to control the impact of sentiment
-    
-    # Simulate asset returns affected by news sentiment
-    asset_returns = base_returns + sentiment_scores * impact_factor
-    return asset_returns
-
-def simulate_sentiment_analysis_impact():
-    # Simulate generating random news and analyzing sentiment
-    news_data = generate_random_news(100)
-    news_data['Sentiment'] = news_data['text'].apply(lambda x: analyze_sentiment(x)['compound'])
-    
-    # Simulate impact of sentiment on asset returns
-    n_samples = len(news_data)
-    sentiment_scores = news_data['Sentiment'].values
-    news_data['Asset_Returns'] = simulate_asset_returns(n_samples, sentiment_scores)
-    
-    return news_data
+import argparse
+import collections
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from synthetic_data import default_vocabulary, headline_texts
+
+logger = logging.getLogger(__name__)
+
+# Frames smaller than this are scored in-process; the pool start-up is not worth it
+parallel_threshold = 20000
+
+_analyzer = None
+
+def get_analyzer():
+    # One analyzer per process: building it reloads the whole VADER lexicon
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+def analyze_sentiment(text):
+    analyzer = get_analyzer()
+    sentiment = analyzer.polarity_scores(text)
+    return sentiment
+
+def _score_texts(texts):
+    analyzer = get_analyzer()
+    return np.array([analyzer.polarity_scores(text)['compound'] for text in texts], dtype=float)
+
+def _chunks(texts, chunksize):
+    for start in range(0, len(texts), chunksize):
+        yield texts[start:start + chunksize]
+
+def score_headlines(texts, workers=None, chunksize=5000):
+    # Compound scores for a sequence of headlines, split into chunks across a process pool
+    texts = list(texts)
+    if workers == 1 or len(texts) <= chunksize:
+        return _score_texts(texts)
+    with ProcessPoolExecutor(max_workers=workers, initializer=get_analyzer) as executor:
+        scores = list(executor.map(_score_texts, _chunks(texts, chunksize)))
+    return np.concatenate(scores) if scores else np.array([], dtype=float)
+
+def bulk_sentiment_analysis(news_data, workers=None, chunksize=5000, cache=None, mode='exact'):
+    # Assuming news_data has a 'text' column containing the news text.
+    # With a SentimentCache only headlines it has not seen before are scored.
+    # mode='vectorized' trades exactness on rare VADER rules for batch speed
+    # (see sentiment_vectorized).
+    if mode not in ('exact', 'vectorized'):
+        raise ValueError(f"Unknown sentiment mode: {mode}")
+
+    def scorer(texts):
+        if mode == 'vectorized':
+            from sentiment_vectorized import score_headlines_vectorized
+            return score_headlines_vectorized(texts)
+        n_workers = 1 if workers is None and len(texts) < parallel_threshold else workers
+        return score_headlines(texts, workers=n_workers, chunksize=chunksize)
+
+    if cache is None:
+        news_data['sentiment'] = scorer(news_data['text'].tolist())
+    else:
+        news_data['sentiment'] = cache.score(news_data['text'], scorer)
+    
+    return news_data
+
+def stream_sentiment_file(input_path, output_path, text_column='text', workers=None, chunksize=50000):
+    # Scores a CSV of headlines chunk by chunk and appends each scored chunk to
+    # output_path in input order, so files larger than memory can be processed.
+    # Only a bounded number of chunks is in flight at any time.
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    stats = {'headlines': 0, 'chunks': 0}
+    start = time.perf_counter()
+
+    def write(chunk, scores, first):
+        chunk['sentiment'] = scores
+        chunk.to_csv(output_path, mode='w' if first else 'a', header=first, index=False)
+        stats['headlines'] += len(chunk)
+        stats['chunks'] += 1
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=get_analyzer) as executor:
+        pending = collections.deque()
+        for chunk in pd.read_csv(input_path, chunksize=chunksize):
+            texts = chunk[text_column].fillna('').astype(str).tolist()
+            pending.append((chunk, executor.submit(_score_texts, texts)))
+            if len(pending) >= max_in_flight:
+                chunk, future = pending.popleft()
+                write(chunk, future.result(), stats['chunks'] == 0)
+        while pending:
+            chunk, future = pending.popleft()
+            write(chunk, future.result(), stats['chunks'] == 0)
+
+    stats['seconds'] = time.perf_counter() - start
+    stats['headlines_per_second'] = stats['headlines'] / stats['seconds'] if stats['seconds'] else 0.0
+    logger.info(f"Scored {stats['headlines']} headlines in {stats['seconds']:.2f}s "
+                f"({stats['headlines_per_second']:.0f} headlines/s)")
+    return stats
+
+def generate_random_news(n_samples, seed=42):
+    # Simulate generating random news headlines. A local RandomState draws the
+    # same words as seeding the global one did, without touching global state;
+    # see synthetic_data for large, parallel streams.
+    rng = np.random.RandomState(seed)
+    indices = rng.randint(0, len(default_vocabulary), size=(n_samples, 5))
+    return pd.DataFrame({'text': headline_texts(default_vocabulary, indices)})
+
+def simulate_asset_returns(n_samples, sentiment_scores, seed=123):
+    rng = np.random.RandomState(seed)
+    base_returns = rng.normal(loc=0.5, scale=2.0, size=n_samples)
+    impact_factor = 0.3  # Adjust this factor to control the impact of sentiment
+    
+    # Simulate asset returns affected by news sentiment
+    asset_returns = base_returns + sentiment_scores * impact_factor
+    return asset_returns
+
+def simulate_sentiment_analysis_impact():
+    # Simulate generating random news and analyzing sentiment
+    news_data = generate_random_news(100)
+    news_data['Sentiment'] = news_data['text'].apply(lambda x: analyze_sentiment(x)['compound'])
+    
+    # Simulate impact of sentiment on asset returns
+    n_samples = len(news_data)
+    sentiment_scores = news_data['Sentiment'].values
+    news_data['Asset_Returns'] = simulate_asset_returns(n_samples, sentiment_scores)
+    
+    return news_data
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a CSV of news headlines with VADER")
+    parser.add_argument('input_path')
+    parser.add_argument('output_path')
+    parser.add_argument('--text-column', default='text')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--chunksize', type=int, default=50000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    stream_sentiment_file(args.input_path, args.output_path, args.text_column, args.workers, args.chunksize)
@@ -0,0 +1,124 @@
+import collections
+import hashlib
+import sqlite3
+import sys
+import threading
+
+import numpy as np
+
+# Approximate memory held per cached entry: the digest key, the float score
+# and the OrderedDict node that links them
+_KEY_BYTES = 16
+ENTRY_BYTES = sys.getsizeof(b'\0' * _KEY_BYTES) + sys.getsizeof(0.0) + 64
+
+def normalize_text(text):
+    # VADER tokenizes on whitespace, so collapsing runs of whitespace never changes a score
+    return ' '.join(str(text).split())
+
+def text_key(text):
+    return hashlib.blake2b(normalize_text(text).encode('utf-8'), digest_size=_KEY_BYTES).digest()
+
+class SentimentCache:
+    # Compound scores keyed by a hash of the normalized headline. The memory
+    # tier is an LRU capped at max_bytes; with a path, scores are also kept in
+    # an SQLite file so they survive restarts and can be shared between runs.
+    def __init__(self, max_bytes=64 * 1024 * 1024, path=None):
+        self.max_bytes = max_bytes
+        self.path = path
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS scores (key BLOB PRIMARY KEY, compound REAL NOT NULL)")
+            self._db.commit()
+
+    @property
+    def size_bytes(self):
+        return len(self._entries) * ENTRY_BYTES
+
+    def _remember(self, key, score):
+        self._entries[key] = score
+        self._entries.move_to_end(key)
+        while self._entries and len(self._entries) * ENTRY_BYTES > self.max_bytes:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _load_from_disk(self, keys):
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            rows = self._db.execute(f"SELECT key, compound FROM scores WHERE key IN ({placeholders})", batch)
+            found.update((bytes(key), compound) for key, compound in rows)
+        return found
+
+    def score(self, texts, scorer):
+        # Returns compound scores for texts; scorer(list_of_texts) -> scores is
+        # only called for headlines whose normalized text was never seen before
+        texts = list(texts)
+        keys = [text_key(text) for text in texts]
+        scores = np.empty(len(texts), dtype=float)
+        missing = collections.OrderedDict()
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                score = self._entries.get(key)
+                if score is None:
+                    missing.setdefault(key, []).append(i)
+                else:
+                    self._entries.move_to_end(key)
+                    scores[i] = score
+                    self.hits += 1
+
+            if missing and self._db is not None:
+                for key, score in self._load_from_disk(list(missing)).items():
+                    positions = missing.pop(key)
+                    scores[positions] = score
+                    self.disk_hits += len(positions)
+                    self._remember(key, score)
+
+        if missing:
+            # Each distinct new headline is scored once, however often it repeats
+            new_keys = list(missing)
+            new_scores = np.asarray(scorer([texts[missing[key][0]] for key in new_keys]), dtype=float)
+            with self._lock:
+                for key, score in zip(new_keys, new_scores):
+                    positions = missing[key]
+                    scores[positions] = score
+                    self.misses += 1
+                    self.hits += len(positions) - 1
+                    self._remember(key, float(score))
+                if self._db is not None:
+                    self._db.executemany("INSERT OR REPLACE INTO scores (key, compound) VALUES (?, ?)",
+                                         zip(new_keys, map(float, new_scores)))
+                    self._db.commit()
+        return scores
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'size_bytes': self.size_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,189 @@
+import itertools
+import string
+
+import numpy as np
+import pandas as pd
+from vaderSentiment.vaderSentiment import BOOSTER_DICT, C_INCR, N_SCALAR, NEGATE
+
+from sentiment_analysis import get_analyzer
+
+# Rules of VADER's polarity_scores reproduced here: lexicon valence, ALL-CAPS
+# emphasis, boosters/dampeners up to three words back (with 0.95 / 0.9 decay),
+# negation up to three words back including the "never so"/"without doubt"
+# exceptions, "no" as a modifier, "kind of"/"sort of" dampeners, the "but"
+# shift and "!"/"?" emphasis. Not reproduced: emoji descriptions, "least" and
+# idioms such as "kiss of death"; those, plus VADER's value-based indexing in
+# its "but" rule, are where compound scores can differ from the exact mode.
+
+class VectorizedSentimentScorer:
+    # Compiles the VADER lexicon into a vocabulary index once; headlines are then
+    # scored in batches with array operations instead of a per-token Python loop
+    def __init__(self, analyzer=None, batch_size=200000):
+        analyzer = analyzer or get_analyzer()
+        self.batch_size = batch_size
+        # Two-word boosters ("kind of", "sort of") are matched as word pairs
+        self.booster_bigrams = [(tuple(phrase.split()), scalar) for phrase, scalar in BOOSTER_DICT.items()
+                                if len(phrase.split()) == 2]
+        bigram_words = {word for pair, _ in self.booster_bigrams for word in pair}
+        words = sorted(set(analyzer.lexicon) | set(BOOSTER_DICT) | set(NEGATE) | bigram_words |
+                       {'but', 'so', 'this', 'no', 'kind', 'of', 'or', 'nor', 'never', 'without', 'doubt'})
+        self.vocabulary = pd.Index(words)
+        n_words = len(words) + 1  # last slot is every out-of-vocabulary token
+
+        self.valence = np.zeros(n_words)
+        self.in_lexicon = np.zeros(n_words, dtype=bool)
+        self.booster = np.zeros(n_words)
+        self.negation = np.zeros(n_words, dtype=bool)
+        for word_id, word in enumerate(words):
+            if word in analyzer.lexicon:
+                self.valence[word_id] = analyzer.lexicon[word]
+                self.in_lexicon[word_id] = True
+            self.booster[word_id] = BOOSTER_DICT.get(word, 0.0)
+            self.negation[word_id] = word in NEGATE or "n't" in word
+        self.is_booster = self.booster != 0
+        self.unknown_id = n_words - 1
+        self.word_id = {word: self.vocabulary.get_loc(word) for word in
+                        {'but', 'no', 'kind', 'of', 'or', 'nor', 'never', 'without', 'doubt'} | bigram_words}
+        self.so_this = np.zeros(n_words, dtype=bool)
+        self.so_this[[self.vocabulary.get_loc('so'), self.vocabulary.get_loc('this')]] = True
+
+    def _tokenize(self, texts):
+        split = texts.str.split()
+        lengths = split.str.len().to_numpy(dtype=np.int64)
+        # Headlines reuse a small vocabulary, so string work is done once per distinct token
+        codes, unique_tokens = pd.factorize(np.fromiter(itertools.chain.from_iterable(split), dtype=object, count=lengths.sum()))
+        unique_tokens = pd.Series(unique_tokens, dtype=object)
+        # Same punctuation stripping as SentiText: keep the token when stripping leaves <= 2 chars
+        stripped = unique_tokens.str.strip(string.punctuation)
+        unique_tokens = unique_tokens.where(stripped.str.len() <= 2, stripped)
+        unique_ids = self.vocabulary.get_indexer(unique_tokens.str.lower())
+        unique_ids[unique_ids < 0] = self.unknown_id
+        unique_upper = unique_tokens.str.isupper().to_numpy(dtype=bool)
+        return unique_ids[codes], unique_upper[codes], lengths
+
+    def _score_batch(self, texts):
+        n_docs = len(texts)
+        word_ids, is_upper, lengths = self._tokenize(texts)
+        n_tokens = len(word_ids)
+        doc = np.repeat(np.arange(n_docs), lengths)
+        starts = np.cumsum(lengths) - lengths
+        pos = np.arange(n_tokens) - np.repeat(starts, lengths)
+
+        # Headlines with some, but not all, words in capitals
+        n_upper = np.bincount(doc, weights=is_upper, minlength=n_docs)
+        cap_diff = ((lengths - n_upper) > 0) & ((lengths - n_upper) < lengths)
+        token_cap_diff = cap_diff[doc]
+
+        def neighbour(offset):
+            # Word id `offset` positions away within the same headline (unknown past either end)
+            index = np.arange(n_tokens) + offset
+            inside = (pos + offset >= 0) & (pos + offset < np.repeat(lengths, lengths))
+            return np.where(inside, word_ids[np.clip(index, 0, max(n_tokens - 1, 0))], self.unknown_id)
+
+        def is_word(ids, word):
+            return ids == self.word_id[word]
+
+        previous = {back: neighbour(-back) for back in (1, 2, 3)}
+        following = neighbour(1)
+
+        # Boosters and "kind" in "kind of" carry no valence of their own
+        scored = self.in_lexicon[word_ids] & ~self.is_booster[word_ids] & ~(is_word(word_ids, 'kind') & is_word(following, 'of'))
+        valence = np.where(scored, self.valence[word_ids], 0.0)
+        # "no" before another lexicon word is only a modifier; a lexicon word after "no" is negated
+        valence[is_word(word_ids, 'no') & self.in_lexicon[following]] = 0.0
+        after_no = scored & (is_word(previous[1], 'no') | is_word(previous[2], 'no') |
+                             (is_word(previous[3], 'no') & (is_word(previous[1], 'or') | is_word(previous[1], 'nor'))))
+        valence = np.where(after_no, self.valence[word_ids] * N_SCALAR, valence)
+
+        caps = scored & is_upper & token_cap_diff
+        valence[caps] += np.where(valence[caps] > 0, C_INCR, -C_INCR)
+
+        for back, decay in ((1, 1.0), (2, 0.95), (3, 0.9)):
+            prev_ids = previous[back]
+            # Modifiers only count when the preceding word is not itself in the lexicon
+            apply = scored & (pos >= back) & ~self.in_lexicon[prev_ids]
+
+            scalar = self.booster[prev_ids]
+            scalar = np.where(valence < 0, -scalar, scalar)
+            prev_upper = is_upper[np.clip(np.arange(n_tokens) - back, 0, max(n_tokens - 1, 0))]
+            booster_caps = self.is_booster[prev_ids] & prev_upper & token_cap_diff
+            scalar = scalar + np.where(booster_caps, np.where(valence > 0, C_INCR, -C_INCR), 0.0)
+            valence = np.where(apply, valence + scalar * decay, valence)
+
+            if back == 1:
+                amplified = np.zeros(n_tokens, dtype=bool)
+                unchanged = amplified
+            elif back == 2:
+                amplified = is_word(previous[2], 'never') & self.so_this[previous[1]]
+                unchanged = is_word(previous[2], 'without') & is_word(previous[1], 'doubt')
+            else:
+                amplified = (is_word(previous[3], 'never') & self.so_this[previous[2]]) | self.so_this[previous[1]]
+                unchanged = is_word(previous[3], 'without') & (is_word(previous[2], 'doubt') | is_word(previous[1], 'doubt'))
+            negated = self.negation[prev_ids] & ~amplified & ~unchanged
+            valence = np.where(apply & amplified, valence * 1.25, valence)
+            valence = np.where(apply & negated, valence * N_SCALAR, valence)
+
+            if back == 3:
+                # Dampener bigrams in the three words before, not sign-adjusted as in VADER
+                for (first, second), bigram_scalar in self.booster_bigrams:
+                    for older, newer in ((3, 2), (2, 1)):
+                        match = apply & is_word(previous[older], first) & is_word(previous[newer], second)
+                        valence = np.where(match, valence + bigram_scalar, valence)
+
+        # Sentiment before the first "but" is halved and after it boosted by half
+        first_but = np.full(n_docs, np.iinfo(np.int64).max)
+        is_but = is_word(word_ids, 'but')
+        np.minimum.at(first_but, doc[is_but], pos[is_but])
+        token_but = first_but[doc]
+        valence = np.where(pos < token_but, np.where(token_but < np.iinfo(np.int64).max, valence * 0.5, valence),
+                           np.where(pos > token_but, valence * 1.5, valence))
+
+        total = np.bincount(doc, weights=valence, minlength=n_docs)
+        exclamations = np.minimum(texts.str.count('!').to_numpy(), 4) * 0.292
+        questions = texts.str.count('\\?').to_numpy()
+        question_amp = np.where(questions > 1, np.where(questions <= 3, questions * 0.18, 0.96), 0.0)
+        emphasis = exclamations + question_amp
+        total = np.where(total > 0, total + emphasis, np.where(total < 0, total - emphasis, total))
+
+        compound = np.clip(total / np.sqrt(total * total + 15), -1.0, 1.0)
+        return np.round(compound, 4)
+
+    def score(self, texts):
+        texts = pd.Series(texts, dtype=object).reset_index(drop=True).astype(str).str.strip()
+        if len(texts) == 0:
+            return np.array([], dtype=float)
+        scores = [self._score_batch(texts.iloc[start:start + self.batch_size].reset_index(drop=True))
+                  for start in range(0, len(texts), self.batch_size)]
+        return np.concatenate(scores)
+
+_scorer = None
+
+def get_vectorized_scorer():
+    global _scorer
+    if _scorer is None:
+        _scorer = VectorizedSentimentScorer()
+    return _scorer
+
+def score_headlines_vectorized(texts):
+    return get_vectorized_scorer().score(texts)
+
+def accuracy_report(texts, exact_scores=None, tolerance=1e-4, n_examples=5):
+    # Compares the vectorized mode with the exact polarity_scores compound
+    texts = list(texts)
+    if exact_scores is None:
+        analyzer = get_analyzer()
+        exact_scores = np.array([analyzer.polarity_scores(text)['compound'] for text in texts])
+    exact_scores = np.asarray(exact_scores, dtype=float)
+    fast_scores = score_headlines_vectorized(texts)
+    error = np.abs(fast_scores - exact_scores)
+    worst = np.argsort(-error)[:n_examples]
+    return {
+        'headlines': len(texts),
+        'exact_match_rate': float(np.mean(error <= tolerance)) if len(texts) else 1.0,
+        'sign_agreement': float(np.mean(np.sign(fast_scores) == np.sign(exact_scores))) if len(texts) else 1.0,
+        'mean_abs_error': float(error.mean()) if len(texts) else 0.0,
+        'p99_abs_error': float(np.percentile(error, 99)) if len(texts) else 0.0,
+        'max_abs_error': float(error.max()) if len(texts) else 0.0,
+        'worst': [{'text': texts[i], 'exact': float(exact_scores[i]), 'vectorized': float(fast_scores[i])}
+                  for i in worst if error[i] > tolerance],
+    }
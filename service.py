@@ -0,0 +1,176 @@
+import argparse
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import numpy as np
+
+from allocation import get_allocation, get_allocation_batch
+from asset_selection import select_assets
+from instrumentation import instrumentation
+from market_evaluation import market_snapshot
+
+logger = logging.getLogger(__name__)
+
+class BadRequest(Exception):
+    pass
+
+def _json_default(value):
+    # NumPy scalars and arrays coming out of the engine
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def _client_profile(payload):
+    try:
+        capital = float(payload['capital'])
+        time_horizon = int(payload['time_horizon'])
+        risk_tolerance = str(payload['risk_tolerance'])
+    except KeyError as e:
+        raise BadRequest(f"Missing field: {e.args[0]}")
+    except (TypeError, ValueError):
+        raise BadRequest("capital and time_horizon must be numbers")
+    return capital, time_horizon, risk_tolerance
+
+def _market_outlook():
+    market_evaluation = market_snapshot.get()
+    if market_evaluation is None:
+        return None
+    return market_evaluation["overall"]["outlook"]
+
+# Endpoint handlers take the decoded JSON body and return (status, response)
+def handle_allocation(payload):
+    if 'profiles' in payload:
+        profiles = payload['profiles']
+        if not isinstance(profiles, list):
+            raise BadRequest("profiles must be a list")
+        parsed = [_client_profile(profile) for profile in profiles]
+        capital, time_horizon, risk_tolerance = zip(*parsed) if parsed else ((), (), ())
+        allocations = get_allocation_batch(np.array(capital), np.array(time_horizon), np.array(risk_tolerance, dtype=object))
+        return 200, {'allocations': [
+            {'safe': safe, 'hedge': hedge, 'volatile': volatile}
+            for safe, hedge, volatile in zip(allocations['safe'], allocations['hedge'], allocations['volatile'])
+        ]}
+    return 200, {'allocation': get_allocation(*_client_profile(payload))}
+
+def handle_outlook(payload):
+    market_evaluation = market_snapshot.get()
+    if market_evaluation is None:
+        return 503, {'error': "Error in evaluating market conditions."}
+    return 200, market_evaluation
+
+def handle_assets(payload):
+    allocation = get_allocation(*_client_profile(payload))
+    market_outlook = payload.get('market_outlook') or _market_outlook()
+    if market_outlook is None:
+        return 503, {'error': "Error in evaluating market conditions."}
+    selected_assets = select_assets(allocation['safe'], allocation['hedge'], allocation['volatile'], market_outlook)
+    return 200, {'allocation': allocation, 'market_outlook': market_outlook, 'assets': selected_assets}
+
+def handle_metrics(payload):
+    # Prometheus text exposition of the per-stage timings (see instrumentation)
+    return 200, instrumentation.prometheus_text()
+
+routes = {
+    ('POST', '/allocation'): handle_allocation,
+    ('GET', '/outlook'): handle_outlook,
+    ('POST', '/assets'): handle_assets,
+    ('GET', '/metrics'): handle_metrics,
+}
+
+class AllocationRequestHandler(BaseHTTPRequestHandler):
+    server_version = "FundSplit/1.0"
+
+    def _dispatch(self, method):
+        handler = routes.get((method, self.path.split('?', 1)[0]))
+        if handler is None:
+            self._send(404, {'error': f"No route for {method} {self.path}"})
+            return
+        try:
+            payload = {}
+            length = int(self.headers.get('Content-Length') or 0)
+            if length:
+                payload = json.loads(self.rfile.read(length))
+                if not isinstance(payload, dict):
+                    raise BadRequest("Request body must be a JSON object")
+            status, response = handler(payload)
+        except json.JSONDecodeError as e:
+            status, response = 400, {'error': f"Invalid JSON: {e}"}
+        except BadRequest as e:
+            status, response = 400, {'error': str(e)}
+        except Exception:
+            logger.exception("Request failed: %s %s", method, self.path)
+            status, response = 500, {'error': "Internal server error"}
+        self._send(status, response)
+
+    def _send(self, status, response):
+        if isinstance(response, str):
+            body = response.encode('utf-8')
+            content_type = 'text/plain; version=0.0.4'
+        else:
+            body = json.dumps(response, default=_json_default).encode('utf-8')
+            content_type = 'application/json'
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+class PooledHTTPServer(HTTPServer):
+    # Hands each accepted connection to a fixed pool of worker threads
+    def __init__(self, server_address, handler_class, workers=8):
+        super().__init__(server_address, handler_class)
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='http-worker')
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=True)
+
+def create_server(host='127.0.0.1', port=8000, workers=8, warm=True):
+    server = PooledHTTPServer((host, port), AllocationRequestHandler, workers=workers)
+    if warm:
+        # Compute the shared market snapshot before the first request needs it
+        threading.Thread(target=market_snapshot.get, name='snapshot-warmup', daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON allocation service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    server = create_server(args.host, args.port, args.workers)
+    logger.info(f"Serving on http://{args.host}:{server.server_address[1]} with {args.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+
+class _Flight:
+    # One in-flight computation that concurrent callers wait on
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SnapshotCache:
+    # Memoizes an expensive computation whose result is shared by every caller.
+    # A snapshot expires after `ttl` seconds or as soon as one of the watched
+    # input files changes (mtime or size); failed results (None) are not kept.
+    # Exceptions listed in retry_on (e.g. a caller cancelling its own run) are
+    # not passed on to waiting callers, which start a fresh computation instead.
+    def __init__(self, compute, ttl=900, watch_paths=(), retry_on=(), clock=time.monotonic):
+        self._compute = compute
+        self.retry_on = tuple(retry_on)
+        self.ttl = ttl
+        self.watch_paths = list(watch_paths)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._value = None
+        self._computed_at = None
+        self._fingerprint = None
+        self._generation = 0
+        self._inflight = None
+        self.hits = 0
+        self.misses = 0
+
+    def _current_fingerprint(self):
+        fingerprint = []
+        for path in self.watch_paths:
+            try:
+                stat = os.stat(path)
+                fingerprint.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                fingerprint.append((path, None, None))
+        return tuple(fingerprint)
+
+    def _is_fresh(self, fingerprint):
+        if self._computed_at is None:
+            return False
+        if self.ttl is not None and self._clock() - self._computed_at >= self.ttl:
+            return False
+        return fingerprint == self._fingerprint
+
+    def get(self, **kwargs):
+        # kwargs are forwarded to the computation when this call has to run it
+        fingerprint = self._current_fingerprint()
+        with self._lock:
+            if self._is_fresh(fingerprint):
+                self.hits += 1
+                return self._value
+            self.misses += 1
+            if self._inflight is not None:
+                flight = self._inflight
+                leader = False
+            else:
+                flight = self._inflight = _Flight()
+                generation = self._generation
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                if isinstance(flight.error, self.retry_on):
+                    return self.get(**kwargs)
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._compute(**kwargs)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                # Results started before an invalidate() are handed out but not stored
+                if flight.error is None and flight.result is not None and generation == self._generation:
+                    self._value = flight.result
+                    self._computed_at = self._clock()
+                    self._fingerprint = fingerprint
+                self._inflight = None
+            flight.done.set()
+        return flight.result
+
+    def peek(self):
+        # Current snapshot if it is still fresh, without triggering a computation
+        fingerprint = self._current_fingerprint()
+        with self._lock:
+            return self._value if self._is_fresh(fingerprint) else None
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._value = None
+            self._computed_at = None
+            self._fingerprint = None
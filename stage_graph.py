@@ -0,0 +1,114 @@
+import hashlib
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+class Node:
+    # One stage of a StageGraph. func receives the results of deps as positional
+    # arguments, in order. fingerprint() describes the node's own inputs (files,
+    # parameters); together with the fingerprints of its dependencies it decides
+    # whether a cached result can be reused. Nodes listing the same resource
+    # never run at the same time on a thread pool (e.g. code that seeds the
+    # global NumPy random state).
+    def __init__(self, name, func, deps=(), fingerprint=None, resources=()):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.fingerprint = fingerprint
+        self.resources = tuple(sorted(resources))
+
+def _run_node(func, args):
+    return func(*args)
+
+class StageGraph:
+    # Runs a small DAG of stages, starting every node whose dependencies are
+    # done on a thread or process pool. Results are cached per node under a
+    # key built from its fingerprint and its dependencies' keys, so a re-run
+    # only recomputes nodes whose inputs changed. A node returning None fails
+    # the run: nodes depending on it are not run and report None as well.
+    def __init__(self, nodes):
+        self.nodes = {node.name: node for node in nodes}
+        for node in nodes:
+            for dep in node.deps:
+                if dep not in self.nodes:
+                    raise ValueError(f"Node {node.name} depends on unknown node {dep}")
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        self._resource_locks = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, node, keys):
+        fingerprint = node.fingerprint() if node.fingerprint is not None else None
+        parts = (node.name, fingerprint, tuple(keys[dep] for dep in node.deps))
+        return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+    def _locked(self, node):
+        with self._cache_lock:
+            locks = [self._resource_locks.setdefault(resource, threading.Lock()) for resource in node.resources]
+
+        def call(*args):
+            for lock in locks:
+                lock.acquire()
+            try:
+                return node.func(*args)
+            finally:
+                for lock in reversed(locks):
+                    lock.release()
+        return call
+
+    def run(self, executor=None, max_workers=None, on_result=None, check_cancelled=None):
+        # Returns {node name: result}. on_result(name, result) is called as each
+        # node finishes (cached or computed); check_cancelled() is called before
+        # nodes are started and may raise to abandon the run.
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=max_workers or len(self.nodes), thread_name_prefix='stage')
+        in_process = not isinstance(executor, ProcessPoolExecutor)
+        results, keys, running = {}, {}, {}
+        try:
+            while len(results) < len(self.nodes):
+                if check_cancelled is not None:
+                    check_cancelled()
+                finished = len(results)
+                for node in self.nodes.values():
+                    if node.name in results or node.name in running:
+                        continue
+                    if any(dep not in results for dep in node.deps):
+                        continue
+                    keys[node.name] = key = self._key(node, keys)
+                    args = [results[dep] for dep in node.deps]
+                    with self._cache_lock:
+                        cached = self._cache.get(node.name)
+                    if any(arg is None for arg in args):
+                        results[node.name] = None
+                    elif cached is not None and cached[0] == key:
+                        self.hits += 1
+                        results[node.name] = cached[1]
+                    else:
+                        self.misses += 1
+                        func = self._locked(node) if in_process and node.resources else node.func
+                        running[node.name] = executor.submit(_run_node, func, args)
+                        continue
+                    if on_result is not None:
+                        on_result(node.name, results[node.name])
+                if not running:
+                    if len(results) == finished:
+                        raise ValueError("Stage graph has a dependency cycle")
+                    continue
+                done, _ = wait(running.values(), return_when=FIRST_COMPLETED)
+                for name in [name for name, future in running.items() if future in done]:
+                    result = running.pop(name).result()
+                    results[name] = result
+                    if result is not None:
+                        with self._cache_lock:
+                            self._cache[name] = (keys[name], result)
+                    if on_result is not None:
+                        on_result(name, result)
+        finally:
+            if own_executor:
+                executor.shutdown(wait=not running, cancel_futures=True)
+        return results
+
+    def invalidate(self):
+        with self._cache_lock:
+            self._cache.clear()
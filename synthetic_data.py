@@ -0,0 +1,114 @@
+import argparse
+import collections
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Words the mock headlines are made of (as in generate_random_news)
+default_vocabulary = ('Good', 'Bad', 'Neutral')
+
+def chunk_rng(seed, chunk):
+    # Generator for one chunk: the chunk'th child of SeedSequence(seed), built
+    # directly from its spawn key so any chunk can be generated on its own
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed, spawn_key=(chunk,))))
+
+def headline_texts(vocabulary, indices):
+    # Joins rows of word indices into headlines. Short headlines over a small
+    # vocabulary have few distinct texts, so each one is built once and looked up.
+    vocabulary = np.asarray(vocabulary, dtype=object)
+    n_words = indices.shape[1]
+    if len(vocabulary) ** n_words <= 1000000:
+        codes = indices @ (len(vocabulary) ** np.arange(n_words - 1, -1, -1))
+        distinct, inverse = np.unique(codes, return_inverse=True)
+        digits = (distinct[:, None] // (len(vocabulary) ** np.arange(n_words - 1, -1, -1))) % len(vocabulary)
+        texts = np.array([' '.join(row) for row in vocabulary[digits]], dtype=object)
+        return texts[inverse.ravel()]
+    words = pd.DataFrame(vocabulary[indices])
+    return words[0].str.cat([words[i] for i in range(1, n_words)], sep=' ').to_numpy()
+
+def news_chunk(seed, chunk, start, size, vocabulary=default_vocabulary, words_per_headline=5):
+    rng = chunk_rng(seed, chunk)
+    indices = rng.integers(0, len(vocabulary), size=(size, words_per_headline))
+    return pd.DataFrame({'text': headline_texts(vocabulary, indices)}, index=pd.RangeIndex(start, start + size))
+
+def macro_chunk(seed, chunk, start, size, periods_per_series=240, first_date='2000-01-01', freq='MS'):
+    # Rows start .. start + size of many macro series (one per region, each
+    # periods_per_series rows long) in the generate_random_macro_data layout
+    rng = chunk_rng(seed, chunk)
+    rows = np.arange(start, start + size)
+    calendar = pd.date_range(first_date, periods=periods_per_series, freq=freq)
+    return pd.DataFrame({
+        'series': rows // periods_per_series,
+        'date': calendar[rows % periods_per_series],
+        'gdp_growth': rng.uniform(1, 10, size),
+        'interest_rate': rng.uniform(1, 10, size),
+    }, index=pd.RangeIndex(start, start + size))
+
+def returns_chunk(seed, chunk, start, size, n_periods=120, impact_factor=0.3):
+    # Return series start .. start + size, one row each: the simulate_asset_returns
+    # model (normal base returns plus a sentiment impact) with a random sentiment per period
+    rng = chunk_rng(seed, chunk)
+    base_returns = rng.normal(loc=0.5, scale=2.0, size=(size, n_periods))
+    sentiment = rng.uniform(-1, 1, size=(size, n_periods))
+    return pd.DataFrame(base_returns + sentiment * impact_factor, index=pd.RangeIndex(start, start + size, name='series'),
+                        columns=[f'period_{i}' for i in range(n_periods)])
+
+generators = {'news': news_chunk, 'macro': macro_chunk, 'returns': returns_chunk}
+
+def _generate_chunk(arguments):
+    kind, seed, chunk, start, size, options = arguments
+    return generators[kind](seed, chunk, start, size, **options)
+
+def generate_chunks(kind, n_rows, seed=0, chunk_size=100000, workers=1, **options):
+    # Yields the rows of a generator ('news', 'macro' or 'returns') chunk by
+    # chunk, in order. Chunk i always uses the same child stream of seed and
+    # chunk boundaries depend only on chunk_size, so the output is identical
+    # for any number of workers.
+    tasks = [(kind, seed, chunk, start, min(chunk_size, n_rows - start), options)
+             for chunk, start in enumerate(range(0, n_rows, chunk_size))]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield _generate_chunk(task)
+        return
+    # Chunks come back in order with a bounded number in flight, as in stream_sentiment_file
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        for task in tasks:
+            pending.append(executor.submit(_generate_chunk, task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def generate(kind, n_rows, seed=0, chunk_size=100000, workers=1, **options):
+    # Whole frame in memory; use generate_chunks / write_csv for large n_rows
+    frames = list(generate_chunks(kind, n_rows, seed, chunk_size, workers, **options))
+    return pd.concat(frames) if frames else generators[kind](seed, 0, 0, 0, **options)
+
+def write_csv(path, chunks):
+    # Streams chunks to one CSV; returns the number of rows written
+    rows = 0
+    for first, chunk in enumerate(chunks, start=1):
+        chunk.to_csv(path, mode='w' if first == 1 else 'a', header=first == 1,
+                     index=chunk.index.name is not None)
+        rows += len(chunk)
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reproducible synthetic news, macro and return data for load tests")
+    parser.add_argument('kind', choices=sorted(generators))
+    parser.add_argument('rows', type=int)
+    parser.add_argument('output_path')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = write_csv(args.output_path, generate_chunks(args.kind, args.rows, args.seed, args.chunk_size, args.workers))
+    seconds = time.perf_counter() - start
+    print(f"{rows:,} {args.kind} rows in {seconds:.2f}s ({rows / seconds:,.0f} rows/s) -> {os.path.abspath(args.output_path)}")
@@ -1,20 +1,313 @@
-import pandas as pd
-import ta
-
-def add_technical_indicators(data):
-    data = data.copy()
-    
-    # Adding Moving Averages
-    data['SMA_50'] = ta.trend.sma_indicator(data['Value'], window=50)
-    data['SMA_200'] = ta.trend.sma_indicator(data['Value'], window=200)
-    
-    # Adding RSI
-    data['RSI'] = ta.momentum.rsi(data['Value'], window=14)
-    
-    # Adding MACD
-    macd = ta.trend.MACD(data['Value'])
-    data['MACD'] = macd.macd()
-    data['MACD_Signal'] = macd.macd_signal()
-    data['MACD_Diff'] = macd.macd_diff()  # Adding MACD histogram difference
-
-    return data
+import collections
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import ta
+
+def add_technical_indicators(data):
+    data = data.copy()
+    
+    # Adding Moving Averages
+    data['SMA_50'] = ta.trend.sma_indicator(data['Value'], window=50)
+    data['SMA_200'] = ta.trend.sma_indicator(data['Value'], window=200)
+    
+    # Adding RSI
+    data['RSI'] = ta.momentum.rsi(data['Value'], window=14)
+    
+    # Adding MACD
+    macd = ta.trend.MACD(data['Value'])
+    data['MACD'] = macd.macd()
+    data['MACD_Signal'] = macd.macd_signal()
+    data['MACD_Diff'] = macd.macd_diff()  # Adding MACD histogram difference
+
+    return data
+
+# Column names produced by add_technical_indicators, in order
+indicator_columns = ['SMA_50', 'SMA_200', 'RSI', 'MACD', 'MACD_Signal', 'MACD_Diff']
+
+def _ema(frame, span):
+    return frame.ewm(span=span, min_periods=span, adjust=False).mean()
+
+def panel_indicators(prices, block_size=500, dtype=np.float64):
+    # The add_technical_indicators columns for many assets at once. prices is a
+    # time x asset DataFrame or 2-D array; the result maps each column name to
+    # an array (or DataFrame) of the same shape. Rolling and EWM run over whole
+    # blocks of assets at a time, and only one block of float64 intermediates
+    # is alive at once; dtype=np.float32 halves the memory of the outputs.
+    is_frame = isinstance(prices, pd.DataFrame)
+    values = prices.to_numpy(dtype=np.float64) if is_frame else np.asarray(prices, dtype=np.float64)
+    if values.ndim != 2:
+        raise ValueError("prices must be a 2-D time x asset array")
+    n_assets = values.shape[1]
+    outputs = {name: np.empty(values.shape, dtype=dtype) for name in indicator_columns}
+
+    for start in range(0, n_assets, block_size):
+        columns = slice(start, min(start + block_size, n_assets))
+        block = pd.DataFrame(values[:, columns])
+
+        outputs['SMA_50'][:, columns] = block.rolling(window=50, min_periods=50).mean().to_numpy()
+        outputs['SMA_200'][:, columns] = block.rolling(window=200, min_periods=200).mean().to_numpy()
+
+        diff = block.diff(1)
+        ema_up = diff.where(diff > 0, 0.0).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean().to_numpy()
+        ema_down = (-diff.where(diff < 0, 0.0)).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean().to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            outputs['RSI'][:, columns] = np.where(ema_down == 0, 100, 100 - (100 / (1 + ema_up / ema_down)))
+
+        macd = _ema(block, 12) - _ema(block, 26)
+        macd_signal = _ema(macd, 9)
+        outputs['MACD'][:, columns] = macd.to_numpy()
+        outputs['MACD_Signal'][:, columns] = macd_signal.to_numpy()
+        outputs['MACD_Diff'][:, columns] = (macd - macd_signal).to_numpy()
+
+    if is_frame:
+        return {name: pd.DataFrame(array, index=prices.index, columns=prices.columns) for name, array in outputs.items()}
+    return outputs
+
+# Incremental versions of the indicators above. Each object takes one new bar
+# per update() in O(1) and follows the same arithmetic as the pandas rolling /
+# ewm kernels that `ta` uses, so a live feed stays current without
+# reprocessing history. state_dict() / from_state() checkpoint them.
+class StreamingSMA:
+    def __init__(self, window):
+        self.window = window
+        self.values = collections.deque()
+        self.nobs = 0
+        self.sum_x = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.neg_ct = 0
+        self.num_consecutive_same_value = 0
+        self.prev_value = float('nan')
+
+    def _add(self, value):
+        if value == value:
+            self.nobs += 1
+            y = value - self.compensation_add
+            t = self.sum_x + y
+            self.compensation_add = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, value) < 0:
+                self.neg_ct += 1
+            if value == self.prev_value:
+                self.num_consecutive_same_value += 1
+            else:
+                self.num_consecutive_same_value = 1
+            self.prev_value = value
+
+    def _remove(self, value):
+        if value == value:
+            self.nobs -= 1
+            y = -value - self.compensation_remove
+            t = self.sum_x + y
+            self.compensation_remove = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, value) < 0:
+                self.neg_ct -= 1
+
+    def update(self, value):
+        value = float(value)
+        if len(self.values) == self.window:
+            self._remove(self.values.popleft())
+        self.values.append(value)
+        self._add(value)
+        return self.value
+
+    @property
+    def value(self):
+        if self.nobs < self.window or self.nobs == 0:
+            return float('nan')
+        result = self.sum_x / self.nobs
+        if self.num_consecutive_same_value >= self.nobs:
+            result = self.prev_value
+        elif self.neg_ct == 0 and result < 0:
+            result = 0.0
+        elif self.neg_ct == self.nobs and result > 0:
+            result = 0.0
+        return result
+
+    def state_dict(self):
+        state = {key: getattr(self, key) for key in ('window', 'nobs', 'sum_x', 'compensation_add', 'compensation_remove',
+                                                     'neg_ct', 'num_consecutive_same_value', 'prev_value')}
+        state['values'] = list(self.values)
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        sma = cls(state['window'])
+        for key, value in state.items():
+            setattr(sma, key, collections.deque(value) if key == 'values' else value)
+        return sma
+
+class StreamingEMA:
+    # Matches Series.ewm(alpha=..., min_periods=..., adjust=False).mean()
+    def __init__(self, alpha, min_periods=0):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.weighted = float('nan')
+        self.old_wt = 1.0
+        self.nobs = 0
+
+    @classmethod
+    def from_span(cls, span, min_periods=0):
+        return cls(2.0 / (span + 1.0), min_periods)
+
+    def update(self, value):
+        value = float(value)
+        is_observation = value == value
+        self.nobs += is_observation
+        if self.weighted == self.weighted:
+            # Gaps still age the previous average, as with ignore_na=False
+            self.old_wt *= 1.0 - self.alpha
+            if is_observation:
+                if self.weighted != value:
+                    self.weighted = self.old_wt * self.weighted + self.alpha * value
+                    self.weighted /= self.old_wt + self.alpha
+                self.old_wt = 1.0
+        elif is_observation:
+            self.weighted = value
+        return self.value
+
+    @property
+    def value(self):
+        return self.weighted if self.nobs >= max(self.min_periods, 1) else float('nan')
+
+    def state_dict(self):
+        return {key: getattr(self, key) for key in ('alpha', 'min_periods', 'weighted', 'old_wt', 'nobs')}
+
+    @classmethod
+    def from_state(cls, state):
+        ema = cls(state['alpha'], state['min_periods'])
+        ema.weighted, ema.old_wt, ema.nobs = state['weighted'], state['old_wt'], state['nobs']
+        return ema
+
+class StreamingRSI:
+    def __init__(self, window=14):
+        self.window = window
+        self.prev_close = float('nan')
+        self.ema_up = StreamingEMA(1.0 / window, window)
+        self.ema_down = StreamingEMA(1.0 / window, window)
+
+    def update(self, close):
+        close = float(close)
+        diff = close - self.prev_close
+        self.prev_close = close
+        # The first diff is NaN and, as in ta, counts as no movement
+        self.ema_up.update(diff if diff > 0 else 0.0)
+        self.ema_down.update(-diff if diff < 0 else 0.0)
+        return self.value
+
+    @property
+    def value(self):
+        ema_up, ema_down = self.ema_up.value, self.ema_down.value
+        if ema_down == 0:
+            return 100.0
+        if ema_up != ema_up or ema_down != ema_down:
+            return float('nan')
+        return 100 - (100 / (1 + ema_up / ema_down))
+
+    def state_dict(self):
+        return {'window': self.window, 'prev_close': self.prev_close,
+                'ema_up': self.ema_up.state_dict(), 'ema_down': self.ema_down.state_dict()}
+
+    @classmethod
+    def from_state(cls, state):
+        rsi = cls(state['window'])
+        rsi.prev_close = state['prev_close']
+        rsi.ema_up = StreamingEMA.from_state(state['ema_up'])
+        rsi.ema_down = StreamingEMA.from_state(state['ema_down'])
+        return rsi
+
+class StreamingMACD:
+    def __init__(self, window_slow=26, window_fast=12, window_sign=9):
+        self.ema_fast = StreamingEMA.from_span(window_fast, window_fast)
+        self.ema_slow = StreamingEMA.from_span(window_slow, window_slow)
+        self.ema_signal = StreamingEMA.from_span(window_sign, window_sign)
+        self.macd = float('nan')
+
+    def update(self, close):
+        self.macd = self.ema_fast.update(close) - self.ema_slow.update(close)
+        self.ema_signal.update(self.macd)
+        return self.macd
+
+    @property
+    def signal(self):
+        return self.ema_signal.value
+
+    @property
+    def diff(self):
+        return self.macd - self.signal
+
+    def state_dict(self):
+        return {'macd': self.macd, 'ema_fast': self.ema_fast.state_dict(),
+                'ema_slow': self.ema_slow.state_dict(), 'ema_signal': self.ema_signal.state_dict()}
+
+    @classmethod
+    def from_state(cls, state):
+        macd = cls()
+        macd.macd = state['macd']
+        macd.ema_fast = StreamingEMA.from_state(state['ema_fast'])
+        macd.ema_slow = StreamingEMA.from_state(state['ema_slow'])
+        macd.ema_signal = StreamingEMA.from_state(state['ema_signal'])
+        return macd
+
+class StreamingIndicators:
+    # The add_technical_indicators columns, kept current one bar at a time
+    def __init__(self):
+        self.sma_50 = StreamingSMA(50)
+        self.sma_200 = StreamingSMA(200)
+        self.rsi = StreamingRSI(14)
+        self.macd = StreamingMACD()
+        self.bars = 0
+
+    def update(self, value):
+        self.sma_50.update(value)
+        self.sma_200.update(value)
+        self.rsi.update(value)
+        self.macd.update(value)
+        self.bars += 1
+        return self.latest()
+
+    def update_many(self, values):
+        for value in values:
+            self.update(value)
+        return self.latest()
+
+    def latest(self):
+        return {
+            'SMA_50': self.sma_50.value,
+            'SMA_200': self.sma_200.value,
+            'RSI': self.rsi.value,
+            'MACD': self.macd.macd,
+            'MACD_Signal': self.macd.signal,
+            'MACD_Diff': self.macd.diff,
+        }
+
+    def state_dict(self):
+        return {'bars': self.bars, 'sma_50': self.sma_50.state_dict(), 'sma_200': self.sma_200.state_dict(),
+                'rsi': self.rsi.state_dict(), 'macd': self.macd.state_dict()}
+
+    @classmethod
+    def from_state(cls, state):
+        indicators = cls()
+        indicators.bars = state['bars']
+        indicators.sma_50 = StreamingSMA.from_state(state['sma_50'])
+        indicators.sma_200 = StreamingSMA.from_state(state['sma_200'])
+        indicators.rsi = StreamingRSI.from_state(state['rsi'])
+        indicators.macd = StreamingMACD.from_state(state['macd'])
+        return indicators
+
+    def save(self, path):
+        # JSON checkpoint; NaN is written as the non-standard NaN literal Python reads back
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_state(json.load(f))